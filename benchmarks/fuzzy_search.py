@@ -0,0 +1,111 @@
+"""
+Benchmark of the dictionary search.
+
+Compares the startswith filter of the dictionary page (exact prefixes only) with the trigram
+index of dictionary.fuzzy, which also finds words with typos. The dictionaries are created in
+the configured database inside a transaction that is rolled back at the end.
+
+Usage:
+    python benchmarks/fuzzy_search.py [--sizes 1000,10000,100000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wordnest.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+from dictionary.fuzzy import TrigramIndex  # noqa: E402
+from dictionary.models import Dictionary, Language, User  # noqa: E402
+
+
+def make_word(rng, alphabet):
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(4, 12)))
+
+
+def create_dictionary(size, rng):
+    source, _ = Language.objects.get_or_create(
+        code="bs", defaults={"name": "Benchmark source"}
+    )
+    target, _ = Language.objects.get_or_create(
+        code="bt", defaults={"name": "Benchmark target"}
+    )
+    dictionary = Dictionary.objects.create(
+        user=User.objects.create_user(email=f"benchmark{size}@example.com"),
+        source_language=source,
+        target_language=target,
+    )
+    # Random words, a dictionary of similar words like "word1", "word2" is the worst case
+    words = list({make_word(rng, string.ascii_lowercase) for _ in range(size)})
+    translations = [make_word(rng, "абвгдеєжзиіїйклмнопрстуфхцчшщьюя") for _ in words]
+    for start in range(0, len(words), 5000):
+        dictionary.add_translations(
+            zip(words[start : start + 5000], translations[start : start + 5000])
+        )
+    return dictionary, words
+
+
+def make_typo(word, rng):
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1 :]
+
+
+def run(name, search, queries):
+    latencies = []
+    found = 0
+    for query in queries:
+        start = time.perf_counter()
+        found += bool(search(query))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(
+        f"  {name:<14} median {statistics.median(latencies) * 1000:>8.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:>8.2f} ms  "
+        f"found {found}/{len(queries)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for size in map(int, args.sizes.split(",")):
+        with transaction.atomic():
+            dictionary, words = create_dictionary(size, rng)
+            print(f"{len(words)} translations")
+
+            start = time.perf_counter()
+            index = TrigramIndex.build(dictionary.iter_translation_groups())
+            print(f"  index built in {time.perf_counter() - start:.2f} s")
+
+            words = rng.sample(words, args.queries)
+            typos = [make_typo(word, rng) for word in words]
+            for label, queries in (("exact", words), ("typo", typos)):
+                run(
+                    f"orm {label}",
+                    lambda query: list(
+                        dictionary._search_translations(query)[:25].values_list("pk")
+                    ),
+                    queries,
+                )
+                run(f"trigram {label}", lambda query: index.search(query), queries)
+            transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
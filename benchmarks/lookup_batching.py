@@ -0,0 +1,92 @@
+"""
+Benchmark of batched dictionary lookups against a local fake translator server.
+
+Compares one API call per lookup with LookupBatcher under concurrent load.
+
+Usage:
+    python benchmarks/lookup_batching.py [--lookups 2000] [--concurrency 50] [--latency 0.02]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from azure.ai.translation.text import TextTranslationClient  # noqa: E402
+from azure.core.credentials import AzureKeyCredential  # noqa: E402
+
+from dictionary.batching import LookupBatcher  # noqa: E402
+from dictionary.tests.fake_translator import FakeTranslatorServer  # noqa: E402
+
+
+def run(name, lookup, words, concurrency, server):
+    server.requests.clear()
+    latencies = []
+
+    def timed_lookup(word):
+        start = time.perf_counter()
+        lookup(word)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed_lookup, words))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{name:<10} {len(words) / elapsed:>10.0f} lookups/s  "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.2f} ms  "
+        f"API calls {server.count_requests('/dictionary/lookup'):>6}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--window", type=float, default=0.005)
+    parser.add_argument("--max-size", type=int, default=10)
+    args = parser.parse_args()
+
+    server = FakeTranslatorServer(latency=args.latency).start()
+    client = TextTranslationClient(
+        credential=AzureKeyCredential("key"), endpoint=server.endpoint
+    )
+
+    def lookup_entries(words, from_lang, to_lang):
+        entries = client.lookup_dictionary_entries(
+            body=words, from_language=from_lang, to_language=to_lang
+        )
+        return [entry.translations for entry in entries]
+
+    batcher = LookupBatcher(lookup_entries, window=args.window, max_size=args.max_size)
+    words = [f"word{i}" for i in range(args.lookups)]
+
+    try:
+        run(
+            "unbatched",
+            lambda word: lookup_entries([word], "en", "uk"),
+            words,
+            args.concurrency,
+            server,
+        )
+        run(
+            "batched",
+            lambda word: batcher.lookup(word, "en", "uk"),
+            words,
+            args.concurrency,
+            server,
+        )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark of grouping a dictionary's translations by source words.
+
+Compares grouping Translation instances in Python (the previous implementation of the
+dictionary page) with Dictionary.iter_translation_groups(), which aggregates the target words
+in the database on PostgreSQL (array_agg) and groups the streamed entries on other databases.
+The dictionaries are created in the configured database inside a transaction that is rolled
+back at the end.
+
+Usage:
+    python benchmarks/translation_groups.py [--sizes 1000,100000,1000000] [--per-word 2]
+                                            [--instances-limit 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wordnest.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from dictionary.models import (  # noqa: E402
+    Dictionary,
+    DictionaryEntry,
+    Language,
+    Translation,
+    User,
+    Word,
+)
+
+
+def create_words(language, words, chunk_size=5000):
+    ids = {}
+    words = list(words)
+    for start in range(0, len(words), chunk_size):
+        ids.update(
+            Word.objects.get_or_create_ids(
+                language.id, words[start : start + chunk_size]
+            )
+        )
+    return ids
+
+
+def create_dictionary(size, per_word):
+    source, _ = Language.objects.get_or_create(
+        code="bs", defaults={"name": "Benchmark source"}
+    )
+    target, _ = Language.objects.get_or_create(
+        code="bt", defaults={"name": "Benchmark target"}
+    )
+    dictionary = Dictionary.objects.create(
+        user=User.objects.create_user(email=f"benchmark{size}@example.com"),
+        source_language=source,
+        target_language=target,
+    )
+    from_ids = create_words(
+        source, (f"word{number}" for number in range(size // per_word))
+    )
+    to_ids = create_words(target, (f"слово{number}" for number in range(size)))
+    translations = Translation.objects.bulk_create(
+        (
+            Translation(
+                from_word_id=from_ids[f"word{number // per_word}"],
+                to_word_id=to_ids[f"слово{number}"],
+            )
+            for number in range(size)
+        ),
+        batch_size=5000,
+    )
+    if translations[0].pk is None:
+        translations = Translation.objects.filter(to_word__language=target)
+    from_words = {pk: word for word, pk in from_ids.items()}
+    DictionaryEntry.objects.bulk_create(
+        (
+            DictionaryEntry(
+                dictionary_id=dictionary.pk,
+                translation_id=translation.pk,
+                from_word_id=translation.from_word_id,
+                word=from_words[translation.from_word_id],
+            )
+            for translation in translations
+        ),
+        batch_size=5000,
+    )
+    return dictionary
+
+
+def group_instances(dictionary):
+    groups = {}
+    for translation in dictionary.translations.select_related("from_word", "to_word"):
+        groups.setdefault(translation.from_word, []).append(translation.to_word)
+    return len(groups)
+
+
+def group_in_database(dictionary):
+    return sum(1 for _ in dictionary.iter_translation_groups())
+
+
+def run(name, func, dictionary):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        groups = func(dictionary)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"  {name:<10} {elapsed:>8.2f} s  peak memory {peak / 2**20:>8.1f} MiB  "
+        f"queries {len(queries):>3}  groups {groups}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--per-word", type=int, default=2)
+    # Grouping instances holds the whole dictionary in memory
+    parser.add_argument("--instances-limit", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"Database: {connection.vendor}")
+    for size in map(int, args.sizes.split(",")):
+        with transaction.atomic():
+            dictionary = create_dictionary(size, args.per_word)
+            print(f"{size} translations")
+            if size <= args.instances_limit:
+                run("instances", group_instances, dictionary)
+            run("grouped", group_in_database, dictionary)
+            transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
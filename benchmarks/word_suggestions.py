@@ -0,0 +1,87 @@
+"""
+Benchmark of the prefix index of word suggestions.
+
+Measures the memory of a PrefixIndex of random words, compared with a sorted list of the
+same words, and the latency of prefix lookups and of adding new words. The database is not used.
+
+Usage:
+    python benchmarks/word_suggestions.py [--words 1000000] [--lookups 100000]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dictionary.suggestions import PrefixIndex  # noqa: E402
+
+
+def make_word(rng):
+    return "".join(
+        rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 14))
+    )
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, elapsed, size
+
+
+def report(name, latencies):
+    latencies.sort()
+    print(
+        f"  {name:<8} p50 {latencies[len(latencies) // 2] * 1e6:>7.1f} us  "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:>7.1f} us  "
+        f"max {latencies[-1] * 1e6:>8.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [make_word(rng) for _ in range(args.words)]
+
+    # Words read from the database are new objects, they are copied so their size is counted
+    _, elapsed, size = measure(
+        lambda: sorted({word.encode().decode() for word in words})
+    )
+    print(f"sorted list  {size / 2**20:>7.1f} MiB  built in {elapsed:.2f} s")
+    index, elapsed, size = measure(lambda: PrefixIndex(words))
+    print(f"prefix index {size / 2**20:>7.1f} MiB  built in {elapsed:.2f} s")
+    print(f"{len(index)} words")
+
+    prefixes = [
+        word[: rng.randint(1, len(word))] for word in rng.sample(words, args.lookups)
+    ]
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.search(prefix)
+        latencies.append(time.perf_counter() - start)
+    report("search", latencies)
+
+    latencies = []
+    for _ in range(args.lookups // 10):
+        word = make_word(rng)
+        start = time.perf_counter()
+        index.add([word])
+        latencies.append(time.perf_counter() - start)
+    report("add", latencies)
+
+
+if __name__ == "__main__":
+    main()
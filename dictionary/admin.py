@@ -38,3 +38,4 @@ admin.site.register(models.Language)
 admin.site.register(models.Word)
 admin.site.register(models.Translation)
 admin.site.register(models.Dictionary)
+admin.site.register(models.ImportJob)
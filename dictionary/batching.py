@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable
+
+
+class _Batch:
+    def __init__(self):
+        self.futures: dict[str, Future] = {}
+        self.full = threading.Event()
+
+
+class LookupBatcher:
+    """
+    Gathers dictionary lookups of concurrent callers into batched API calls.
+
+    Lookups for the same language pair that arrive within `window` seconds are sent as a single
+    call with up to `max_size` words. The first caller of a batch waits for the window to pass
+    (or for the batch to fill up) and makes the call, the other callers wait for their results.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[list[str], str, str], list],
+        window: float = 0.005,
+        max_size: int = 10,
+    ):
+        """
+        Args:
+            lookup (Callable): makes the batched call, it takes a list of words, the source and
+                               the target language codes and returns a result for each word in the same order.
+            window (float): how long in seconds the batch waits for more words.
+            max_size (int): maximum number of words in one call.
+        """
+        self._lookup = lookup
+        self.window = window
+        self.max_size = max_size
+        self._pending: dict[tuple[str, str], _Batch] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, word: str, from_lang: str, to_lang: str):
+        """
+        Look up the word, sharing the API call with concurrent lookups of the same language pair.
+
+        Raises:
+            Exception: the exception raised by the batched call.
+        """
+        key = (from_lang, to_lang)
+        with self._lock:
+            batch = self._pending.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._pending[key] = _Batch()
+            future = batch.futures.get(word)
+            if future is None:
+                future = batch.futures[word] = Future()
+            if len(batch.futures) >= self.max_size:
+                self._pending.pop(key)
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._pending.get(key) is batch:
+                    self._pending.pop(key)
+            self._flush(batch, from_lang, to_lang)
+        return future.result()
+
+    def _flush(self, batch: _Batch, from_lang: str, to_lang: str) -> None:
+        words = list(batch.futures)
+        try:
+            results = self._lookup(words, from_lang, to_lang)
+        except Exception as error:
+            for future in batch.futures.values():
+                future.set_exception(error)
+        else:
+            for word, result in zip(words, results):
+                batch.futures[word].set_result(result)
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(ValueError("No lookup result for the word."))
+
+
+class _AsyncBatch:
+    def __init__(self):
+        self.futures: dict[str, asyncio.Future] = {}
+        self.full = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+
+class AsyncLookupBatcher:
+    """
+    Asyncio version of LookupBatcher, for lookups made by coroutines of the same event loop.
+
+    The batched call is made by a task of its own rather than by the first caller, so a caller
+    that is cancelled (e.g. a client that disconnected) does not cancel the lookups of the others.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[list[str], str, str], Awaitable[list]],
+        window: float = 0.005,
+        max_size: int = 10,
+    ):
+        """
+        Args:
+            lookup (Callable): coroutine function that makes the batched call, see LookupBatcher.
+            window (float): how long in seconds the batch waits for more words.
+            max_size (int): maximum number of words in one call.
+        """
+        self._lookup = lookup
+        self.window = window
+        self.max_size = max_size
+        self._pending: dict[tuple, _AsyncBatch] = {}
+
+    async def lookup(self, word: str, from_lang: str, to_lang: str):
+        """
+        Look up the word, sharing the API call with concurrent lookups of the same language pair.
+
+        Raises:
+            Exception: the exception raised by the batched call.
+        """
+        loop = asyncio.get_running_loop()
+        # Futures belong to an event loop, batches are not shared between loops
+        key = (loop, from_lang, to_lang)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _AsyncBatch()
+            batch.task = loop.create_task(self._run(key, batch, from_lang, to_lang))
+        future = batch.futures.get(word)
+        if future is None:
+            future = batch.futures[word] = loop.create_future()
+        if len(batch.futures) >= self.max_size:
+            self._pending.pop(key, None)
+            batch.full.set()
+        return await asyncio.shield(future)
+
+    async def _run(self, key, batch: _AsyncBatch, from_lang: str, to_lang: str):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        if self._pending.get(key) is batch:
+            self._pending.pop(key)
+
+        words = list(batch.futures)
+        try:
+            results = await self._lookup(words, from_lang, to_lang)
+        except Exception as error:
+            for future in batch.futures.values():
+                future.set_exception(error)
+            return
+        for word, result in zip(words, results):
+            batch.futures[word].set_result(result)
+        for future in batch.futures.values():
+            if not future.done():
+                future.set_exception(ValueError("No lookup result for the word."))
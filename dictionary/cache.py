@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+from wordnest.shortcuts import normalize_string
+
+
+class TranslationCache:
+    """
+    A cache of templated translations shared by all translation strategies of the process.
+
+    The storage is a Django cache backend, so the TTL and the size-bounded eviction
+    are handled by the backend itself. Empty results (words the strategy could not translate)
+    are cached as well, for `negative_timeout` seconds. Hits, negative hits and misses are
+    counted per strategy.
+    """
+
+    key_prefix = "translation"
+
+    def __init__(
+        self,
+        backend: BaseCache,
+        timeout: int | None = None,
+        negative_timeout: int | None = None,
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.negative_timeout = negative_timeout
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, strategy: str, word: str, from_lang: str, to_lang: str) -> str:
+        """
+        Build a backend safe key for the translation of the word by the strategy.
+
+        The word is normalized, so the same word typed differently shares the entry. It is hashed
+        because it may contain spaces or be too long for some backends.
+        """
+        word = normalize_string(word)
+        digest = hashlib.sha1(f"{from_lang}:{to_lang}:{word}".encode()).hexdigest()
+        return f"{self.key_prefix}:{strategy}:{digest}"
+
+    def get(self, strategy: str, word: str, from_lang: str, to_lang: str):
+        """
+        Return the cached translations, an empty list for a cached negative result or None on a miss.
+        """
+        value = self.backend.get(self.make_key(strategy, word, from_lang, to_lang))
+        self._count_lookup(strategy, value)
+        return value
+
+    def set(
+        self, strategy: str, word: str, from_lang: str, to_lang: str, value
+    ) -> None:
+        key = self.make_key(strategy, word, from_lang, to_lang)
+        self.backend.set(key, value, timeout=self.get_timeout(value))
+
+    def get_timeout(self, value) -> int | None:
+        return self.timeout if value else self.negative_timeout
+
+    async def aget(self, strategy: str, word: str, from_lang: str, to_lang: str):
+        if self.in_process:
+            return self.get(strategy, word, from_lang, to_lang)
+        value = await self.backend.aget(
+            self.make_key(strategy, word, from_lang, to_lang)
+        )
+        self._count_lookup(strategy, value)
+        return value
+
+    async def aset(
+        self, strategy: str, word: str, from_lang: str, to_lang: str, value
+    ) -> None:
+        if self.in_process:
+            return self.set(strategy, word, from_lang, to_lang, value)
+        key = self.make_key(strategy, word, from_lang, to_lang)
+        await self.backend.aset(key, value, timeout=self.get_timeout(value))
+
+    @property
+    def in_process(self) -> bool:
+        """
+        Whether the backend keeps entries in process memory, so it can be used from async code directly.
+        """
+        return isinstance(self.backend, LocMemCache)
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Return hit, negative hit and miss counters of each strategy.
+
+        Returns:
+            dict[str, dict[str, int]]: strategy name mapped to its counters
+        """
+        with self._lock:
+            return {strategy: dict(stats) for strategy, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def _count_lookup(self, strategy: str, value) -> None:
+        if value is None:
+            counter = "misses"
+        elif value:
+            counter = "hits"
+        else:
+            counter = "negative_hits"
+        with self._lock:
+            stats = self._stats.setdefault(
+                strategy, {"hits": 0, "negative_hits": 0, "misses": 0}
+            )
+            stats[counter] += 1
+
+
+def create_translation_cache() -> TranslationCache:
+    """
+    Create the translation cache from the TRANSLATION_CACHE setting.
+
+    Supported backends:
+        "lru": in-process least recently used cache,
+        "django": one of the caches configured in the CACHES setting,
+        "file": file based cache stored in the LOCATION directory.
+    """
+    options = settings.TRANSLATION_CACHE
+    backend_name = options.get("BACKEND", "lru")
+    timeout = options.get("TIMEOUT", 60 * 60 * 24)
+    negative_timeout = options.get("NEGATIVE_TIMEOUT", 60 * 15)
+    params = {
+        "TIMEOUT": timeout,
+        "OPTIONS": {"MAX_ENTRIES": options.get("MAX_ENTRIES", 10000)},
+    }
+
+    if backend_name == "lru":
+        backend = LocMemCache("translations", params)
+    elif backend_name == "django":
+        backend = caches[options.get("ALIAS", "default")]
+    elif backend_name == "file":
+        backend = FileBasedCache(options["LOCATION"], params)
+    else:
+        raise ImproperlyConfigured(
+            f"Unknown translation cache backend: {backend_name!r}"
+        )
+    return TranslationCache(backend, timeout, negative_timeout)
+
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """
+    Return the translation cache of the process, creating it on first use.
+    """
+    global _translation_cache
+    if _translation_cache is None:
+        with _translation_cache_lock:
+            if _translation_cache is None:
+                _translation_cache = create_translation_cache()
+    return _translation_cache
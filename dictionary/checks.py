@@ -0,0 +1,48 @@
+"""
+System checks of the settings the dictionary app relies on.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Cache backends whose entries are not seen by other processes
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs) -> list:
+    """
+    Check that the caches through which the workers announce changes to each other are shared
+    by the processes when there is more than one worker.
+
+    Otherwise a worker keeps serving the languages and fuzzy search indexes it loaded
+    until they expire, whatever the changes made through the other workers.
+    """
+    if settings.WEB_CONCURRENCY <= 1:
+        return []
+    aliases = {
+        "LANGUAGE_REGISTRY": settings.LANGUAGE_REGISTRY["CACHE_ALIAS"],
+        "FUZZY_SEARCH": settings.FUZZY_SEARCH["CACHE_ALIAS"],
+    }
+    if settings.TRANSLATION_SINGLE_FLIGHT["CROSS_WORKER"]:
+        aliases["TRANSLATION_SINGLE_FLIGHT"] = settings.TRANSLATION_SINGLE_FLIGHT[
+            "CACHE_ALIAS"
+        ]
+
+    errors = []
+    for name, alias in aliases.items():
+        backend = settings.CACHES.get(alias, {}).get("BACKEND")
+        if backend in PROCESS_LOCAL_CACHES:
+            errors.append(
+                Error(
+                    f"{name}['CACHE_ALIAS'] is the {alias!r} cache ({backend}), which is not "
+                    f"shared by the {settings.WEB_CONCURRENCY} worker processes.",
+                    hint="Set CACHE_BACKEND and CACHE_LOCATION to a shared cache, e.g. "
+                    "django.core.cache.backends.db.DatabaseCache, or run one worker.",
+                    id="dictionary.E001",
+                )
+            )
+    return errors
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing service so requests fail fast instead of waiting for it.
+
+    The circuit is closed while calls succeed. After `failure_threshold` consecutive failures it opens
+    and calls are rejected. Calls slower than `slow_call_threshold` seconds count as failures, so a
+    service that answers but too slowly is treated as down. After `reset_timeout` seconds the circuit
+    is half-open: a single probe call is let through, it closes the circuit if it succeeds and opens
+    it again if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_threshold: float | None = None,
+        reset_timeout: float = 30,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._reset_timeout_passed():
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check if a call can be made, in the half-open state only one probe call is allowed.
+        """
+        with self._lock:
+            if self._state == self.OPEN and self._reset_timeout_passed():
+                self._set_state(self.HALF_OPEN)
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self, duration: float = 0.0) -> None:
+        """
+        Record a finished call, it counts as a failure if it took longer than the slow call threshold.
+        """
+        if self.slow_call_threshold is not None and duration > self.slow_call_threshold:
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+                self._set_state(self.OPEN)
+
+    def release_probe(self) -> None:
+        """
+        Record a call that ended without a result (e.g. it was cancelled), neither a success nor a
+        failure, so the half-open circuit lets another probe through.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def get_stats(self) -> dict:
+        """
+        Return the state of the circuit, the number of consecutive failures and of rejected calls.
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "rejected": self._rejected,
+            }
+
+    def _reset_timeout_passed(self) -> bool:
+        return self._clock() - self._opened_at >= self.reset_timeout
+
+    def _set_state(self, state: str) -> None:
+        logger.warning("Circuit of %s is %s", self.name, state.replace("_", "-"))
+        self._state = state
+
+
+def create_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Create a circuit breaker configured by settings.TRANSLATION_CIRCUIT_BREAKER.
+    """
+    options = settings.TRANSLATION_CIRCUIT_BREAKER
+    return CircuitBreaker(
+        name,
+        failure_threshold=options["FAILURE_THRESHOLD"],
+        slow_call_threshold=options["SLOW_CALL_THRESHOLD"],
+        reset_timeout=options["RESET_TIMEOUT"],
+    )
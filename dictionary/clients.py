@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+
+import aiohttp
+import requests
+from azure.ai.translation.text import TextTranslationClient
+from azure.ai.translation.text.aio import (
+    TextTranslationClient as AsyncTextTranslationClient,
+)
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
+from decouple import config
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionCountingAdapter(HTTPAdapter):
+    """
+    HTTP adapter that reports every new connection (TCP and TLS handshake) it opens.
+    """
+
+    def __init__(self, on_connect, **kwargs):
+        self._on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self._on_connect
+
+        class CountingHTTPConnection(HTTPConnection):
+            def _new_conn(self):
+                on_connect()
+                return super()._new_conn()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def _new_conn(self):
+                on_connect()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "CountingHTTPConnectionPool",
+                (HTTPConnectionPool,),
+                {"ConnectionCls": CountingHTTPConnection},
+            ),
+            "https": type(
+                "CountingHTTPSConnectionPool",
+                (HTTPSConnectionPool,),
+                {"ConnectionCls": CountingHTTPSConnection},
+            ),
+        }
+
+
+class TranslatorClientRegistry:
+    """
+    Keeps long-lived Azure Translator clients of the worker process.
+
+    The sync client is shared by all threads, an async client is created for each event loop.
+    Both use connection pools with keep-alive, so the TLS handshake is made once per pooled connection
+    instead of once per request. Opened connections are counted in the `handshakes` statistic.
+    Connections time out after `connect_timeout` seconds and failed requests are retried at most
+    `retry_total` times, read timeouts are given per request by the strategies.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        endpoint: str,
+        pool_size: int = 10,
+        keepalive_timeout: float = 60,
+        connect_timeout: float = 1.0,
+        retry_total: int = 1,
+        retry_backoff_factor: float = 0.2,
+    ):
+        self.credential = AzureKeyCredential(key)
+        self.endpoint = endpoint
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.retry_options = {
+            "retry_total": retry_total,
+            "retry_backoff_factor": retry_backoff_factor,
+        }
+        self._client = None
+        self._session = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._handshakes = 0
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def get_client(self) -> TextTranslationClient:
+        """
+        Return the sync client of the process, creating it on first use.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._session = self._create_session()
+                    transport = RequestsTransport(
+                        session=self._session,
+                        session_owner=False,
+                        connection_timeout=self.connect_timeout,
+                    )
+                    self._client = TextTranslationClient(
+                        credential=self.credential,
+                        endpoint=self.endpoint,
+                        transport=transport,
+                        **self.retry_options,
+                    )
+        return self._client
+
+    def get_async_client(self) -> AsyncTextTranslationClient:
+        """
+        Return the async client of the running event loop, creating it on first use.
+
+        aiohttp sessions are bound to the event loop they were created in, so each loop gets its own client.
+        """
+        loop = asyncio.get_running_loop()
+        client, session = self._async_clients.get(loop, (None, None))
+        if client is None:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_async_connect)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+                ),
+                trace_configs=[trace_config],
+            )
+            client = AsyncTextTranslationClient(
+                credential=self.credential,
+                endpoint=self.endpoint,
+                transport=AioHttpTransport(
+                    session=session,
+                    session_owner=False,
+                    connection_timeout=self.connect_timeout,
+                ),
+                **self.retry_options,
+            )
+            self._async_clients[loop] = (client, session)
+        return client
+
+    async def awarm_up(self) -> None:
+        """
+        Create the async client of the running event loop and open a pooled connection to the API.
+        """
+        await self.get_async_client().get_supported_languages(scope="dictionary")
+
+    def close(self) -> None:
+        """
+        Close the clients and their connection pools.
+        """
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._session.close()
+                self._client = self._session = None
+            for loop, (client, session) in list(self._async_clients.items()):
+                if not loop.is_closed() and not loop.is_running():
+                    loop.run_until_complete(self._close_async_client(client, session))
+            self._async_clients.clear()
+
+    async def aclose(self) -> None:
+        """
+        Close the async client of the running event loop.
+        """
+        client, session = self._async_clients.pop(
+            asyncio.get_running_loop(), (None, None)
+        )
+        if client is not None:
+            await self._close_async_client(client, session)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Return the number of connections (handshakes) opened by the clients.
+        """
+        return {"handshakes": self._handshakes}
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # Retries are made by the Azure SDK retry policy
+        adapter = ConnectionCountingAdapter(
+            self._on_connect,
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _on_connect(self) -> None:
+        with self._stats_lock:
+            self._handshakes += 1
+
+    async def _on_async_connect(self, session, context, params) -> None:
+        self._on_connect()
+
+    @staticmethod
+    async def _close_async_client(
+        client: AsyncTextTranslationClient, session: aiohttp.ClientSession
+    ) -> None:
+        await client.close()
+        await session.close()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> TranslatorClientRegistry:
+    """
+    Return the client registry of the process, creating it from settings on first use.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                options = settings.AZURE_TRANSLATOR_CLIENT
+                _registry = TranslatorClientRegistry(
+                    key=config("AZURE_TRANSLATOR_KEY"),
+                    endpoint=settings.AZURE_TRANSLATOR_ENDPOINT,
+                    pool_size=options["POOL_SIZE"],
+                    keepalive_timeout=options["KEEPALIVE_TIMEOUT"],
+                    connect_timeout=options["CONNECT_TIMEOUT"],
+                    retry_total=options["RETRY_TOTAL"],
+                    retry_backoff_factor=options["RETRY_BACKOFF_FACTOR"],
+                )
+    return _registry
+
+
+async def aclose_client_registry() -> None:
+    """
+    Close the async client of the running event loop, if the registry of the process was created,
+    and log the number of connections opened by its clients.
+    """
+    registry = _registry
+    if registry is not None:
+        await registry.aclose()
+        logger.info(
+            "Azure Translator clients opened %(handshakes)s connections",
+            registry.get_stats(),
+        )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from dictionary.models import Dictionary, User
+from dictionary.orphans import collect_orphans_incrementally
+
+logger = logging.getLogger(__name__)
+
+
+def delete_dictionary(dictionary: Dictionary) -> None:
+    """
+    Mark the dictionary as deleted, it disappears right away and its translations
+    are purged in the background after the current transaction commits.
+    """
+    dictionary.deleted_at = timezone.now()
+    dictionary.save(update_fields=["deleted_at"])
+    schedule_purge()
+
+
+def delete_account(user: User) -> None:
+    """
+    Deactivate the account and mark it with its dictionaries as deleted, the user
+    is removed in the background after the current transaction commits.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        user.is_active = False
+        user.deleted_at = now
+        user.save(update_fields=["is_active", "deleted_at"])
+        user.dictionaries.update(deleted_at=now)
+    schedule_purge()
+
+
+def purge_deleted(batch_size: int | None = None) -> dict:
+    """
+    Remove the deleted dictionaries and accounts, see Dictionary.purge().
+
+    A purge interrupted by a restart of the worker is finished by the next one,
+    or by the purge_deleted command.
+
+    Args:
+        batch_size (int): number of translations removed by one query,
+                          settings.DICTIONARY_PURGE["BATCH_SIZE"] by default
+
+    Returns:
+        dict: number of removed dictionaries, translations and users
+    """
+    batch_size = batch_size or settings.DICTIONARY_PURGE["BATCH_SIZE"]
+    stats = {"dictionaries": 0, "translations": 0, "users": 0}
+
+    def purge(dictionaries):
+        for dictionary in dictionaries:
+            stats["translations"] += dictionary.purge(batch_size)
+            stats["dictionaries"] += 1
+
+    purge(Dictionary.all_objects.filter(deleted_at__isnull=False).order_by("pk"))
+    for user in User.objects.filter(deleted_at__isnull=False).order_by("pk"):
+        # Dictionaries created while the account was being deleted
+        purge(Dictionary.all_objects.filter(user=user).order_by("pk"))
+        User.objects.filter(pk=user.pk).delete()
+        stats["users"] += 1
+    return stats
+
+
+def schedule_purge() -> None:
+    """
+    Run purge_deleted() in the background when the current transaction commits.
+    """
+    transaction.on_commit(partial(get_executor().submit, _run_in_worker))
+
+
+def _run_in_worker() -> None:
+    try:
+        purge_deleted()
+        # Purged dictionaries leave translations and words that nothing refers to
+        collect_orphans_incrementally()
+    except Exception:
+        logger.exception("Failed to purge deleted dictionaries")
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the thread that purges deleted data in the process, purges run one at a time.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="dictionary-purge"
+                )
+    return _executor
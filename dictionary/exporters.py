@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Generator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+
+from dictionary.models import TranslationGroup
+
+# Format: (content type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "anki": ("text/plain", "txt"),
+}
+
+ANKI_HEADER = "#separator:tab\n#html:false\n#columns:Front\tBack\n"
+
+
+class _Line:
+    """
+    A file-like object that returns what is written, for csv.writer.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_lines(groups: Iterable[TranslationGroup], format: str) -> Iterator[str]:
+    """
+    Write translation groups as lines of a word list.
+
+    CSV and JSON Lines files hold a word and one of its translations per line, the format
+    read by the import_translations command. Anki files hold a word and all its translations
+    per line, with the header of Anki's text import.
+
+    Args:
+        groups (Iterable[TranslationGroup]): translation groups, e.g. Dictionary.iter_translation_groups()
+        format (str): "csv", "jsonl" or "anki"
+
+    Returns:
+        Iterator[str]: lines of the file, with line breaks
+    """
+    if format == "csv":
+        writer = csv.writer(_Line(), lineterminator="\n")
+        for _, from_word, to_words in groups:
+            for to_word in to_words:
+                yield writer.writerow((from_word, to_word))
+    elif format == "jsonl":
+        for _, from_word, to_words in groups:
+            for to_word in to_words:
+                yield json.dumps(
+                    {"word": from_word, "translation": to_word}, ensure_ascii=False
+                ) + "\n"
+    elif format == "anki":
+        yield ANKI_HEADER
+        for _, from_word, to_words in groups:
+            back = "; ".join(_anki_field(to_word) for to_word in to_words)
+            yield f"{_anki_field(from_word)}\t{back}\n"
+    else:
+        raise ValueError(f"Unknown format: {format}")
+
+
+def _anki_field(text: str) -> str:
+    return " ".join(text.split())
+
+
+def iter_chunks(lines: Iterable[str], size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Join lines into UTF-8 encoded chunks of about `size` bytes, so a response is not written
+    (and compressed) line by line.
+    """
+    chunk, length = [], 0
+    for line in lines:
+        line = line.encode()
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield b"".join(chunk)
+            chunk, length = [], 0
+    if chunk:
+        yield b"".join(chunk)
+
+
+async def aiter_in_thread(
+    iterator: Generator[bytes, None, None],
+) -> AsyncIterator[bytes]:
+    """
+    Iterate over a sync generator that reads the database, e.g. iter_chunks(), from the event loop.
+
+    Each step runs in the thread of the request's sync code (sync_to_async), so the rows are
+    read from the same connection and every chunk is sent as soon as it is read. An ASGI server
+    reads a sync generator to the end in one call before anything is sent.
+    """
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(iterator, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(iterator.close)()
+
+
+async def acompress_sequence(sequence: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """
+    Async version of django.utils.text.compress_sequence(), the chunks are gzip-compressed
+    into one stream and each compressed chunk is yielded as soon as it is written.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(mode="wb", compresslevel=6, fileobj=buffer, mtime=0) as file:
+        async for chunk in sequence:
+            file.write(chunk)
+            file.flush()
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -1,8 +1,12 @@
 from allauth.account.forms import LoginForm
 from django import forms
+from django.conf import settings
+from django.template.defaultfilters import filesizeformat
 from django.urls import NoReverseMatch, reverse
 from django.utils.safestring import mark_safe
 
+from dictionary.importers import detect_format
+from dictionary.languages import get_language_registry
 from dictionary.models import Dictionary
 
 
@@ -33,3 +37,30 @@ class DictionaryForm(forms.ModelForm):
             "source_language": forms.Select(attrs=select_attrs),
             "target_language": forms.Select(attrs=select_attrs),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Choices from the language registry, so rendering the form makes no queries
+        choices = get_language_registry().get_choices()
+        for name in self._meta.fields:
+            field = self.fields[name]
+            field.choices = [("", field.empty_label), *choices]
+
+
+class ImportForm(forms.Form):
+    file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={"accept": ".csv,.tsv,.txt,.jsonl,.gz"})
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        max_size = settings.DICTIONARY_IMPORT["MAX_SIZE"]
+        if file.size > max_size:
+            raise forms.ValidationError(
+                f"The file is larger than {filesizeformat(max_size)}."
+            )
+        try:
+            self.cleaned_data["format"] = detect_format(file.name)
+        except ValueError as error:
+            raise forms.ValidationError(str(error))
+        return file
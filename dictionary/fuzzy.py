@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+
+if TYPE_CHECKING:
+    from dictionary.models import Dictionary, TranslationGroup
+
+VERSION_KEY = "fuzzy_search:{}:version"
+
+
+def get_trigrams(text: str) -> frozenset[str]:
+    """
+    Return the trigrams of a text the way pg_trgm makes them.
+
+    Each word is padded with two spaces in front and one behind, so "cat" gives
+    "  c", " ca", "cat" and "at ".
+    """
+    trigrams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(trigrams)
+
+
+class TrigramIndex:
+    """
+    An in-memory trigram index of the words of a dictionary.
+
+    Every source word of the dictionary is an entry, found by its own text and by the texts of
+    its translations. The similarity of two texts is the number of their shared trigrams divided
+    by the number of all their trigrams (as pg_trgm's similarity()), so texts with a typo
+    still share most trigrams.
+    """
+
+    def __init__(self, version: str | None = None):
+        self.version = version
+        self.built_at = time.monotonic()
+        self._entries: dict[int, set[str]] = {}
+        self._keys: dict[str, set[int]] = {}
+        self._trigrams: dict[str, frozenset[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls, groups: Iterable[TranslationGroup], version: str | None = None
+    ) -> TrigramIndex:
+        index = cls(version)
+        index.add(groups)
+        return index
+
+    def add(self, groups: Iterable[TranslationGroup]) -> None:
+        """
+        Add translations to the index, the texts of a source word already in the index are kept.
+        """
+        with self._lock:
+            for from_word_id, from_word, to_words in groups:
+                texts = self._entries.setdefault(from_word_id, set())
+                for text in (from_word, *to_words):
+                    if text not in texts:
+                        texts.add(text)
+                        self._add_text(from_word_id, text)
+
+    def remove(self, from_word_ids: Iterable[int]) -> None:
+        """
+        Remove source words with all their translations from the index.
+        """
+        with self._lock:
+            for from_word_id in from_word_ids:
+                for text in self._entries.pop(from_word_id, ()):
+                    self._remove_text(from_word_id, text)
+
+    def search(
+        self, query: str, limit: int = 25, threshold: float = 0.3
+    ) -> list[tuple[int, float]]:
+        """
+        Find the source words whose text or a translation is similar to the query.
+
+        Args:
+            query (str): searched text, it may contain typos
+            limit (int): maximum number of source words
+            threshold (float): minimum similarity, from 0 to 1
+
+        Returns:
+            list[tuple[int, float]]: ids of the source words with their similarity, most similar first
+        """
+        query_trigrams = get_trigrams(query)
+        if not query_trigrams:
+            return []
+
+        with self._lock:
+            # A text shares at least `required` trigrams with the query to be similar enough,
+            # so it has one of the len(query) - required + 1 rarest trigrams of the query.
+            # Texts of the common trigrams alone are never candidates.
+            required = max(math.ceil(threshold * len(query_trigrams)), 1)
+            postings = sorted(
+                (self._postings.get(trigram, ()) for trigram in query_trigrams), key=len
+            )
+            candidates = set().union(*postings[: len(query_trigrams) - required + 1])
+
+            scores = {}
+            for text in candidates:
+                trigrams = self._trigrams[text]
+                count = len(query_trigrams & trigrams)
+                similarity = count / (len(query_trigrams) + len(trigrams) - count)
+                if similarity < threshold:
+                    continue
+                for from_word_id in self._keys[text]:
+                    if similarity > scores.get(from_word_id, 0):
+                        scores[from_word_id] = similarity
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def _add_text(self, from_word_id: int, text: str) -> None:
+        keys = self._keys.setdefault(text, set())
+        keys.add(from_word_id)
+        if len(keys) > 1:
+            return
+        trigrams = self._trigrams[text] = get_trigrams(text)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(text)
+
+    def _remove_text(self, from_word_id: int, text: str) -> None:
+        keys = self._keys[text]
+        keys.discard(from_word_id)
+        if keys:
+            return
+        del self._keys[text]
+        for trigram in self._trigrams.pop(text):
+            postings = self._postings[trigram]
+            postings.discard(text)
+            if not postings:
+                del self._postings[trigram]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_indexes: OrderedDict[int, TrigramIndex] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_fuzzy_index(dictionary: Dictionary) -> TrigramIndex:
+    """
+    Return the trigram index of the dictionary, building it on first use.
+
+    Indexes are kept by each worker for the MAX_DICTIONARIES most recently searched dictionaries.
+    A version of each index is kept in a shared cache, an index changed by another worker
+    is rebuilt. An index is also rebuilt after MAX_AGE seconds, so workers that do not share
+    a cache pick up the changes too.
+    """
+    options = settings.FUZZY_SEARCH
+    version = caches[options["CACHE_ALIAS"]].get(VERSION_KEY.format(dictionary.pk))
+    with _lock:
+        index = _indexes.get(dictionary.pk)
+        if (
+            index is not None
+            and index.version == version
+            and time.monotonic() - index.built_at < options["MAX_AGE"]
+        ):
+            _indexes.move_to_end(dictionary.pk)
+            return index
+
+    # Built outside of the lock, so searches in other dictionaries do not wait for it
+    index = TrigramIndex.build(dictionary.iter_translation_groups(), version)
+    with _lock:
+        _indexes[dictionary.pk] = index
+        while len(_indexes) > options["MAX_DICTIONARIES"]:
+            _indexes.popitem(last=False)
+    return index
+
+
+def update_fuzzy_index(
+    dictionary_id: int,
+    added: Iterable[TranslationGroup] = (),
+    removed: Iterable[int] = (),
+) -> None:
+    """
+    Apply changes of a dictionary to its index and make other workers rebuild theirs.
+    An index that was already outdated is dropped instead.
+
+    Args:
+        dictionary_id (int): id of the changed dictionary
+        added (Iterable[TranslationGroup]): added translations
+        removed (Iterable[int]): ids of source words removed with all their translations
+    """
+    cache = caches[settings.FUZZY_SEARCH["CACHE_ALIAS"]]
+    key = VERSION_KEY.format(dictionary_id)
+    previous = cache.get(key)
+    version = uuid.uuid4().hex
+    cache.set(key, version, None)
+    with _lock:
+        index = _indexes.get(dictionary_id)
+        if index is not None and index.version != previous:
+            # Changed by another worker since the index was built, the changes
+            # are not in it, so it is rebuilt on the next search
+            del _indexes[dictionary_id]
+            index = None
+    if index is not None:
+        index.remove(removed)
+        index.add(added)
+        index.version = version
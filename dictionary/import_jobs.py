@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from dictionary.importers import DictionaryImporter, open_word_list, read_pairs
+from dictionary.models import Dictionary, ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+def create_import_job(
+    dictionary: Dictionary, file: UploadedFile, format: str
+) -> ImportJob:
+    """
+    Save a copy of an uploaded word list and start its import into the dictionary
+    when the current transaction commits.
+
+    The file is copied in chunks, the import runs in a background thread of the worker process
+    that received the upload, so the request does not wait for it.
+
+    Args:
+        dictionary (Dictionary): dictionary to import into
+        file (UploadedFile): uploaded word list, it may be gzip-compressed
+        format (str): format of the word list, see importers.read_pairs()
+
+    Returns:
+        ImportJob: the pending job
+    """
+    upload_dir = Path(settings.DICTIONARY_IMPORT["UPLOAD_DIR"])
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    path = upload_dir / f"{uuid.uuid4().hex}{Path(file.name).suffix}"
+    with open(path, "wb") as destination:
+        for chunk in file.chunks():
+            destination.write(chunk)
+
+    job = ImportJob.objects.create(
+        user_id=dictionary.user_id,
+        dictionary=dictionary,
+        file_name=file.name,
+        path=str(path),
+        format=format,
+        size=file.size,
+    )
+    transaction.on_commit(partial(get_executor().submit, _run_in_worker, job.pk))
+    return job
+
+
+class _Stopped(Exception):
+    """
+    Raised after a saved chunk when the process stops.
+    """
+
+
+_stopping = threading.Event()
+
+UNFINISHED = (ImportJob.Status.PENDING, ImportJob.Status.RUNNING)
+
+
+def _update_job(job_id: int, **fields) -> int:
+    # update() does not set auto_now fields, updated_at tells running jobs from interrupted ones
+    return ImportJob.objects.filter(pk=job_id).update(
+        updated_at=timezone.now(), **fields
+    )
+
+
+def run_import_job(job_id: int) -> None:
+    """
+    Import the word list of a pending job into its dictionary.
+
+    The job is claimed with a conditional UPDATE, so a job queued in several processes
+    is imported by one of them only. The file is read as a stream and imported in chunks,
+    each chunk is saved in its own transaction and the counters of the job are updated after it.
+    A job interrupted before goes on after the rows it already imported. The uploaded copy is
+    removed when the import ends, whether it succeeds or fails. If the process stops meanwhile
+    (see stop_executor()), the import stops after the current chunk and the job is left pending
+    with its file.
+
+    Args:
+        job_id (int): id of the job
+    """
+    claimed = ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.Status.PENDING
+    ).update(status=ImportJob.Status.RUNNING, updated_at=timezone.now())
+    if not claimed:
+        # Imported by another process meanwhile
+        return
+    job = ImportJob.objects.select_related(
+        "dictionary__source_language", "dictionary__target_language"
+    ).get(pk=job_id)
+    importer = DictionaryImporter(
+        job.dictionary, chunk_size=settings.DICTIONARY_IMPORT["CHUNK_SIZE"]
+    )
+    try:
+        with open(job.path, "rb") as file, open_word_list(file) as stream:
+
+            def on_chunk(stats: dict) -> None:
+                _update_job(
+                    job.pk,
+                    bytes_read=file.tell(),
+                    rows=stats["rows"],
+                    invalid=job.invalid + stats["invalid"],
+                    translations=job.translations + stats["translations"],
+                )
+                if _stopping.is_set():
+                    raise _Stopped
+
+            stats = importer.import_pairs(
+                read_pairs(stream, job.format), skip=job.rows, on_chunk=on_chunk
+            )
+    except _Stopped:
+        # Stale at once, so the next process that starts resumes it
+        stale_after = timedelta(seconds=settings.DICTIONARY_IMPORT["STALE_AFTER"])
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.Status.PENDING, updated_at=timezone.now() - stale_after
+        )
+        return
+    except Exception as error:
+        logger.exception("Import job %s failed", job.pk)
+        _update_job(job.pk, status=ImportJob.Status.FAILED, error=str(error)[:255])
+    else:
+        _update_job(
+            job.pk,
+            status=ImportJob.Status.DONE,
+            bytes_read=job.size,
+            rows=stats["rows"],
+            invalid=job.invalid + stats["invalid"],
+            translations=job.translations + stats["translations"],
+        )
+    Path(job.path).unlink(missing_ok=True)
+
+
+def resume_import_jobs(
+    stale_after: float = 0, run: Callable[[int], object] = run_import_job
+) -> dict:
+    """
+    Resume the jobs interrupted by a restart, oldest first.
+
+    A pending or running job is interrupted when it was not updated for `stale_after` seconds,
+    the counters of a running job are updated after each chunk. Each job is claimed with
+    a conditional UPDATE, so it is resumed by one process only. A job goes on after the rows
+    it already imported. A job whose uploaded file is gone (e.g. it was uploaded to another host)
+    fails.
+
+    Args:
+        stale_after (float): seconds since the last update of an interrupted job, with 0 every
+                             unfinished job is resumed, only run it so while no worker imports
+        run (Callable[[int], object]): runs the import of a job id, in the calling thread
+                                       by default
+
+    Returns:
+        dict: number of resumed jobs and of failed jobs whose file is gone
+    """
+    stats = {"resumed": 0, "lost": 0}
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    jobs = (
+        ImportJob.objects.filter(status__in=UNFINISHED, updated_at__lte=cutoff)
+        .order_by("pk")
+        .values_list("pk", "path", "updated_at")
+    )
+    for job_id, path, updated_at in jobs:
+        job = ImportJob.objects.filter(
+            pk=job_id, status__in=UNFINISHED, updated_at=updated_at
+        )
+        if not Path(path).exists():
+            if job.update(
+                status=ImportJob.Status.FAILED,
+                error="The uploaded file was lost by a restart.",
+                updated_at=timezone.now(),
+            ):
+                stats["lost"] += 1
+        elif job.update(status=ImportJob.Status.PENDING, updated_at=timezone.now()):
+            run(job_id)
+            stats["resumed"] += 1
+    return stats
+
+
+def resume_stale_import_jobs() -> None:
+    """
+    Resume the jobs interrupted for DICTIONARY_IMPORT["STALE_AFTER"] seconds in the background
+    of this process. Called when a worker starts (gunicorn.conf.py) and when the progress
+    of such a job is shown.
+    """
+    get_executor().submit(_resume_in_worker)
+
+
+def _resume_in_worker() -> None:
+    try:
+        resume_import_jobs(
+            settings.DICTIONARY_IMPORT["STALE_AFTER"],
+            run=partial(get_executor().submit, _run_in_worker),
+        )
+    except Exception:
+        logger.exception("Interrupted import jobs could not be resumed")
+    finally:
+        close_old_connections()
+
+
+def _run_in_worker(job_id: int) -> None:
+    try:
+        run_import_job(job_id)
+    except Exception:
+        logger.exception("Import job %s could not be started", job_id)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the thread pool of the process that runs imports, creating it from settings on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DICTIONARY_IMPORT["WORKERS"],
+                    thread_name_prefix="dictionary-import",
+                )
+    return _executor
+
+
+def stop_executor() -> None:
+    """
+    Stop the imports of the process before it exits.
+
+    Jobs that have not started are not started, running ones stop after their current chunk.
+    Both are left pending, they are resumed by the next worker that starts, see
+    resume_stale_import_jobs().
+    """
+    _stopping.set()
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
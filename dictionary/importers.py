@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from django.db import IntegrityError, transaction
+
+from dictionary.models import Dictionary, Language, Translation, Word
+from wordnest.shortcuts import normalize_string
+
+FORMATS = ("tsv", "csv", "jsonl", "anki")
+
+# Extensions of formats with another name, Anki exports notes as plain text
+EXTENSIONS = {"txt": "anki"}
+
+
+def detect_format(name: str) -> str:
+    """
+    Detect the format of a word list from its file name, e.g. "words.tsv.gz" is "tsv"
+    and "notes.txt" is "anki".
+
+    Raises:
+        ValueError: the extension is not one of the supported formats
+    """
+    suffixes = [suffix.lstrip(".").lower() for suffix in Path(name).suffixes]
+    if suffixes and suffixes[-1] == "gz":
+        suffixes.pop()
+    if suffixes:
+        format = EXTENSIONS.get(suffixes[-1], suffixes[-1])
+        if format in FORMATS:
+            return format
+    extensions = sorted({*FORMATS, *EXTENSIONS} - set(EXTENSIONS.values()))
+    raise ValueError(
+        f"Cannot detect the format of {name}, expected one of: {', '.join(extensions)}"
+    )
+
+
+def open_word_list(file) -> io.TextIOBase:
+    """
+    Open a word list as UTF-8 text, gzip-compressed files are decompressed on the fly.
+
+    Args:
+        file (str | Path | BinaryIO): path of the file or a binary file object
+
+    Returns:
+        io.TextIOBase: text stream of the word list
+    """
+    stream = open(file, "rb") if isinstance(file, (str, Path)) else file
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream)
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def read_pairs(stream: Iterable[str], format: str) -> Iterator[tuple[str, str] | None]:
+    """
+    Read (word, translation) pairs from a word list.
+
+    TSV and CSV rows hold the word and its translation in the first two columns, JSONL lines are
+    objects with "word" and "translation" keys. Anki notes exported as plain text are tab-separated,
+    after "#" header lines, a note with several translations separated by ";" is read as a pair
+    per translation. A malformed row is yielded as None, so the position of each row in the file
+    is kept for resuming.
+
+    Args:
+        stream (Iterable[str]): lines of the word list
+        format (str): "tsv", "csv", "jsonl" or "anki"
+
+    Returns:
+        Iterator[tuple[str, str] | None]: pairs of the word list
+    """
+    if format == "jsonl":
+        rows = _read_json_lines(stream)
+    elif format == "tsv":
+        rows = csv.reader(stream, delimiter="\t", quoting=csv.QUOTE_NONE)
+    elif format == "csv":
+        rows = csv.reader(stream)
+    elif format == "anki":
+        rows = _read_anki_notes(stream)
+    else:
+        raise ValueError(f"Unknown format: {format}")
+
+    for row in rows:
+        if row is None or len(row) < 2:
+            yield None
+            continue
+        word, translation = normalize_string(row[0]), normalize_string(row[1])
+        yield (word, translation) if word and translation else None
+
+
+def _read_json_lines(stream: Iterable[str]) -> Iterator[tuple[str, str] | None]:
+    for line in stream:
+        try:
+            item = json.loads(line)
+            row = (item["word"], item["translation"])
+        except (ValueError, KeyError, TypeError):
+            row = None
+        if row is None or not all(isinstance(text, str) for text in row):
+            yield None
+        else:
+            yield row
+
+
+def _read_anki_notes(stream: Iterable[str]) -> Iterator[list[str]]:
+    lines = iter(stream)
+    for line in lines:
+        if not line.startswith("#"):
+            lines = chain([line], lines)
+            break
+    for row in csv.reader(lines, delimiter="\t"):
+        if len(row) < 2:
+            yield row
+            continue
+        for translation in row[1].split(";"):
+            yield [row[0], translation]
+
+
+class TranslationImporter:
+    """
+    Imports approved translations of a language pair in chunks.
+
+    Each chunk is saved in a transaction with a few bulk queries. Ids of the words are kept in memory,
+    so a word that appears in many rows is looked up once, they are dropped and the chunk is saved
+    again if a kept word was deleted meanwhile. Translations that already exist are marked as approved.
+    """
+
+    def __init__(
+        self,
+        source_language: Language,
+        target_language: Language,
+        chunk_size: int = 5000,
+        preload: bool = True,
+    ):
+        """
+        Args:
+            source_language (Language): language of the words
+            target_language (Language): language of the translations
+            chunk_size (int): number of rows saved in one transaction
+            preload (bool): load the ids of all existing words of both languages before the import,
+                            it saves a query per chunk when most words already exist
+        """
+        if source_language == target_language:
+            raise ValueError("Source and target languages must be different.")
+        self.source_language = source_language
+        self.target_language = target_language
+        self.chunk_size = chunk_size
+        self.source_ids: dict[str, int] = {}
+        self.target_ids: dict[str, int] = {}
+        if preload:
+            self.source_ids = self._load_ids(source_language)
+            self.target_ids = self._load_ids(target_language)
+
+    def import_pairs(
+        self,
+        pairs: Iterable[tuple[str, str] | None],
+        skip: int = 0,
+        on_chunk: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """
+        Import the pairs, a None pair is counted as a skipped row.
+
+        Args:
+            pairs (Iterable[tuple[str, str] | None]): pairs read by read_pairs()
+            skip (int): number of rows to skip, rows imported by a previous interrupted run
+            on_chunk (Callable[[dict], None]): called with the statistics after each saved chunk
+
+        Returns:
+            dict: number of rows read (including skipped ones), invalid rows and saved translations
+        """
+        stats = {"rows": skip, "invalid": 0, "translations": 0}
+        pairs = iter(pairs)
+        for _ in islice(pairs, skip):
+            pass
+
+        while chunk := list(islice(pairs, self.chunk_size)):
+            valid = [pair for pair in chunk if pair is not None]
+            try:
+                with transaction.atomic():
+                    saved = self.save_chunk(valid)
+            except IntegrityError:
+                # Words of the kept ids were deleted since they were read (e.g. unused words
+                # removed by collect_orphans), look the words up again
+                self.source_ids.clear()
+                self.target_ids.clear()
+                with transaction.atomic():
+                    saved = self.save_chunk(valid)
+            stats["rows"] += len(chunk)
+            stats["invalid"] += len(chunk) - len(valid)
+            stats["translations"] += saved
+            if on_chunk is not None:
+                on_chunk(stats)
+        return stats
+
+    def save_chunk(self, pairs: list[tuple[str, str]]) -> int:
+        """
+        Save a chunk of pairs as approved translations.
+
+        Returns:
+            int: number of translations passed to the database
+        """
+        source_ids = self._get_ids(
+            self.source_language, self.source_ids, {word for word, _ in pairs}
+        )
+        target_ids = self._get_ids(
+            self.target_language, self.target_ids, {text for _, text in pairs}
+        )
+        translations = {
+            (source_ids[word], target_ids[text]): Translation(
+                from_word_id=source_ids[word],
+                to_word_id=target_ids[text],
+                is_approved=True,
+            )
+            for word, text in pairs
+        }
+        Translation.objects.bulk_create(
+            translations.values(),
+            update_conflicts=True,
+            unique_fields=["to_word", "from_word"],
+            update_fields=["is_approved"],
+        )
+        return len(translations)
+
+    @staticmethod
+    def _load_ids(language: Language) -> dict[str, int]:
+        return dict(
+            Word.objects.filter(language=language)
+            .values_list("word", "id")
+            .iterator(chunk_size=10000)
+        )
+
+    @staticmethod
+    def _get_ids(language: Language, ids: dict[str, int], words: set[str]) -> dict:
+        missing = words - ids.keys()
+        if missing:
+            ids.update(Word.objects.get_or_create_ids(language.id, missing))
+        return ids
+
+
+class DictionaryImporter(TranslationImporter):
+    """
+    Imports translations into a user's dictionary in chunks.
+
+    Each chunk is added with Dictionary.add_translations(), which looks up the existing words
+    of the chunk and attaches the translations in bulk. The translations are not approved.
+    """
+
+    def __init__(self, dictionary: Dictionary, chunk_size: int = 2000):
+        super().__init__(
+            dictionary.source_language,
+            dictionary.target_language,
+            chunk_size=chunk_size,
+            preload=False,
+        )
+        self.dictionary = dictionary
+
+    def save_chunk(self, pairs: list[tuple[str, str]]) -> int:
+        """
+        Add a chunk of pairs to the dictionary.
+
+        Returns:
+            int: number of distinct pairs passed to the dictionary
+        """
+        return self.dictionary.add_translations(pairs)
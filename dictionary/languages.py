@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+if TYPE_CHECKING:
+    from dictionary.models import Language
+
+VERSION_KEY = "languages:version"
+
+
+class LanguageInfo(NamedTuple):
+    id: int
+    code: str
+    name: str
+
+    def to_model(self) -> Language:
+        """
+        Return a Language instance with the values of the registry, without a query.
+        """
+        from dictionary.models import Language
+
+        language = Language(id=self.id, code=self.code, name=self.name)
+        language._state.adding = False
+        return language
+
+
+class LanguageRegistry:
+    """
+    An immutable snapshot of the Language table.
+    """
+
+    def __init__(self, languages: Iterable[LanguageInfo], version: str | None = None):
+        languages = tuple(languages)
+        self.version = version
+        self.by_code = MappingProxyType(
+            {language.code: language for language in languages}
+        )
+        self.by_id = MappingProxyType({language.id: language for language in languages})
+
+    @classmethod
+    def load(cls, version: str | None = None) -> LanguageRegistry:
+        # Imported here because the models use the registry
+        from dictionary.models import Language
+
+        return cls(
+            (
+                LanguageInfo(*row)
+                for row in Language.objects.order_by("id").values_list(
+                    "id", "code", "name"
+                )
+            ),
+            version,
+        )
+
+    def get_id(self, code: str) -> int | None:
+        """
+        Return the id of the language with the code, None if there is no such language.
+        """
+        language = self.by_code.get(code)
+        return language.id if language is not None else None
+
+    def get_choices(self) -> list[tuple[int, str]]:
+        """
+        Return (id, name) pairs of the languages for choice fields.
+        """
+        return [(language.id, language.name) for language in self.by_id.values()]
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.by_code
+
+    def __len__(self) -> int:
+        return len(self.by_code)
+
+
+_registry = None
+_checked_at = 0.0
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def get_language_registry() -> LanguageRegistry:
+    """
+    Return the language registry of the process, loading it from the database when it is outdated.
+
+    The version of the Language table is kept in a shared cache and is changed when a language is saved
+    or deleted (see dictionary.signals). The registry compares it with its own version at most once
+    every CHECK_INTERVAL seconds and is reloaded after MAX_AGE seconds in any case, so workers that
+    do not share a cache also pick up the changes.
+    """
+    global _registry, _checked_at, _loaded_at
+    registry = _get_checked_registry()
+    if registry is not None:
+        return registry
+
+    options = settings.LANGUAGE_REGISTRY
+    now = time.monotonic()
+    with _lock:
+        version = caches[options["CACHE_ALIAS"]].get(VERSION_KEY)
+        if (
+            _registry is None
+            or _registry.version != version
+            or now - _loaded_at >= options["MAX_AGE"]
+        ):
+            _registry = LanguageRegistry.load(version)
+            _loaded_at = now
+        _checked_at = now
+        return _registry
+
+
+async def aget_language_registry() -> LanguageRegistry:
+    """
+    Async version of get_language_registry(), the registry is checked and loaded in a thread,
+    so the event loop is not blocked by the cache and the database.
+    """
+    registry = _get_checked_registry()
+    if registry is not None:
+        return registry
+    return await sync_to_async(get_language_registry)()
+
+
+def _get_checked_registry() -> LanguageRegistry | None:
+    """
+    Return the registry if it was checked within CHECK_INTERVAL and loaded within MAX_AGE seconds.
+    """
+    options = settings.LANGUAGE_REGISTRY
+    now = time.monotonic()
+    registry = _registry
+    if (
+        registry is not None
+        and now - _checked_at < options["CHECK_INTERVAL"]
+        and now - _loaded_at < options["MAX_AGE"]
+    ):
+        return registry
+    return None
+
+
+def invalidate_language_registry() -> None:
+    """
+    Make every worker reload the language registry on its next use.
+    """
+    caches[settings.LANGUAGE_REGISTRY["CACHE_ALIAS"]].set(
+        VERSION_KEY, uuid.uuid4().hex, None
+    )
+    reset_language_registry()
+
+
+def reset_language_registry() -> None:
+    """
+    Make the current worker reload the language registry on its next use.
+    """
+    global _registry
+    with _lock:
+        _registry = None
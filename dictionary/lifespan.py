@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+
+from dictionary.clients import aclose_client_registry, get_client_registry
+
+logger = logging.getLogger(__name__)
+
+
+async def startup() -> None:
+    """
+    Prepare the worker on its event loop before it serves requests.
+    """
+    if settings.AZURE_TRANSLATOR_CLIENT["WARM_UP"]:
+        try:
+            await get_client_registry().awarm_up()
+        except Exception:
+            logger.exception("Azure Translator client warm-up failed")
+
+
+async def shutdown() -> None:
+    """
+    Release the resources of the worker's event loop before it stops.
+    """
+    await aclose_client_registry()
+
+
+class LifespanMiddleware:
+    """
+    Handles the ASGI lifespan protocol, which Django's ASGI handler does not support.
+
+    startup() and shutdown() run on the event loop that serves the requests, so they can
+    prepare and close the loop-bound async clients. Other connections go to the application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await startup()
+                except Exception as error:
+                    await send(
+                        {"type": "lifespan.startup.failed", "message": str(error)}
+                    )
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    await shutdown()
+                except Exception:
+                    logger.exception("Worker shutdown failed")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dictionary.orphans import OrphanCollector
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove unapproved translations that are in no dictionary and words without "
+        "translations, in batches that can run alongside the site."
+    )
+
+    def add_arguments(self, parser):
+        options = settings.ORPHAN_COLLECTION
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=options["BATCH_SIZE"],
+            help="Number of primary keys walked by one batch.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=options["MIN_AGE"],
+            help="Rows younger than this number of seconds are kept.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            help="Stop after this number of batches, continue later with --resume.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default="collect_orphans.checkpoint",
+            help="File that keeps the position of the collection.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted collection from its checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint_path = Path(options["checkpoint"])
+        cursor = None
+        if options["resume"] and checkpoint_path.is_file():
+            try:
+                cursor = json.loads(checkpoint_path.read_text())
+            except ValueError:
+                raise CommandError(f"Checkpoint {checkpoint_path} is corrupted.")
+            self.stdout.write(f"Resuming after {cursor['phase']} {cursor['after']}.")
+
+        collector = OrphanCollector(
+            batch_size=options["batch_size"],
+            min_age=timedelta(seconds=options["min_age"]),
+        )
+        start = time.monotonic()
+
+        def on_batch(cursor, stats):
+            self.write_checkpoint(checkpoint_path, cursor)
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{cursor['phase']} up to {cursor['after']}: {stats['translations']} "
+                    f"translations and {stats['words']} words removed"
+                )
+
+        cursor, stats = collector.collect(
+            cursor, max_batches=options["max_batches"], on_batch=on_batch
+        )
+        if cursor is None:
+            checkpoint_path.unlink(missing_ok=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {stats['translations']} translations and {stats['words']} words "
+                f"in {time.monotonic() - start:.1f}s, {stats['skipped']} batches skipped."
+            )
+        )
+        if cursor is not None:
+            self.stdout.write("Stopped, continue with --resume.")
+
+    @staticmethod
+    def write_checkpoint(path: Path, cursor: dict) -> None:
+        # Written to a temporary file and renamed, so an interrupted write keeps the previous checkpoint
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        temporary_path.write_text(json.dumps(cursor))
+        os.replace(temporary_path, path)
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dictionary.importers import (
+    FORMATS,
+    TranslationImporter,
+    detect_format,
+    open_word_list,
+    read_pairs,
+)
+from dictionary.models import Language
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a bilingual word list (TSV, CSV or JSONL, optionally gzip-compressed) "
+        "as approved translations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="Path of the word list.")
+        parser.add_argument(
+            "--from", dest="source", required=True, help="Code of the word language."
+        )
+        parser.add_argument(
+            "--to",
+            dest="target",
+            required=True,
+            help="Code of the translation language.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format of the word list, detected from the file name by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of rows saved in one transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File that keeps the progress of the import, FILE.checkpoint by default.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted import from its checkpoint.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"])
+        if not path.is_file():
+            raise CommandError(f"File {path} does not exist.")
+        try:
+            format = options["format"] or detect_format(path.name)
+        except ValueError as error:
+            raise CommandError(error)
+        source = self.get_language(options["source"])
+        target = self.get_language(options["target"])
+        if source == target:
+            raise CommandError("Source and target languages must be different.")
+
+        checkpoint_path = Path(options["checkpoint"] or f"{path}.checkpoint")
+        checkpoint = {
+            "file": str(path.resolve()),
+            "size": path.stat().st_size,
+            "mtime": path.stat().st_mtime,
+            "from": source.code,
+            "to": target.code,
+            "rows": 0,
+        }
+        if options["resume"]:
+            checkpoint["rows"] = self.read_checkpoint(checkpoint_path, checkpoint)
+
+        importer = TranslationImporter(source, target, options["chunk_size"])
+        start = time.monotonic()
+
+        def on_chunk(stats):
+            checkpoint["rows"] = stats["rows"]
+            self.write_checkpoint(checkpoint_path, checkpoint)
+            if options["verbosity"] > 1:
+                rate = (stats["rows"] - skipped) / (time.monotonic() - start)
+                self.stdout.write(
+                    f"{stats['rows']} rows read, {stats['translations']} translations "
+                    f"saved ({rate:.0f} rows/s)"
+                )
+
+        skipped = checkpoint["rows"]
+        if skipped:
+            self.stdout.write(f"Resuming after {skipped} rows.")
+        with open_word_list(path) as stream:
+            stats = importer.import_pairs(
+                read_pairs(stream, format), skip=skipped, on_chunk=on_chunk
+            )
+        checkpoint_path.unlink(missing_ok=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {stats['translations']} translations from "
+                f"{stats['rows'] - skipped} rows in {time.monotonic() - start:.1f}s, "
+                f"{stats['invalid']} invalid rows skipped."
+            )
+        )
+
+    @staticmethod
+    def get_language(code: str) -> Language:
+        try:
+            return Language.objects.get(code=code)
+        except Language.DoesNotExist:
+            raise CommandError(f"Language {code} does not exist.")
+
+    @staticmethod
+    def read_checkpoint(path: Path, expected: dict) -> int:
+        """
+        Return the number of rows imported by the interrupted run.
+        """
+        if not path.is_file():
+            return 0
+        checkpoint = json.loads(path.read_text())
+        if any(
+            checkpoint.get(key) != expected[key] for key in expected if key != "rows"
+        ):
+            raise CommandError(
+                f"Checkpoint {path} belongs to another import or the file has changed."
+            )
+        return checkpoint["rows"]
+
+    @staticmethod
+    def write_checkpoint(path: Path, checkpoint: dict) -> None:
+        # Written to a temporary file and renamed, so an interrupted write keeps the previous checkpoint
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        temporary_path.write_text(json.dumps(checkpoint))
+        os.replace(temporary_path, path)
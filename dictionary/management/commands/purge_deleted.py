@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from dictionary.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove deleted dictionaries and accounts. They are removed in the background "
+        "when they are deleted, the command finishes purges interrupted by a restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Number of translations removed by one query.",
+        )
+
+    def handle(self, *args, **options):
+        stats = purge_deleted(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {stats['dictionaries']} dictionaries with "
+                f"{stats['translations']} translations and {stats['users']} users."
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from dictionary.import_jobs import resume_import_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Finish the imports of word lists interrupted by a restart. Workers resume them "
+        "when they start, run it while no worker imports, e.g. when no worker is running."
+    )
+
+    def handle(self, *args, **options):
+        stats = resume_import_jobs()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resumed {stats['resumed']} imports, {stats['lost']} failed "
+                "because their file was lost."
+            )
+        )
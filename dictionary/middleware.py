@@ -1,8 +1,13 @@
-from typing import Callable
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
 from django.contrib.messages import get_messages
 from django.http import HttpRequest, HttpResponse
 from django.template.loader import render_to_string
+from django.urls import Resolver404, resolve
+
+from wordnest.routers import read_from_replica
 
 # Implementation of the middleware class was taken from
 # https://danjacob.net/posts/htmx_messages/ tutorial
@@ -42,3 +47,121 @@ class HtmxMessagesMiddleware:
             )
 
         return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sends the reads of read-only views to the database replicas.
+
+    A view opts in with a `replica_methods` attribute, the HTTP methods it only reads in.
+    The content of a streaming response is read from the replica too, as it is sent.
+    A successful request with any other unsafe method sets a cookie that pins the user's
+    requests to the primary database for PRIMARY_PIN_SECONDS, so they read their own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+    cookie_name = "primary_pin"
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self._get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self._acall(request)
+
+        replica_methods = self._get_replica_methods(request)
+        if self._reads_from_replica(request, replica_methods):
+            with read_from_replica():
+                response = self._get_response(request)
+            self._stream_from_replica(response)
+        else:
+            response = self._get_response(request)
+        self._pin_primary(request, response, replica_methods)
+        return response
+
+    async def _acall(self, request: HttpRequest) -> HttpResponse:
+        replica_methods = self._get_replica_methods(request)
+        if self._reads_from_replica(request, replica_methods):
+            with read_from_replica():
+                response = await self._get_response(request)
+            self._stream_from_replica(response)
+        else:
+            response = await self._get_response(request)
+        self._pin_primary(request, response, replica_methods)
+        return response
+
+    @staticmethod
+    def _get_replica_methods(request: HttpRequest) -> tuple[str, ...]:
+        # The view is resolved here, so everything the request reads, including the rendering
+        # of the template, happens inside the read_from_replica() block
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return ()
+        view_class = getattr(match.func, "view_class", None)
+        return getattr(view_class, "replica_methods", ())
+
+    @staticmethod
+    def _stream_from_replica(response: HttpResponse) -> None:
+        # The content of a streaming response is produced after the view returned,
+        # when the server iterates over it
+        if not response.streaming:
+            return
+        if response.is_async:
+            response.streaming_content = _aiter_from_replica(response.streaming_content)
+        else:
+            response.streaming_content = _iter_from_replica(response.streaming_content)
+
+    def _reads_from_replica(
+        self, request: HttpRequest, replica_methods: tuple[str, ...]
+    ) -> bool:
+        return (
+            request.method in replica_methods
+            and self.cookie_name not in request.COOKIES
+        )
+
+    def _pin_primary(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        replica_methods: tuple[str, ...],
+    ) -> None:
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+            and request.method not in replica_methods
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=settings.PRIMARY_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+
+def _iter_from_replica(content: Iterable) -> Iterator:
+    # The flag is set around each step only, so it is set and reset in the same context
+    # whichever thread the server iterates in
+    iterator = iter(content)
+    while True:
+        with read_from_replica():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+async def _aiter_from_replica(content: AsyncIterable) -> AsyncIterator:
+    iterator = aiter(content)
+    while True:
+        with read_from_replica():
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+        yield chunk
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.4 on 2026-10-18 06:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dictionary", "0007_translation_is_approved"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="translation",
+            name="to_word",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="target_word",
+                to="dictionary.word",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                condition=models.Q(("is_approved", True)),
+                fields=["from_word", "to_word"],
+                name="approved_translation_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="word",
+            index=models.Index(
+                fields=["word"], name="word_prefix_idx", opclasses=["text_pattern_ops"]
+            ),
+        ),
+    ]
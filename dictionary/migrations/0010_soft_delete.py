@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0009_importjob"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="dictionary",
+            name="unique_language_pair_per_user",
+        ),
+        migrations.AddField(
+            model_name="dictionary",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="dictionary",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("user", "source_language", "target_language"),
+                name="unique_language_pair_per_user",
+            ),
+        ),
+    ]
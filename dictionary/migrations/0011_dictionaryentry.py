@@ -0,0 +1,119 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_entries(apps, schema_editor):
+    DictionaryEntry = apps.get_model("dictionary", "DictionaryEntry")
+    Translation = apps.get_model("dictionary", "Translation")
+    translations = Translation.objects.filter(pk=OuterRef("translation_id"))
+    # The time a translation was added to a dictionary was not kept,
+    # the time it was created is the closest one
+    DictionaryEntry.objects.using(schema_editor.connection.alias).update(
+        from_word_id=Subquery(translations.values("from_word_id")),
+        added_at=Subquery(translations.values("created_at")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0010_soft_delete"),
+    ]
+
+    operations = [
+        # The auto-created through table is kept, only the state gets the explicit model
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="DictionaryEntry",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        (
+                            "dictionary",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="entries",
+                                to="dictionary.dictionary",
+                            ),
+                        ),
+                        (
+                            "translation",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="+",
+                                to="dictionary.translation",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "dictionary_dictionary_translations",
+                        "unique_together": {("dictionary", "translation")},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name="dictionary",
+                    name="translations",
+                    field=models.ManyToManyField(
+                        related_name="+",
+                        through="dictionary.DictionaryEntry",
+                        to="dictionary.translation",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="from_word",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="dictionary.word",
+            ),
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="added_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_entries, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="dictionaryentry",
+            name="from_word",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="dictionary.word",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dictionaryentry",
+            name="added_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["dictionary", "added_at", "id"],
+                name="dictionary_entry_added_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["dictionary", "from_word"], name="dictionary_entry_word_idx"
+            ),
+        ),
+    ]
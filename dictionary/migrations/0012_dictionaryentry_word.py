@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_words(apps, schema_editor):
+    DictionaryEntry = apps.get_model("dictionary", "DictionaryEntry")
+    Word = apps.get_model("dictionary", "Word")
+    DictionaryEntry.objects.using(schema_editor.connection.alias).update(
+        word=Subquery(Word.objects.filter(pk=OuterRef("from_word_id")).values("word"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0011_dictionaryentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="word",
+            field=models.TextField(default=""),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_words, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["dictionary", "word", "id"], name="dictionary_entry_text_idx"
+            ),
+        ),
+    ]
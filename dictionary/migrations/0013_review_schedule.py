@@ -0,0 +1,45 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0012_dictionaryentry_word"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="due_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="ease_factor",
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="interval",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="repetitions",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="dictionaryentry",
+            name="reviewed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="dictionaryentry",
+            index=models.Index(
+                fields=["dictionary", "due_at", "id"], name="dictionary_entry_due_idx"
+            ),
+        ),
+    ]
@@ -1,11 +1,78 @@
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models, transaction
-from django.db.models import F, Q, QuerySet
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Exists, F, Min, OuterRef, Q, QuerySet
 from django.forms import ValidationError
+from django.utils import timezone
+
+from dictionary.fuzzy import get_fuzzy_index, update_fuzzy_index
+from dictionary.languages import get_language_registry
+from dictionary.suggestions import add_words
+
+
+class TranslationGroup(NamedTuple):
+    """
+    A source word of a dictionary with its target words.
+    """
+
+    from_word_id: int
+    from_word: str
+    to_words: list[str]
+
+
+def _atomic_with_retry(func: Callable, *args):
+    """
+    Run func in a transaction, once more if the transaction fails because the orphan collector
+    (dictionary.orphans) removed a word or translation that func reused.
+    """
+    try:
+        with transaction.atomic():
+            return func(*args)
+    except IntegrityError:
+        with transaction.atomic():
+            return func(*args)
+
+
+def _insert_missing(
+    insert: Callable[[set], None], select: Callable[[set], dict], keys: set
+) -> dict:
+    """
+    Insert the rows of the keys with INSERT ... ON CONFLICT DO NOTHING and return their ids.
+
+    A row the INSERT skipped because it exists may be removed by the orphan collector
+    (dictionary.orphans) before the SELECT reads it back. Such rows are inserted once more,
+    younger than the collector's minimum age. If one is still missing, the conflict is raised
+    as an IntegrityError, like the other collector races, see _atomic_with_retry().
+
+    Args:
+        insert (Callable[[set], None]): inserts the rows of the keys, skipping existing ones
+        select (Callable[[set], dict]): reads the ids of the keys
+        keys (set): keys of the rows
+
+    Returns:
+        dict: keys mapped to the row ids
+    """
+    ids = {}
+    missing = set(keys)
+    for _ in range(2):
+        insert(missing)
+        ids.update(select(missing))
+        missing -= ids.keys()
+        if not missing:
+            return ids
+    raise IntegrityError(f"{len(missing)} rows were removed while they were reused")
 
 
 class UserManager(BaseUserManager):
@@ -44,6 +111,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_superuser = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
+    # Set when the account is deleted, the user is removed later by dictionary.deletion
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     objects = UserManager()
 
@@ -73,13 +142,59 @@ class User(AbstractBaseUser, PermissionsMixin):
         Returns:
             None
         """
+        languages = get_language_registry()
         dictionary = self.dictionaries.get(
-            user=self,
-            source_language__code=source_language,
-            target_language__code=target_language,
+            source_language_id=languages.get_id(source_language),
+            target_language_id=languages.get_id(target_language),
+        )
+        _atomic_with_retry(dictionary.add_translation, word, translation)
+
+    async def aadd_word_to_dictionary(
+        self, source_language: str, target_language: str, word: str, translation: str
+    ) -> None:
+        """
+        Async version of add_word_to_dictionary().
+        """
+        await sync_to_async(self.add_word_to_dictionary)(
+            source_language, target_language, word, translation
+        )
+
+    def add_words_to_dictionary(
+        self,
+        source_language: str,
+        target_language: str,
+        pairs: Iterable[tuple[str, str]],
+    ) -> int:
+        """
+        Add a batch of words to the user's dictionary.
+
+        Args:
+            source_language (str): source language code
+            target_language (str): target language code
+            pairs (Iterable[tuple[str, str]]): words with their translations
+
+        Returns:
+            int: number of distinct pairs passed to the dictionary
+        """
+        languages = get_language_registry()
+        dictionary = self.dictionaries.get(
+            source_language_id=languages.get_id(source_language),
+            target_language_id=languages.get_id(target_language),
+        )
+        return _atomic_with_retry(dictionary.add_translations, list(pairs))
+
+    async def aadd_words_to_dictionary(
+        self,
+        source_language: str,
+        target_language: str,
+        pairs: Iterable[tuple[str, str]],
+    ) -> int:
+        """
+        Async version of add_words_to_dictionary().
+        """
+        return await sync_to_async(self.add_words_to_dictionary)(
+            source_language, target_language, pairs
         )
-        with transaction.atomic():
-            dictionary.add_translation(word, translation)
 
     def get_word_translations(self, word, source_language, target_language):
         """
@@ -93,9 +208,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         Returns:
             list: list of translations
         """
+        languages = get_language_registry()
         dictionary = self.dictionaries.get(
-            source_language__code=source_language,
-            target_language__code=target_language,
+            source_language_id=languages.get_id(source_language),
+            target_language_id=languages.get_id(target_language),
         )
         return dictionary.get_translations(word)
 
@@ -116,6 +232,86 @@ class User(AbstractBaseUser, PermissionsMixin):
         return total_translations if total_translations else 0
 
 
+class WordManager(models.Manager):
+    def get_or_create_ids(self, language_id: int, words) -> dict[str, int]:
+        """
+        Return ids of the words in the language, creating the missing ones in bulk.
+
+        Args:
+            language_id (int): id of the language of the words
+            words (Iterable[str]): words to get ids for, they are stored in lowercase
+
+        Returns:
+            dict[str, int]: lowercased words mapped to their ids
+        """
+        words = {word.lower() for word in words}
+        ids = dict(
+            self.filter(language_id=language_id, word__in=words).values_list(
+                "word", "id"
+            )
+        )
+        missing = words - ids.keys()
+        if missing:
+            created = _insert_missing(
+                self._insert_sorted,
+                self._select_ids,
+                {(language_id, word) for word in missing},
+            )
+            ids.update((word, pk) for (_, word), pk in created.items())
+            transaction.on_commit(partial(add_words, language_id, missing))
+        return ids
+
+    def upsert_ids(
+        self, words: Iterable[tuple[int, str]]
+    ) -> dict[tuple[int, str], int]:
+        """
+        Return ids of the words, creating the missing ones with one INSERT ... ON CONFLICT DO NOTHING
+        statement and reading all the ids with one more query.
+
+        Existing rows are skipped, not updated, so adds of a popular word neither lock nor rewrite
+        its row. A concurrent upsert of a new word waits for the transaction that inserts it
+        instead of failing on the unique constraint. Rows are inserted in a fixed order, so
+        concurrent upserts cannot deadlock. Rows removed by the orphan collector between
+        the two statements are inserted again, see _insert_missing().
+
+        Args:
+            words (Iterable[tuple[int, str]]): language ids with words, stored in lowercase
+
+        Returns:
+            dict[tuple[int, str], int]: language ids with lowercased words mapped to the word ids
+        """
+        rows = {(language_id, word.lower()) for language_id, word in words}
+        ids = _insert_missing(self._insert_sorted, self._select_ids, rows)
+        for language_id, group in groupby(sorted(rows), key=itemgetter(0)):
+            transaction.on_commit(
+                partial(add_words, language_id, [word for _, word in group])
+            )
+        return ids
+
+    def _insert_sorted(self, rows: set[tuple[int, str]]) -> None:
+        self.bulk_create(
+            [
+                self.model(language_id=language_id, word=word)
+                for language_id, word in sorted(rows)
+            ],
+            ignore_conflicts=True,
+        )
+
+    def _select_ids(self, rows: set[tuple[int, str]]) -> dict[tuple[int, str], int]:
+        # The database returns no ids of rows inserted with ON CONFLICT DO NOTHING
+        languages = Q()
+        for language_id, group in groupby(sorted(rows), key=itemgetter(0)):
+            languages |= Q(
+                language_id=language_id, word__in=[word for _, word in group]
+            )
+        return {
+            (language_id, word): pk
+            for language_id, word, pk in self.filter(languages).values_list(
+                "language_id", "word", "id"
+            )
+        }
+
+
 class Word(models.Model):
     word = models.TextField()
     language = models.ForeignKey("Language", on_delete=models.CASCADE)
@@ -128,12 +324,22 @@ class Word(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = WordManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["word", "language"], name="unique_word_language"
             )
         ]
+        indexes = [
+            # Prefix search (startswith), opclasses are only used by PostgreSQL
+            models.Index(
+                fields=["word"],
+                opclasses=["text_pattern_ops"],
+                name="word_prefix_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.word
@@ -141,6 +347,7 @@ class Word(models.Model):
     def save(self, *args, **kwargs):
         self.word = self.word.lower()
         super().save(*args, **kwargs)
+        transaction.on_commit(partial(add_words, self.language_id, [self.word]))
 
 
 class Language(models.Model):
@@ -151,22 +358,73 @@ class Language(models.Model):
         return self.name
 
 
+class TranslationManager(models.Manager):
+    def upsert_ids(
+        self, pairs: Iterable[tuple[int, int]]
+    ) -> dict[tuple[int, int], int]:
+        """
+        Return ids of the translations between the words, creating the missing ones
+        with one INSERT ... ON CONFLICT DO NOTHING statement, see WordManager.upsert_ids().
+        The approval of existing translations is kept.
+
+        Args:
+            pairs (Iterable[tuple[int, int]]): ids of the source and target words
+
+        Returns:
+            dict[tuple[int, int], int]: ids of the words mapped to the translation ids
+        """
+        return _insert_missing(self._insert_sorted, self._select_ids, set(pairs))
+
+    def _insert_sorted(self, pairs: set[tuple[int, int]]) -> None:
+        self.bulk_create(
+            [
+                self.model(from_word_id=from_id, to_word_id=to_id)
+                for from_id, to_id in sorted(pairs)
+            ],
+            ignore_conflicts=True,
+        )
+
+    def _select_ids(self, pairs: set[tuple[int, int]]) -> dict[tuple[int, int], int]:
+        # The database returns no ids of rows inserted with ON CONFLICT DO NOTHING.
+        # Translations between other words of the pairs are read too and skipped here
+        translations = self.filter(
+            from_word_id__in={from_id for from_id, _ in pairs},
+            to_word_id__in={to_id for _, to_id in pairs},
+        ).values_list("from_word_id", "to_word_id", "id")
+        return {
+            (from_id, to_id): pk
+            for from_id, to_id, pk in translations
+            if (from_id, to_id) in pairs
+        }
+
+
 class Translation(models.Model):
     from_word = models.ForeignKey(
         Word, on_delete=models.CASCADE, related_name="source_word"
     )
+    # Lookups by to_word use the unique_translation_pair_reverse index
     to_word = models.ForeignKey(
-        Word, on_delete=models.CASCADE, related_name="target_word"
+        Word, on_delete=models.CASCADE, related_name="target_word", db_index=False
     )
     created_at = models.DateTimeField(auto_now_add=True)
     is_approved = models.BooleanField(default=False)
 
+    objects = TranslationManager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["to_word", "from_word"], name="unique_translation_pair_reverse"
             ),
         ]
+        indexes = [
+            # Approved translations of a word, the target word is read from the index
+            models.Index(
+                fields=["from_word", "to_word"],
+                condition=Q(is_approved=True),
+                name="approved_translation_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.from_word} -> {self.to_word}"
@@ -180,25 +438,94 @@ class Translation(models.Model):
 
     @classmethod
     def get_approved_translations(cls, word, source_language, target_language):
+        languages = get_language_registry()
         return cls.objects.filter(
             from_word__word=word,
-            from_word__language__code=source_language,
-            to_word__language__code=target_language,
+            from_word__language_id=languages.get_id(source_language),
+            to_word__language_id=languages.get_id(target_language),
             is_approved=True,
         )
 
+    @classmethod
+    def get_user_translations(
+        cls, word, source_language, target_language, user, languages=None
+    ):
+        """
+        Return approved translations of a word together with the translations from the user's dictionary.
+
+        Translations are annotated with the text of the target word (to_word_text) and whether
+        they are in the user's dictionary (in_user_dictionary). Approved translations go first.
+
+        Args:
+            word (str): word to translate
+            source_language (str): source language code
+            target_language (str): target language code
+            user (User): owner of the dictionary
+            languages (LanguageRegistry): registry to look the language codes up in,
+                                          the registry of the process by default
+
+        Returns:
+            QuerySet: QuerySet of translations
+        """
+        if languages is None:
+            languages = get_language_registry()
+        source_id = languages.get_id(source_language)
+        target_id = languages.get_id(target_language)
+        in_user_dictionary = DictionaryEntry.objects.filter(
+            translation_id=OuterRef("pk"),
+            dictionary__user=user,
+            dictionary__source_language_id=source_id,
+            dictionary__target_language_id=target_id,
+            # A deleted dictionary keeps its translations until they are purged
+            dictionary__deleted_at__isnull=True,
+        )
+        return (
+            cls.objects.filter(
+                from_word__word=word,
+                from_word__language_id=source_id,
+                to_word__language_id=target_id,
+            )
+            .annotate(
+                to_word_text=F("to_word__word"),
+                in_user_dictionary=Exists(in_user_dictionary),
+            )
+            .filter(Q(is_approved=True) | Q(in_user_dictionary=True))
+            .order_by("-is_approved", "pk")
+        )
+
+
+class DictionaryManager(models.Manager):
+    """
+    Hides deleted dictionaries, which are kept until their translations are purged.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 
 class Dictionary(models.Model):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="dictionaries"
     )
-    translations = models.ManyToManyField(Translation, related_name="+")
+    translations = models.ManyToManyField(
+        Translation, through="DictionaryEntry", related_name="+"
+    )
     source_language = models.ForeignKey(
         Language, related_name="+", on_delete=models.CASCADE
     )
     target_language = models.ForeignKey(
         Language, related_name="+", on_delete=models.CASCADE
     )
+    # Set when the dictionary is deleted, it is removed later by dictionary.deletion
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = DictionaryManager()
+    all_objects = models.Manager()
+
+    class Order(models.TextChoices):
+        ALPHABETICAL = "alphabetical", "A-Z"
+        NEWEST = "newest", "Newest first"
+        OLDEST = "oldest", "Oldest first"
 
     class Meta:
         constraints = [
@@ -207,8 +534,10 @@ class Dictionary(models.Model):
                 name="different_languages",
                 violation_error_message="Source and target languages must be different.",
             ),
+            # A deleted dictionary does not keep the user from creating it again
             models.UniqueConstraint(
                 fields=["user", "source_language", "target_language"],
+                condition=Q(deleted_at__isnull=True),
                 name="unique_language_pair_per_user",
             ),
         ]
@@ -227,16 +556,312 @@ class Dictionary(models.Model):
         Returns:
             bool: True if the translation was added, False otherwise.
         """
-        from_word = Word.objects.get_or_create(
-            word=from_word, language=self.source_language
-        )[0]
-        to_word = Word.objects.get_or_create(
-            word=to_word, language=self.target_language
-        )[0]
-        translation = Translation.objects.get_or_create(
-            from_word=from_word, to_word=to_word
-        )[0]
-        self.translations.add(translation)
+        from_word, to_word = from_word.lower(), to_word.lower()
+        # Upserts, so concurrent adds of the same words do not fail on the unique constraints
+        word_ids = Word.objects.upsert_ids(
+            [(self.source_language_id, from_word), (self.target_language_id, to_word)]
+        )
+        from_word_id = word_ids[(self.source_language_id, from_word)]
+        to_word_id = word_ids[(self.target_language_id, to_word)]
+        translation_ids = Translation.objects.upsert_ids([(from_word_id, to_word_id)])
+        # A translation added again keeps the time it was first added
+        DictionaryEntry.objects.bulk_create(
+            [
+                DictionaryEntry(
+                    dictionary_id=self.pk,
+                    translation_id=translation_ids[(from_word_id, to_word_id)],
+                    from_word_id=from_word_id,
+                    word=from_word,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        self._update_fuzzy_index(
+            added=[TranslationGroup(from_word_id, from_word, [to_word])]
+        )
+
+    def add_translations(self, pairs: Iterable[tuple[str, str]]) -> int:
+        """
+        Add a batch of translations to the user's dictionary.
+
+        Existing words are looked up with one query per language, missing words and translations
+        are created in bulk and all translations are attached with one insert, so the number
+        of queries does not depend on the size of the batch.
+
+        Args:
+            pairs (Iterable[tuple[str, str]]): words with their translations
+
+        Returns:
+            int: number of distinct pairs passed to the dictionary
+        """
+        pairs = {(from_word.lower(), to_word.lower()) for from_word, to_word in pairs}
+        if not pairs:
+            return 0
+
+        from_ids = Word.objects.get_or_create_ids(
+            self.source_language_id, {from_word for from_word, _ in pairs}
+        )
+        to_ids = Word.objects.get_or_create_ids(
+            self.target_language_id, {to_word for _, to_word in pairs}
+        )
+        id_pairs = {
+            (from_ids[from_word], to_ids[to_word]) for from_word, to_word in pairs
+        }
+        translation_ids = Translation.objects.upsert_ids(id_pairs)
+        from_words = {pk: word for word, pk in from_ids.items()}
+        DictionaryEntry.objects.bulk_create(
+            [
+                DictionaryEntry(
+                    dictionary_id=self.pk,
+                    translation_id=pk,
+                    from_word_id=from_id,
+                    word=from_words[from_id],
+                )
+                for (from_id, _), pk in translation_ids.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+        to_words = defaultdict(list)
+        for from_word, to_word in pairs:
+            to_words[from_word].append(to_word)
+        self._update_fuzzy_index(
+            added=[
+                TranslationGroup(from_ids[from_word], from_word, words)
+                for from_word, words in to_words.items()
+            ]
+        )
+        return len(pairs)
+
+    def purge(self, batch_size: int = 5000) -> int:
+        """
+        Delete the dictionary, removing its translations in batches.
+
+        delete() removes all entries of the dictionary with one statement,
+        which holds its locks until every row is deleted. Here each batch of `batch_size` rows
+        is removed by primary keys in its own short transaction, and only the keys of one batch
+        are held in memory.
+
+        Args:
+            batch_size (int): number of translations removed by one query
+
+        Returns:
+            int: number of translations removed from the dictionary
+        """
+        rows = DictionaryEntry.objects.filter(dictionary_id=self.pk)
+        removed = 0
+        while ids := list(rows.values_list("pk", flat=True)[:batch_size]):
+            removed += DictionaryEntry.objects.filter(pk__in=ids).delete()[0]
+        Dictionary.all_objects.filter(pk=self.pk).delete()
+        return removed
+
+    def remove_word(self, from_word_id: int) -> None:
+        """
+        Remove a source word with all its translations from the dictionary.
+
+        Args:
+            from_word_id (int): id of the source word
+        """
+        self.entries.filter(from_word_id=from_word_id).delete()
+        self._update_fuzzy_index(removed=[from_word_id])
+
+    def search_similar(
+        self, search: str, limit: int = 25, threshold: float | None = None
+    ) -> list[TranslationGroup]:
+        """
+        Return translation groups whose source word or a translation is similar to the search,
+        most similar first.
+
+        The words are found by the dictionary's in-memory trigram index (see dictionary.fuzzy),
+        so a search with a typo matches too. Only the found groups are read from the database.
+
+        Args:
+            search (str): searched text
+            limit (int): maximum number of source words
+            threshold (float): minimum similarity, FUZZY_SEARCH["THRESHOLD"] by default
+
+        Returns:
+            list[TranslationGroup]: translation groups of the similar source words
+        """
+        if threshold is None:
+            threshold = settings.FUZZY_SEARCH["THRESHOLD"]
+        ranked = get_fuzzy_index(self).search(search, limit, threshold)
+        if not ranked:
+            return []
+        positions = {
+            from_word_id: position for position, (from_word_id, _) in enumerate(ranked)
+        }
+        groups = self.iter_translation_groups(from_word_ids=list(positions))
+        return sorted(groups, key=lambda group: positions[group.from_word_id])
+
+    def _update_fuzzy_index(self, added=(), removed=()) -> None:
+        # The index is changed after the commit, so a rolled back change is not indexed
+        transaction.on_commit(
+            partial(update_fuzzy_index, self.pk, added=added, removed=removed)
+        )
+
+    def get_translation_page(
+        self,
+        search: str | None = None,
+        after: tuple[str, int] | None = None,
+        size: int = 25,
+        order: str = Order.ALPHABETICAL,
+    ) -> tuple[list[TranslationGroup], tuple[str, int] | None]:
+        """
+        Return a page of the dictionary's translations grouped by source words.
+
+        Alphabetically, source words are ordered by their text and the key of a word
+        is (text, id). By recency, they are ordered by the time their newest (or oldest)
+        translation was added to the dictionary and the key is the ISO time and the id
+        of that entry. A page starts after the key of the last word of the previous page
+        and is loaded with two queries that only read the dictionary's translations,
+        whatever its position in the dictionary.
+
+        Args:
+            search (str): only translations whose source or target word starts with it
+            after (tuple[str, int]): key of the last source word of the previous page
+            size (int): number of source words on the page
+            order (str): one of Dictionary.Order
+
+        Returns:
+            tuple: a list of translation groups, and the key of the last source word
+                   if there is a next page, otherwise None
+        """
+        if order != self.Order.ALPHABETICAL:
+            return self._get_recent_page(
+                search, after, size, newest=order == self.Order.NEWEST
+            )
+
+        # The entries are read in the order of the (dictionary, word) index, a source word
+        # is listed at its first entry, the others are skipped by a lookup
+        # in the (dictionary, from_word) index
+        entries = self._search_entries(search)
+        earlier = self._search_entries(search).filter(
+            from_word_id=OuterRef("from_word_id"), pk__lt=OuterRef("pk")
+        )
+        entries = entries.exclude(Exists(earlier))
+        if after is not None:
+            # The text of a source word is unique in a dictionary
+            entries = entries.filter(word__gt=after[0])
+        keys = list(
+            entries.order_by("word", "pk").values_list("word", "from_word_id")[
+                : size + 1
+            ]
+        )
+        next_key = keys[size - 1] if len(keys) > size else None
+
+        groups = self.iter_translation_groups(
+            search, from_word_ids=[pk for _, pk in keys[:size]]
+        )
+        return list(groups), next_key
+
+    def _get_recent_page(
+        self,
+        search: str | None,
+        after: tuple[str, int] | None,
+        size: int,
+        newest: bool,
+    ) -> tuple[list[TranslationGroup], tuple[str, int] | None]:
+        # The entries are read in the order of the (dictionary, added_at) index, a source word
+        # is listed at its newest (oldest) entry, the others are skipped by a lookup
+        # in the (dictionary, from_word) index
+        later, earlier = ("gt", "lt") if newest else ("lt", "gt")
+        entries = self._search_entries(search)
+        preferred = self._search_entries(search).filter(
+            Q(**{f"added_at__{later}": OuterRef("added_at")})
+            | Q(added_at=OuterRef("added_at"), **{f"pk__{later}": OuterRef("pk")}),
+            from_word_id=OuterRef("from_word_id"),
+        )
+        entries = entries.exclude(Exists(preferred))
+        if after is not None:
+            added_at = datetime.fromisoformat(after[0])
+            entries = entries.filter(
+                Q(**{f"added_at__{earlier}": added_at})
+                | Q(added_at=added_at, **{f"pk__{earlier}": after[1]})
+            )
+        ordering = ("-added_at", "-pk") if newest else ("added_at", "pk")
+        keys = list(
+            entries.order_by(*ordering).values_list("from_word_id", "added_at", "pk")[
+                : size + 1
+            ]
+        )
+        next_key = None
+        if len(keys) > size:
+            _, added_at, pk = keys[size - 1]
+            next_key = (added_at.isoformat(), pk)
+
+        positions = {
+            from_word_id: position
+            for position, (from_word_id, _, _) in enumerate(keys[:size])
+        }
+        groups = self.iter_translation_groups(search, from_word_ids=list(positions))
+        groups = sorted(groups, key=lambda group: positions[group.from_word_id])
+        return groups, next_key
+
+    def iter_translation_groups(
+        self,
+        search: str | None = None,
+        from_word_ids: list[int] | None = None,
+        chunk_size: int = 2000,
+        after: str | None = None,
+    ) -> Iterator[TranslationGroup]:
+        """
+        Iterate over the dictionary's translations grouped by source words, ordered by the source words.
+
+        The dictionary's entries are read in the order of the (dictionary, word) index, so nothing
+        is sorted. On PostgreSQL the target words are aggregated by the database (array_agg) and
+        the groups are streamed from a server-side cursor. Other databases stream the entries
+        and they are grouped on the fly. Either way only `chunk_size` rows are held in memory.
+
+        Args:
+            search (str): only translations whose source or target word starts with it
+            from_word_ids (list[int]): only translations of these source words
+            chunk_size (int): number of rows fetched from the database at a time
+            after (str): only source words that go after this one
+
+        Returns:
+            Iterator[TranslationGroup]: source words with their target words
+        """
+        entries = self._search_entries(search)
+        if from_word_ids is not None:
+            entries = entries.filter(from_word_id__in=from_word_ids)
+        if after is not None:
+            entries = entries.filter(word__gt=after)
+
+        if connections[entries.db].vendor == "postgresql":
+            from django.contrib.postgres.aggregates import ArrayAgg
+
+            # The entries of a source word share its text, grouping by the text alone
+            # keeps the order of the index
+            rows = (
+                entries.values("word")
+                .annotate(
+                    source_id=Min("from_word_id"),
+                    to_words=ArrayAgg("translation__to_word__word", ordering="pk"),
+                )
+                .order_by("word")
+                .values_list("source_id", "word", "to_words")
+            )
+            for row in rows.iterator(chunk_size=chunk_size):
+                yield TranslationGroup(*row)
+            return
+
+        rows = (
+            entries.order_by("word", "pk")
+            .values_list("from_word_id", "word", "translation__to_word__word")
+            .iterator(chunk_size=chunk_size)
+        )
+        for (from_word_id, from_word), group in groupby(rows, key=itemgetter(0, 1)):
+            yield TranslationGroup(from_word_id, from_word, [row[2] for row in group])
+
+    def _search_entries(self, search: str | None) -> QuerySet:
+        entries = DictionaryEntry.objects.filter(dictionary_id=self.pk)
+        if search:
+            entries = entries.filter(
+                Q(word__startswith=search)
+                | Q(translation__to_word__word__startswith=search)
+            )
+        return entries
 
     def get_translations(self, word: str) -> QuerySet:
         """
@@ -249,3 +874,146 @@ class Dictionary(models.Model):
             QuerySet: QuerySet of translations for a word in particular dictionary.
         """
         return self.translations.filter(from_word__word=word)
+
+
+class DictionaryEntryQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Fill in the source words of entries created without them,
+        as by Dictionary.translations.add().
+        """
+        objs = list(objs)
+        missing = {
+            obj.translation_id
+            for obj in objs
+            if obj.from_word_id is None or not obj.word
+        }
+        if missing:
+            from_words = {
+                pk: (from_word_id, word)
+                for pk, from_word_id, word in Translation.objects.filter(
+                    pk__in=missing
+                ).values_list("pk", "from_word_id", "from_word__word")
+            }
+            for obj in objs:
+                if obj.translation_id in from_words:
+                    obj.from_word_id, obj.word = from_words[obj.translation_id]
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class DictionaryEntry(models.Model):
+    """
+    A translation in a dictionary, with the time it was added.
+
+    The source word of the translation and its text are copied here, so the dictionary's words
+    can be listed alphabetically or by the time they were added without joining the translations.
+    """
+
+    dictionary = models.ForeignKey(
+        Dictionary, on_delete=models.CASCADE, related_name="entries"
+    )
+    translation = models.ForeignKey(
+        Translation, on_delete=models.CASCADE, related_name="+"
+    )
+    from_word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name="+")
+    # Text of the source word, words are never renamed
+    word = models.TextField()
+    added_at = models.DateTimeField(default=timezone.now)
+    # Spaced repetition (SM-2) state of the translation, see dictionary.reviews.
+    # New translations are due at once.
+    due_at = models.DateTimeField(default=timezone.now)
+    interval = models.PositiveIntegerField(default=0)
+    ease_factor = models.FloatField(default=2.5)
+    repetitions = models.PositiveIntegerField(default=0)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = DictionaryEntryQuerySet.as_manager()
+
+    class Meta:
+        # The table of the auto-created through model it replaced
+        db_table = "dictionary_dictionary_translations"
+        unique_together = [("dictionary", "translation")]
+        indexes = [
+            # Pages by recency, the id breaks ties, so they are read from the index in order
+            models.Index(
+                fields=["dictionary", "added_at", "id"],
+                name="dictionary_entry_added_idx",
+            ),
+            models.Index(
+                fields=["dictionary", "from_word"],
+                name="dictionary_entry_word_idx",
+            ),
+            # Alphabetical pages, read from the index in order
+            models.Index(
+                fields=["dictionary", "word", "id"],
+                name="dictionary_entry_text_idx",
+            ),
+            # Due queue of the reviews, the next due translation is the first entry
+            models.Index(
+                fields=["dictionary", "due_at", "id"],
+                name="dictionary_entry_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.translation} in {self.dictionary}"
+
+
+class ImportJob(models.Model):
+    """
+    Import of an uploaded word list into a user's dictionary, run in the background
+    by dictionary.import_jobs. The counters are updated after each imported chunk.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Waiting"
+        RUNNING = "running", "Importing"
+        DONE = "done", "Imported"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="import_jobs")
+    dictionary = models.ForeignKey(
+        Dictionary, on_delete=models.CASCADE, related_name="import_jobs"
+    )
+    file_name = models.CharField(max_length=255)
+    # Uploaded copy of the file, removed when the import ends
+    path = models.CharField(max_length=500)
+    format = models.CharField(max_length=10)
+    size = models.PositiveBigIntegerField()
+    bytes_read = models.PositiveBigIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    translations = models.PositiveIntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Import of {self.file_name} into {self.dictionary}"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    @property
+    def is_stale(self) -> bool:
+        """
+        Whether the job is unfinished and was not updated for DICTIONARY_IMPORT["STALE_AFTER"]
+        seconds, i.e. the worker that imported it stopped.
+        """
+        stale_after = settings.DICTIONARY_IMPORT["STALE_AFTER"]
+        return not self.is_finished and (
+            (timezone.now() - self.updated_at).total_seconds() >= stale_after
+        )
+
+    @property
+    def progress(self) -> int:
+        """
+        Percentage of the file read so far.
+        """
+        if self.status == self.Status.DONE:
+            return 100
+        return min(99, self.bytes_read * 100 // self.size) if self.size else 0
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from dictionary.models import DictionaryEntry, Translation, Word
+
+logger = logging.getLogger(__name__)
+
+# Translations go first, removing them leaves more orphan words
+PHASES = ("translations", "words")
+
+
+class OrphanCollector:
+    """
+    Removes unapproved translations that are in no dictionary and words without translations.
+
+    The tables are walked in batches of `batch_size` primary keys (keyset pagination), so a batch
+    costs the same anywhere in the table and a collection can be resumed from the last key.
+    Each batch is removed by one DELETE in its own transaction. The DELETE checks again that
+    the rows are unreferenced, rows younger than `min_age` are kept, so rows being created
+    by requests are not removed. A batch that fails because a request reused one of its rows
+    meanwhile is skipped, the rows are collected by a later run if they are orphans again.
+    """
+
+    def __init__(self, batch_size: int = 1000, min_age: timedelta = timedelta(hours=1)):
+        self.batch_size = batch_size
+        self.min_age = min_age
+
+    def collect(
+        self,
+        cursor: dict | None = None,
+        max_batches: int | None = None,
+        on_batch: Callable[[dict, dict], None] | None = None,
+    ) -> tuple[dict, dict]:
+        """
+        Remove orphan rows, starting from the cursor.
+
+        Args:
+            cursor (dict): position of a previous collection, the last key of each table
+            max_batches (int): stop after this number of batches, the whole tables by default
+            on_batch (Callable[[dict, dict], None]): called with the cursor and the statistics
+                                                     after each batch
+
+        Returns:
+            tuple[dict, dict]: the cursor, None when the collection is complete, and the number
+                               of removed translations and words and of skipped batches
+        """
+        cursor = dict(cursor or {"phase": PHASES[0], "after": 0})
+        stats = {"translations": 0, "words": 0, "skipped": 0}
+        cutoff = timezone.now() - self.min_age
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            model = Translation if cursor["phase"] == "translations" else Word
+            keys = list(
+                model.objects.filter(pk__gt=cursor["after"])
+                .order_by("pk")
+                .values_list("pk", flat=True)[: self.batch_size]
+            )
+            if not keys:
+                phase = PHASES.index(cursor["phase"]) + 1
+                if phase == len(PHASES):
+                    return None, stats
+                cursor = {"phase": PHASES[phase], "after": 0}
+                continue
+
+            rows = self.get_orphans(cursor["phase"], cutoff).filter(
+                pk__gt=cursor["after"], pk__lte=keys[-1]
+            )
+            try:
+                with transaction.atomic():
+                    # Not delete(), which would cascade to rows referencing them meanwhile
+                    stats[cursor["phase"]] += rows._raw_delete(rows.db)
+            except IntegrityError:
+                logger.info("Orphan %s reused, batch skipped", cursor["phase"])
+                stats["skipped"] += 1
+            cursor["after"] = keys[-1]
+            batches += 1
+            if on_batch is not None:
+                on_batch(cursor, stats)
+        return cursor, stats
+
+    @staticmethod
+    def get_orphans(phase: str, cutoff) -> QuerySet:
+        """
+        Return the orphan translations or words created before the cutoff.
+        """
+        if phase == "translations":
+            in_dictionary = DictionaryEntry.objects.filter(
+                translation_id=OuterRef("pk")
+            )
+            return Translation.objects.filter(
+                is_approved=False, created_at__lt=cutoff
+            ).exclude(Exists(in_dictionary))
+        return (
+            Word.objects.filter(created_at__lt=cutoff)
+            .exclude(Exists(Translation.objects.filter(from_word_id=OuterRef("pk"))))
+            .exclude(Exists(Translation.objects.filter(to_word_id=OuterRef("pk"))))
+        )
+
+
+CURSOR_KEY = "orphan_collection:cursor"
+
+
+def collect_orphans_incrementally() -> dict:
+    """
+    Continue the collection of orphans for at most settings.ORPHAN_COLLECTION["MAX_BATCHES"]
+    batches. The cursor is kept in the cache, so each call resumes where the last one stopped
+    and a new pass starts after a complete one.
+
+    Returns:
+        dict: number of removed translations and words and of skipped batches
+    """
+    options = settings.ORPHAN_COLLECTION
+    cache = caches[options["CACHE_ALIAS"]]
+    collector = OrphanCollector(
+        batch_size=options["BATCH_SIZE"],
+        min_age=timedelta(seconds=options["MIN_AGE"]),
+    )
+    cursor, stats = collector.collect(
+        cache.get(CURSOR_KEY), max_batches=options["MAX_BATCHES"]
+    )
+    if cursor is None:
+        cache.delete(CURSOR_KEY)
+    else:
+        cache.set(CURSOR_KEY, cursor, timeout=None)
+    return stats
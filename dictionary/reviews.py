@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from dictionary.models import Dictionary, DictionaryEntry
+
+MIN_EASE_FACTOR = 1.3
+
+
+class Grade(models.IntegerChoices):
+    """
+    Answer to a card, the quality of the recall on the SM-2 scale (0-5).
+    """
+
+    AGAIN = 1, "Again"
+    HARD = 3, "Hard"
+    GOOD = 4, "Good"
+    EASY = 5, "Easy"
+
+
+class Schedule(NamedTuple):
+    """
+    SM-2 state of a card: successful reviews in a row, days to the next review and ease factor.
+    """
+
+    repetitions: int
+    interval: int
+    ease_factor: float
+
+
+class Card(NamedTuple):
+    """
+    A translation of a dictionary to review.
+    """
+
+    entry_id: int
+    word: str
+    translation: str
+
+
+def schedule(state: Schedule, grade: int) -> Schedule:
+    """
+    Return the schedule of a card after an answer (SM-2).
+
+    A recalled card (HARD or better) is reviewed again after 1 day, then after 6 days, then after
+    the last interval multiplied by the ease factor, which grows with easy answers and shrinks
+    with hard ones, down to 1.3. A forgotten card starts over from 1 day with the same ease factor.
+
+    Args:
+        state (Schedule): schedule of the card before the answer
+        grade (int): one of Grade
+
+    Returns:
+        Schedule: schedule of the card after the answer
+    """
+    if grade < Grade.HARD:
+        return Schedule(0, 1, state.ease_factor)
+    if state.repetitions == 0:
+        interval = 1
+    elif state.repetitions == 1:
+        interval = 6
+    else:
+        interval = round(state.interval * state.ease_factor)
+    penalty = 5 - grade
+    ease_factor = state.ease_factor + 0.1 - penalty * (0.08 + penalty * 0.02)
+    return Schedule(state.repetitions + 1, interval, max(MIN_EASE_FACTOR, ease_factor))
+
+
+def get_due_cards(
+    dictionary: Dictionary, limit: int, now: datetime | None = None
+) -> list[Card]:
+    """
+    Return the cards of the dictionary that are due, the longest overdue first.
+
+    The cards are read from the start of the (dictionary, due_at) index, so the query costs
+    the same whatever the size of the dictionary.
+
+    Args:
+        dictionary (Dictionary): reviewed dictionary
+        limit (int): maximum number of cards
+        now (datetime): time the cards are due at, the current time by default
+
+    Returns:
+        list[Card]: due cards
+    """
+    entries = (
+        DictionaryEntry.objects.filter(
+            dictionary_id=dictionary.pk, due_at__lte=now or timezone.now()
+        )
+        .order_by("due_at", "pk")
+        .values_list("pk", "from_word__word", "translation__to_word__word")
+    )
+    return [Card(*row) for row in entries[:limit]]
+
+
+def record_answers(dictionary: Dictionary, answers: list[tuple[int, int, str]]) -> int:
+    """
+    Reschedule the answered cards of the dictionary, with one query to read them and one
+    to update them. Cards removed from the dictionary since they were answered are skipped.
+
+    Args:
+        dictionary (Dictionary): reviewed dictionary
+        answers (list[tuple[int, int, str]]): entry ids with grades and the ISO time of the answers
+
+    Returns:
+        int: number of rescheduled cards
+    """
+    answers = {entry_id: (grade, time) for entry_id, grade, time in answers}
+    entries = list(
+        DictionaryEntry.objects.filter(dictionary_id=dictionary.pk, pk__in=answers)
+    )
+    for entry in entries:
+        grade, time = answers[entry.pk]
+        state = schedule(
+            Schedule(entry.repetitions, entry.interval, entry.ease_factor), grade
+        )
+        entry.repetitions, entry.interval, entry.ease_factor = state
+        entry.reviewed_at = datetime.fromisoformat(time)
+        entry.due_at = entry.reviewed_at + timedelta(days=state.interval)
+    DictionaryEntry.objects.bulk_update(
+        entries,
+        ["repetitions", "interval", "ease_factor", "reviewed_at", "due_at"],
+    )
+    return len(entries)
+
+
+class ReviewSession:
+    """
+    Review of a dictionary by a user, kept in the user's session.
+
+    Due cards are taken from the dictionary's due queue `batch_size` at a time and shown one by one
+    without queries. The answers are kept in the session and written together when the batch
+    is finished, before the next batch is read, so the answered cards are not shown again.
+    """
+
+    def __init__(self, session, dictionary: Dictionary, batch_size: int = 20):
+        self.session = session
+        self.dictionary = dictionary
+        self.batch_size = batch_size
+        self.key = f"review:{dictionary.pk}"
+        self.state = session.get(self.key) or {"queue": [], "answers": []}
+
+    def current(self) -> Card | None:
+        """
+        Return the card to show, None when no card is due.
+        """
+        if not self.state["queue"]:
+            self.flush()
+            cards = get_due_cards(self.dictionary, self.batch_size)
+            self.state["queue"] = [list(card) for card in cards]
+            self.save()
+        return Card(*self.state["queue"][0]) if self.state["queue"] else None
+
+    def answer(self, entry_id: int, grade: int) -> bool:
+        """
+        Record the answer to the current card.
+
+        Returns:
+            bool: False if the card is not the current one (e.g. a form sent twice)
+        """
+        queue = self.state["queue"]
+        if not queue or queue[0][0] != entry_id:
+            return False
+        queue.pop(0)
+        self.state["answers"].append([entry_id, grade, timezone.now().isoformat()])
+        if len(self.state["answers"]) >= self.batch_size:
+            self.flush()
+        self.save()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write the recorded answers.
+
+        Returns:
+            int: number of rescheduled cards
+        """
+        if not self.state["answers"]:
+            return 0
+        with transaction.atomic():
+            rescheduled = record_answers(self.dictionary, self.state["answers"])
+        self.state["answers"] = []
+        self.save()
+        return rescheduled
+
+    def save(self) -> None:
+        self.session[self.key] = self.state
@@ -1,16 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from functools import cache
 
+from asgiref.sync import sync_to_async
 from azure.ai.translation.text import TextTranslationClient
+from azure.ai.translation.text.aio import (
+    TextTranslationClient as AsyncTextTranslationClient,
+)
 from azure.ai.translation.text.models import DictionaryTranslation, TranslationText
-from azure.core.credentials import AzureKeyCredential
-from azure.core.exceptions import HttpResponseError
-from decouple import config
-from django.db import transaction
+from azure.core.exceptions import (
+    HttpResponseError,
+    ServiceRequestError,
+    ServiceResponseError,
+)
+from django.conf import settings
+from django.core.cache import caches
 from django.db.models import QuerySet
 
-from dictionary.models import Language, Translation, User, Word
+from dictionary.batching import AsyncLookupBatcher, LookupBatcher
+from dictionary.cache import TranslationCache, get_translation_cache
+from dictionary.circuit_breaker import CircuitBreaker, create_circuit_breaker
+from dictionary.clients import get_client_registry
+from dictionary.languages import aget_language_registry
+from dictionary.models import Translation, User
+from dictionary.singleflight import AsyncSingleFlight, CacheFlightLock, SingleFlight
+from dictionary.write_behind import save_approved_translations
+from wordnest.shortcuts import normalize_string
+
+
+class TranslationUnavailable(Exception):
+    """
+    Raised by a strategy that cannot translate the word right now because of a transient error.
+
+    The translator moves on to the next strategy and the result is not cached.
+    """
+
+
+def is_rejected_word(error: HttpResponseError) -> bool:
+    """
+    Check if the API rejected the word itself (bad request, not found) rather than failed.
+
+    Other errors, including throttling (429), server errors and rejected credentials or quota
+    (401, 403), say nothing about the word and must not be taken for an empty result.
+    """
+    return error.status_code in (400, 404)
 
 
 class TranslationStrategy(ABC):
@@ -18,6 +54,13 @@ class TranslationStrategy(ABC):
     An abstract class for translation strategies.
     """
 
+    # Whether the result depends on the user, results of other strategies can be shared between users
+    per_user = False
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
     @abstractmethod
     def query_translation(self, word, from_lang, to_lang, user):
         """
@@ -49,11 +92,40 @@ class TranslationStrategy(ABC):
         Returns:
             list[dict]: a list of templated translations
         """
-        translations = self.query_translation(word, from_lang, to_lang)
+        translations = self.query_translation(word, from_lang, to_lang, user)
         return self.create_templated_translations(
             word, from_lang, to_lang, translations, user
         )
 
+    async def aquery_translation(self, word, from_lang, to_lang, user=None):
+        """
+        Async version of query_translation(), strategies with native async I/O override it.
+        """
+        return await sync_to_async(self.query_translation)(
+            word, from_lang, to_lang, user
+        )
+
+    async def acreate_templated_translations(
+        self, word, from_lang, to_lang, translations, user
+    ):
+        """
+        Async version of create_templated_translations().
+        """
+        return await sync_to_async(self.create_templated_translations)(
+            word, from_lang, to_lang, translations, user
+        )
+
+    async def atranslate(
+        self, word: str, from_lang: str, to_lang: str, user: User
+    ) -> list[dict]:
+        """
+        Async version of translate().
+        """
+        translations = await self.aquery_translation(word, from_lang, to_lang, user)
+        return await self.acreate_templated_translations(
+            word, from_lang, to_lang, translations, user
+        )
+
     def get_translation_template(self) -> dict:
         """
         Common template for translation data.
@@ -70,49 +142,234 @@ class TranslationStrategy(ABC):
 
 
 class DatabaseTranslation(TranslationStrategy):
-    def query_translation(self, word, from_lang, to_lang) -> QuerySet:
-        return Translation.get_approved_translations(word, from_lang, to_lang)
+    per_user = True
+
+    def query_translation(
+        self, word, from_lang, to_lang, user=None, languages=None
+    ) -> QuerySet:
+        return Translation.get_user_translations(
+            word, from_lang, to_lang, user, languages
+        ).values("pk", "to_word_text", "in_user_dictionary")
 
     def create_templated_translations(
         self, word, from_lang, to_lang, translations, user
     ) -> list:
-        dictionary_translations = user.get_word_translations(word, from_lang, to_lang)
-        translations = list(translations) + [
-            trans for trans in dictionary_translations if trans not in translations
-        ]
-        templated_translations = []
+        templated_translations = {}
         for translation in translations:
-            template = self.get_translation_template()
-            template["text"] = translation.to_word.word
-            template["translation_type"] = "database"
-            if translation in dictionary_translations:
+            template = templated_translations.get(translation["pk"])
+            if template is None:
+                template = templated_translations[translation["pk"]] = (
+                    self.get_translation_template()
+                )
+                template["text"] = translation["to_word_text"]
+                template["translation_type"] = "database"
+            if translation["in_user_dictionary"]:
                 template["user_translation"] = True
-            templated_translations.append(template)
-        return templated_translations
+        return list(templated_translations.values())
+
+    async def aquery_translation(self, word, from_lang, to_lang, user=None) -> list:
+        # An outdated registry is reloaded outside of the event loop
+        languages = await aget_language_registry()
+        queryset = self.query_translation(word, from_lang, to_lang, user, languages)
+        return [translation async for translation in queryset]
+
+    async def acreate_templated_translations(
+        self, word, from_lang, to_lang, translations, user
+    ) -> list:
+        return self.create_templated_translations(
+            word, from_lang, to_lang, translations, user
+        )
+
+
+def get_request_options(strategy_name: str) -> dict:
+    """
+    Return the keyword arguments that keep an API call of the strategy within its latency budget.
+
+    The budget is the read timeout of each attempt and the total time the SDK may spend on retries.
+    """
+    budget = settings.AZURE_TRANSLATOR_LATENCY_BUDGETS[strategy_name]
+    return {"timeout": budget, "read_timeout": budget}
 
 
 class BaseAzureAPITranslation(TranslationStrategy):
-    def __init__(self):
-        self.__key = AzureKeyCredential(config("AZURE_TRANSLATOR_KEY"))
-        self.client = TextTranslationClient(credential=self.__key)
+    """
+    Base class for the strategies that use the Azure Translator API.
+
+    The clients are taken from the client registry of the process, so their connection pools are reused
+    by all requests. API calls are made through a circuit breaker: while the API is failing or too slow
+    the strategy raises TranslationUnavailable without calling it, so the translator falls back to
+    the database results.
+    """
+
+    def __init__(self, breaker: CircuitBreaker | None = None):
+        self.breaker = (
+            breaker if breaker is not None else create_circuit_breaker(self.name)
+        )
+
+    @property
+    def client(self) -> TextTranslationClient:
+        return get_client_registry().get_client()
+
+    @property
+    def async_client(self) -> AsyncTextTranslationClient:
+        return get_client_registry().get_async_client()
+
+    @property
+    def request_options(self) -> dict:
+        return get_request_options(self.name)
+
+    def call_api(self, func, *args, **kwargs) -> list:
+        """
+        Call the API through the circuit breaker.
+
+        Returns:
+            list: the result of the call, or an empty list if the API rejected the word
+
+        Raises:
+            TranslationUnavailable: the circuit is open, or the call failed for another reason
+                                    than a rejected word
+        """
+        self._check_circuit()
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as error:
+            return self._handle_error(error, start)
+        except BaseException:
+            # Cancelled, the probe of a half-open circuit must not keep its slot
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success(time.monotonic() - start)
+        return result
+
+    async def acall_api(self, func, *args, **kwargs) -> list:
+        """
+        Async version of call_api(), `func` is a coroutine function.
+        """
+        self._check_circuit()
+        start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as error:
+            return self._handle_error(error, start)
+        except BaseException:
+            # Cancelled, the probe of a half-open circuit must not keep its slot
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success(time.monotonic() - start)
+        return result
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow_request():
+            raise TranslationUnavailable(f"The circuit of {self.name} is open")
+
+    def _handle_error(self, error: Exception, start: float) -> list:
+        if isinstance(error, HttpResponseError) and is_rejected_word(error):
+            self.breaker.record_success(time.monotonic() - start)
+            return []
+        self.breaker.record_failure()
+        if isinstance(
+            error, (HttpResponseError, ServiceRequestError, ServiceResponseError)
+        ):
+            raise TranslationUnavailable from error
+        raise error
 
 
 class DictionaryAPITranslation(BaseAzureAPITranslation):
+    """
+    Looks the word up in the Azure dictionary, concurrent lookups are sent in batched calls.
+
+    A batched call goes through the circuit breaker once, whatever the number of its callers: the
+    callers only check that the circuit is closed, the call records its own success or failure. When
+    the API rejects a batch, its words are looked up one by one, so a word rejected by the API
+    does not leave the other words of the batch without translations.
+    """
+
+    def __init__(self, breaker: CircuitBreaker | None = None):
+        super().__init__(breaker)
+        options = settings.DICTIONARY_LOOKUP_BATCH
+        self.batcher = LookupBatcher(
+            self._lookup_batch, window=options["WINDOW"], max_size=options["MAX_SIZE"]
+        )
+        self.async_batcher = AsyncLookupBatcher(
+            self._alookup_batch, window=options["WINDOW"], max_size=options["MAX_SIZE"]
+        )
+
     def query_translation(
-        self, word, from_lang, to_lang
+        self, word, from_lang, to_lang, user=None
+    ) -> list[DictionaryTranslation]:
+        if len(word) > 100:
+            return []
+
+        self._check_circuit()
+        return self.batcher.lookup(word, from_lang, to_lang)
+
+    async def aquery_translation(
+        self, word, from_lang, to_lang, user=None
     ) -> list[DictionaryTranslation]:
         if len(word) > 100:
             return []
 
+        self._check_circuit()
+        return await self.async_batcher.lookup(word, from_lang, to_lang)
+
+    def _split_batch(self, words: list, error: Exception, start: float) -> bool:
+        """
+        Check if a batch of several words was rejected by the API, any of its words may be the reason.
+        """
+        if not (
+            len(words) > 1
+            and isinstance(error, HttpResponseError)
+            and is_rejected_word(error)
+        ):
+            return False
+        self.breaker.record_success(time.monotonic() - start)
+        return True
+
+    def _lookup_batch(self, words, from_lang, to_lang) -> list:
+        start = time.monotonic()
         try:
-            translations = self.client.lookup_dictionary_entries(
-                body=[word],
+            entries = self.client.lookup_dictionary_entries(
+                body=words,
                 from_language=from_lang,
                 to_language=to_lang,
-            )[0].translations
-        except HttpResponseError:
-            translations = []
-        return translations
+                **self.request_options,
+            )
+        except Exception as error:
+            if not self._split_batch(words, error, start):
+                return [self._handle_error(error, start)]
+            return [
+                result
+                for word in words
+                for result in self._lookup_batch([word], from_lang, to_lang)
+            ]
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success(time.monotonic() - start)
+        return [entry.translations for entry in entries]
+
+    async def _alookup_batch(self, words, from_lang, to_lang) -> list:
+        start = time.monotonic()
+        try:
+            entries = await self.async_client.lookup_dictionary_entries(
+                body=words,
+                from_language=from_lang,
+                to_language=to_lang,
+                **self.request_options,
+            )
+        except Exception as error:
+            if not self._split_batch(words, error, start):
+                return [self._handle_error(error, start)]
+            results = await asyncio.gather(
+                *(self._alookup_batch([word], from_lang, to_lang) for word in words)
+            )
+            return [result for (result,) in results]
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        self.breaker.record_success(time.monotonic() - start)
+        return [entry.translations for entry in entries]
 
     def create_templated_translations(
         self, word, from_lang, to_lang, translations, user
@@ -127,52 +384,46 @@ class DictionaryAPITranslation(BaseAzureAPITranslation):
             template["translation_type"] = "dictionary_api"
             templated_translations.append(template)
         if templated_translations:
-            self.__create_approved_translations(
-                word, from_lang, to_lang, templated_translations
+            # The translations are approved because they were found by the dictionary API
+            save_approved_translations(
+                word,
+                from_lang,
+                to_lang,
+                [translation["text"] for translation in templated_translations],
             )
         return templated_translations
 
-    @staticmethod
-    def __create_approved_translations(
-        word: str, source_lang_code: str, target_lang_code: str, translations: list
-    ) -> None:
-        """
-        Create approved translations.
-
-        The translations is approved if it was translated by dictionary translation class.
 
-        Args:
-            word (str): The word to translate.
-            source_lang_code (str): The language code of the language the word is in.
-            target_lang_code (str): The language code of the language to translate the word to.
-            translations (list): A list of dictionaries, each containing a translation of the word.
-                                  Each dictionary must have a "text" key associated with the translated word.
-        """
-        with transaction.atomic():
-            source_lang = Language.objects.get(code=source_lang_code)
-            target_lang = Language.objects.get(code=target_lang_code)
-            from_word = Word.objects.get_or_create(
-                word=word.lower(), language=source_lang
-            )[0]
-            for translation in translations:
-                to_word = Word.objects.get_or_create(
-                    word=translation["text"], language=target_lang
-                )[0]
-                Translation.objects.get_or_create(
-                    from_word=from_word, to_word=to_word, defaults={"is_approved": True}
-                )
+class TextAPITranslation(BaseAzureAPITranslation):
+    def query_translation(
+        self, word, from_lang, to_lang, user=None
+    ) -> list[TranslationText]:
+        if len(word) > 1500:
+            return []
 
+        items = self.call_api(
+            self.client.translate,
+            body=[word],
+            from_language=from_lang,
+            to_language=[to_lang],
+            **self.request_options,
+        )
+        return items[0].translations if items else []
 
-class TextAPITranslation(BaseAzureAPITranslation):
-    def query_translation(self, word, from_lang, to_lang) -> list[TranslationText]:
+    async def aquery_translation(
+        self, word, from_lang, to_lang, user=None
+    ) -> list[TranslationText]:
         if len(word) > 1500:
             return []
 
-        return self.client.translate(
+        items = await self.acall_api(
+            self.async_client.translate,
             body=[word],
             from_language=from_lang,
             to_language=[to_lang],
-        )[0].translations
+            **self.request_options,
+        )
+        return items[0].translations if items else []
 
     def create_templated_translations(
         self, word, from_lang, to_lang, translations, user
@@ -188,30 +439,164 @@ class TextAPITranslation(BaseAzureAPITranslation):
         return templated_translations
 
 
+class CachedTranslation(TranslationStrategy):
+    """
+    Wraps a translation strategy and keeps its templated translations in the translation cache.
+
+    Empty results are cached with a shorter timeout, so words the strategy could not translate do not
+    reach the API on every request. Transient errors (TranslationUnavailable) are not cached.
+    """
+
+    def __init__(
+        self, strategy: TranslationStrategy, cache: TranslationCache | None = None
+    ):
+        self.strategy = strategy
+        self.cache = cache if cache is not None else get_translation_cache()
+
+    @property
+    def name(self) -> str:
+        return self.strategy.name
+
+    @property
+    def per_user(self) -> bool:
+        return self.strategy.per_user
+
+    def query_translation(self, word, from_lang, to_lang, user=None):
+        return self.strategy.query_translation(word, from_lang, to_lang, user)
+
+    def create_templated_translations(
+        self, word, from_lang, to_lang, translations, user
+    ) -> list:
+        return self.strategy.create_templated_translations(
+            word, from_lang, to_lang, translations, user
+        )
+
+    def translate(
+        self, word: str, from_lang: str, to_lang: str, user: User
+    ) -> list[dict]:
+        translations = self.cache.get(self.name, word, from_lang, to_lang)
+        if translations is not None:
+            return translations
+
+        translations = self.strategy.translate(word, from_lang, to_lang, user)
+        self.cache.set(self.name, word, from_lang, to_lang, translations)
+        return translations
+
+    async def atranslate(
+        self, word: str, from_lang: str, to_lang: str, user: User
+    ) -> list[dict]:
+        translations = await self.cache.aget(self.name, word, from_lang, to_lang)
+        if translations is not None:
+            return translations
+
+        translations = await self.strategy.atranslate(word, from_lang, to_lang, user)
+        await self.cache.aset(self.name, word, from_lang, to_lang, translations)
+        return translations
+
+
 class Translator:
-    def __init__(self, strategies: list[TranslationStrategy]):
+    """
+    Runs the strategies in order until one of them finds translations.
+
+    Concurrent translations of the same word by a strategy that does not depend on the user
+    are coalesced: the first caller runs the strategy and the others wait for its result.
+    """
+
+    def __init__(
+        self,
+        strategies: list[TranslationStrategy],
+        flight_lock: CacheFlightLock | None = None,
+    ):
         self._strategies = strategies
+        self._flight = SingleFlight(flight_lock)
+        self._async_flight = AsyncSingleFlight(flight_lock)
 
     def translate(self, word: str, from_lang: str, to_lang: str, user: User) -> dict:
-        templated_data = {
-            "form_lang": from_lang,
-            "to_lang": to_lang,
-            "word": word,
-            "translations": [],
-        }
+        templated_data = self.get_data_template(word, from_lang, to_lang)
+        for strategy in self._strategies:
+            try:
+                if strategy.per_user:
+                    translations = strategy.translate(word, from_lang, to_lang, user)
+                else:
+                    translations = self._flight.do(
+                        self.get_flight_key(strategy, word, from_lang, to_lang),
+                        strategy.translate,
+                        word,
+                        from_lang,
+                        to_lang,
+                        user,
+                    )
+            except TranslationUnavailable:
+                continue
+            if translations:
+                templated_data["translations"] = translations
+                break
+        return templated_data
+
+    async def atranslate(
+        self, word: str, from_lang: str, to_lang: str, user: User
+    ) -> dict:
+        templated_data = self.get_data_template(word, from_lang, to_lang)
         for strategy in self._strategies:
-            translations = strategy.translate(word, from_lang, to_lang, user)
+            try:
+                if strategy.per_user:
+                    translations = await strategy.atranslate(
+                        word, from_lang, to_lang, user
+                    )
+                else:
+                    translations = await self._async_flight.do(
+                        self.get_flight_key(strategy, word, from_lang, to_lang),
+                        strategy.atranslate,
+                        word,
+                        from_lang,
+                        to_lang,
+                        user,
+                    )
+            except TranslationUnavailable:
+                continue
             if translations:
                 templated_data["translations"] = translations
                 break
         return templated_data
 
+    @staticmethod
+    def get_flight_key(
+        strategy: TranslationStrategy, word: str, from_lang: str, to_lang: str
+    ) -> str:
+        return f"{strategy.name}:{from_lang}:{to_lang}:{normalize_string(word)}"
 
-def translate(word: str, from_lang: str, to_lang: str, user: User) -> dict:
+    @staticmethod
+    def get_data_template(word: str, from_lang: str, to_lang: str) -> dict:
+        return {
+            "form_lang": from_lang,
+            "to_lang": to_lang,
+            "word": word,
+            "translations": [],
+        }
+
+
+@cache
+def get_translator() -> Translator:
+    """
+    Return the translator of the process, its strategies keep no per-request state.
+    """
     strategies = [
         DatabaseTranslation(),
-        DictionaryAPITranslation(),
-        TextAPITranslation(),
+        CachedTranslation(DictionaryAPITranslation()),
+        CachedTranslation(TextAPITranslation()),
     ]
-    translator = Translator(strategies)
-    return translator.translate(word, from_lang, to_lang, user)
+    options = settings.TRANSLATION_SINGLE_FLIGHT
+    flight_lock = None
+    if options["CROSS_WORKER"]:
+        flight_lock = CacheFlightLock(
+            caches[options["CACHE_ALIAS"]], timeout=options["LOCK_TIMEOUT"]
+        )
+    return Translator(strategies, flight_lock)
+
+
+def translate(word: str, from_lang: str, to_lang: str, user: User) -> dict:
+    return get_translator().translate(word, from_lang, to_lang, user)
+
+
+async def atranslate(word: str, from_lang: str, to_lang: str, user: User) -> dict:
+    return await get_translator().atranslate(word, from_lang, to_lang, user)
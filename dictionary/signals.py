@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dictionary.languages import invalidate_language_registry, reset_language_registry
+from dictionary.models import Language
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def invalidate_languages(sender, **kwargs):
+    # The current worker sees the change inside its transaction right away,
+    # other workers are notified after the commit, when the change is visible to them
+    reset_language_registry()
+    transaction.on_commit(invalidate_language_registry)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+from django.core.cache.backends.base import BaseCache
+
+
+class CacheFlightLock:
+    """
+    A lock shared by worker processes through a Django cache backend.
+
+    It lets one worker do the work for a key while the others wait for the lock to be released,
+    so with a shared translation cache they find the result in the cache instead of repeating the work.
+    The backend must implement an atomic add() (memcached, redis, database cache).
+    """
+
+    def __init__(self, cache: BaseCache, timeout: float = 10, poll_interval=0.05):
+        self.cache = cache
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def make_key(self, key: str) -> str:
+        return f"singleflight:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def acquire(self, key: str) -> bool:
+        """
+        Acquire the lock, wait for it to be released if another worker holds it.
+
+        Returns:
+            bool: True if the lock was acquired, False if another worker held it.
+        """
+        cache_key = self.make_key(key)
+        if self.cache.add(cache_key, 1, self.timeout):
+            return True
+        deadline = time.monotonic() + self.timeout
+        while self.cache.get(cache_key) is not None and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+        return False
+
+    def release(self, key: str) -> None:
+        self.cache.delete(self.make_key(key))
+
+    async def aacquire(self, key: str) -> bool:
+        cache_key = self.make_key(key)
+        if await self.cache.aadd(cache_key, 1, self.timeout):
+            return True
+        deadline = time.monotonic() + self.timeout
+        while (
+            await self.cache.aget(cache_key) is not None and time.monotonic() < deadline
+        ):
+            await asyncio.sleep(self.poll_interval)
+        return False
+
+    async def arelease(self, key: str) -> None:
+        await self.cache.adelete(self.make_key(key))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key made by threads of the process.
+
+    The first caller runs the function, callers that arrive while it is running wait
+    and get its result or its exception.
+    """
+
+    def __init__(self, lock: CacheFlightLock | None = None):
+        self.lock = lock
+        self._calls: dict[str, Future] = {}
+        self._mutex = threading.Lock()
+
+    def do(self, key: str, func, *args, **kwargs):
+        with self._mutex:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._calls[key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = self._run(key, func, *args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._mutex:
+                del self._calls[key]
+
+    def _run(self, key, func, *args, **kwargs):
+        if self.lock is None:
+            return func(*args, **kwargs)
+        acquired = self.lock.acquire(key)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if acquired:
+                self.lock.release(key)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls with the same key made by tasks of an event loop.
+    """
+
+    def __init__(self, lock: CacheFlightLock | None = None):
+        self.lock = lock
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key: str, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            # The shared call runs in a task of its own, so a caller that is cancelled
+            # (e.g. its client disconnected) cancels neither the call nor the other callers
+            task = calls[key] = loop.create_task(self._run(key, func, *args, **kwargs))
+            task.add_done_callback(lambda task: self._done(calls, key, task))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _done(calls: dict, key: str, task: asyncio.Task) -> None:
+        if calls.get(key) is task:
+            del calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller was cancelled
+            task.exception()
+
+    async def _run(self, key, func, *args, **kwargs):
+        if self.lock is None:
+            return await func(*args, **kwargs)
+        acquired = await self.lock.aacquire(key)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            if acquired:
+                await self.lock.arelease(key)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from heapq import merge
+from itertools import islice
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import Max
+
+
+class _SortedWords:
+    """
+    Sequence view of the words of a PrefixIndex block, used with bisect.
+    """
+
+    def __init__(self, data: bytes, offsets: array):
+        self.data = data
+        self.offsets = offsets
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.data[self.offsets[index] : self.offsets[index + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class PrefixIndex:
+    """
+    Sorted words of a language for prefix lookups.
+
+    Words are kept in a compact block, one bytes object of the concatenated UTF-8 encoded words
+    and an array of their offsets, that is searched with a binary search. UTF-8 keeps
+    the order of the characters, so the block is sorted as the words are. New words go to a small
+    sorted list that is merged into the block when it holds `merge_size` words.
+    """
+
+    def __init__(self, words: Iterable[str] = (), merge_size: int = 10000):
+        self.merge_size = merge_size
+        self._block = self._make_block(sorted({word.encode() for word in words}))
+        self._recent: list[bytes] = []
+        self._lock = threading.Lock()
+
+    def add(self, words: Iterable[str]) -> None:
+        """
+        Add words to the index, words that are already in it are skipped.
+        """
+        with self._lock:
+            for word in words:
+                word = word.encode()
+                if not self._contains(word):
+                    insort(self._recent, word)
+            if len(self._recent) >= self.merge_size:
+                self._block = self._make_block(
+                    list(merge(iter(self._block), self._recent))
+                )
+                self._recent = []
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Return the first words that start with the prefix in alphabetical order.
+        """
+        prefix = prefix.encode()
+        with self._lock:
+            block, recent = self._block, self._recent
+            words = merge(
+                self._iter_prefix(block, prefix), self._iter_prefix(recent, prefix)
+            )
+            return [word.decode() for word in islice(words, limit)]
+
+    def __contains__(self, word: str) -> bool:
+        with self._lock:
+            return self._contains(word.encode())
+
+    def __len__(self) -> int:
+        return len(self._block) + len(self._recent)
+
+    def _contains(self, word: bytes) -> bool:
+        for words in (self._block, self._recent):
+            position = bisect_left(words, word)
+            if position < len(words) and words[position] == word:
+                return True
+        return False
+
+    @staticmethod
+    def _iter_prefix(words, prefix: bytes):
+        for position in range(bisect_left(words, prefix), len(words)):
+            word = words[position]
+            if not word.startswith(prefix):
+                return
+            yield word
+
+    @staticmethod
+    def _make_block(words: list[bytes]) -> _SortedWords:
+        offsets = array("I", [0])
+        position = 0
+        for word in words:
+            position += len(word)
+            offsets.append(position)
+        return _SortedWords(b"".join(words), offsets)
+
+
+class LanguageSuggestions:
+    """
+    The prefix index of a language, kept up to date with the Word table.
+
+    Words created by the current worker are added right away (see add_words()). Words created
+    by other workers are read every REFRESH_INTERVAL seconds with a query of the words with
+    an id greater than the last read one. The index is rebuilt after MAX_AGE seconds,
+    so deleted words disappear.
+    """
+
+    def __init__(self, language_id: int):
+        self.language_id = language_id
+        self.index = PrefixIndex()
+        self.last_id = 0
+        self.loaded_at = self.refreshed_at = None
+        self._lock = threading.Lock()
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        options = settings.WORD_SUGGESTIONS
+        now = time.monotonic()
+        if self.loaded_at is None or now - self.loaded_at >= options["MAX_AGE"]:
+            self.load(now)
+        elif now - self.refreshed_at >= options["REFRESH_INTERVAL"]:
+            self.refresh(now)
+        return self.index.search(prefix, limit)
+
+    def load(self, now: float) -> None:
+        # Imported here because the models add created words to the index
+        from dictionary.models import Word
+
+        with self._lock:
+            max_age = settings.WORD_SUGGESTIONS["MAX_AGE"]
+            if self.loaded_at is not None and now - self.loaded_at < max_age:
+                return
+            words = Word.objects.filter(language_id=self.language_id)
+            last_id = words.aggregate(last_id=Max("id"))["last_id"] or 0
+            self.index = PrefixIndex(
+                words.filter(id__lte=last_id)
+                .values_list("word", flat=True)
+                .iterator(chunk_size=10000),
+                settings.WORD_SUGGESTIONS["MERGE_SIZE"],
+            )
+            self.last_id = last_id
+            self.loaded_at = self.refreshed_at = now
+
+    def refresh(self, now: float) -> None:
+        from dictionary.models import Word
+
+        with self._lock:
+            if now - self.refreshed_at < settings.WORD_SUGGESTIONS["REFRESH_INTERVAL"]:
+                return
+            rows = list(
+                Word.objects.filter(language_id=self.language_id, id__gt=self.last_id)
+                .order_by("id")
+                .values_list("id", "word")
+            )
+            if rows:
+                self.index.add(word for _, word in rows)
+                self.last_id = rows[-1][0]
+            self.refreshed_at = now
+
+
+_languages: dict[int, LanguageSuggestions] = {}
+_lock = threading.Lock()
+
+
+def get_suggestions(language_id: int, prefix: str, limit: int = 10) -> list[str]:
+    """
+    Return words of the language that start with the prefix, in alphabetical order.
+
+    The words are found in a prefix index kept by each worker, it is loaded on the first lookup
+    in the language.
+
+    Args:
+        language_id (int): id of the language of the words
+        prefix (str): beginning of the words
+        limit (int): maximum number of words
+
+    Returns:
+        list[str]: words that start with the prefix
+    """
+    with _lock:
+        suggestions = _languages.get(language_id)
+        if suggestions is None:
+            suggestions = _languages[language_id] = LanguageSuggestions(language_id)
+    return suggestions.search(prefix, limit)
+
+
+def add_words(language_id: int, words: Iterable[str]) -> None:
+    """
+    Add words created by the current worker to the prefix index of their language, if it is loaded.
+    """
+    suggestions = _languages.get(language_id)
+    if suggestions is not None and suggestions.loaded_at is not None:
+        suggestions.index.add(words)
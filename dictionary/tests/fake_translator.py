@@ -0,0 +1,122 @@
+"""
+A local stand-in for the Azure Translator text API.
+
+It answers the /dictionary/lookup, /translate and /languages endpoints with predictable translations
+(the reversed word) and counts the received requests, so tests and benchmarks can check
+how many round trips were made. Latency, error responses and rejected words can be injected.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTranslatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = [
+            item.get("text", item.get("Text"))
+            for item in json.loads(self.rfile.read(length) or b"[]")
+        ]
+        path = self.path.split("?")[0]
+        server.record(path, body)
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if server.status >= 400:
+            self._send(
+                server.status,
+                {"error": {"code": server.status, "message": "Fake error"}},
+            )
+        elif server.rejected_words.intersection(body):
+            self._send(400, {"error": {"code": 400, "message": "Rejected word"}})
+        elif path == "/dictionary/lookup":
+            self._send(200, [self._lookup_item(word) for word in body])
+        elif path == "/translate":
+            self._send(200, [self._translate_item(word) for word in body])
+        else:
+            self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        self.server.record(path, [])
+        if path == "/languages":
+            self._send(200, {"dictionary": {}})
+        else:
+            self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def _send(self, status, payload):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _lookup_item(self, word):
+        translations = []
+        if word not in self.server.unknown_words:
+            translations.append(
+                {
+                    "normalizedTarget": word[::-1],
+                    "displayTarget": word[::-1],
+                    "posTag": "NOUN",
+                    "confidence": 1.0,
+                    "prefixWord": "",
+                    "backTranslations": [],
+                }
+            )
+        return {
+            "normalizedSource": word,
+            "displaySource": word,
+            "translations": translations,
+        }
+
+    def _translate_item(self, word):
+        return {"translations": [{"text": word[::-1], "to": "uk"}]}
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTranslatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, status=200):
+        super().__init__(("127.0.0.1", 0), FakeTranslatorHandler)
+        self.latency = latency
+        self.status = status
+        self.unknown_words = set()
+        # Words that get the whole request rejected with a bad request error
+        self.rejected_words = set()
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def record(self, path, words):
+        with self._lock:
+            self.requests.append((path, words))
+
+    def count_requests(self, path=None) -> int:
+        with self._lock:
+            return len([item for item in self.requests if path in (None, item[0])])
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
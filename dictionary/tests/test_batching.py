@@ -0,0 +1,166 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from azure.ai.translation.text import TextTranslationClient
+from azure.core.credentials import AzureKeyCredential
+from django.test import SimpleTestCase
+
+from dictionary.batching import AsyncLookupBatcher, LookupBatcher
+from dictionary.tests.fake_translator import FakeTranslatorServer
+
+
+class LookupBatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def lookup(self, words, from_lang, to_lang):
+        with self.lock:
+            self.calls.append((list(words), from_lang, to_lang))
+        return [word.upper() for word in words]
+
+    def run_concurrently(self, batcher, lookups):
+        with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+            futures = [executor.submit(batcher.lookup, *args) for args in lookups]
+            return [future.result() for future in futures]
+
+    def test_concurrent_lookups_sent_as_one_call(self):
+        batcher = LookupBatcher(self.lookup, window=0.2, max_size=10)
+        words = ["one", "two", "three", "four"]
+
+        results = self.run_concurrently(batcher, [(w, "en", "uk") for w in words])
+
+        self.assertEqual(results, ["ONE", "TWO", "THREE", "FOUR"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertCountEqual(self.calls[0][0], words)
+
+    def test_language_pairs_batched_separately(self):
+        batcher = LookupBatcher(self.lookup, window=0.2, max_size=10)
+
+        self.run_concurrently(batcher, [("one", "en", "uk"), ("two", "en", "de")])
+
+        self.assertCountEqual(
+            [(call[1], call[2]) for call in self.calls], [("en", "uk"), ("en", "de")]
+        )
+
+    def test_full_batch_sent_without_waiting_for_window(self):
+        batcher = LookupBatcher(self.lookup, window=10, max_size=2)
+
+        results = self.run_concurrently(
+            batcher, [("one", "en", "uk"), ("two", "en", "uk")]
+        )
+
+        self.assertEqual(results, ["ONE", "TWO"])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_duplicate_words_looked_up_once(self):
+        batcher = LookupBatcher(self.lookup, window=0.2, max_size=10)
+
+        results = self.run_concurrently(batcher, [("one", "en", "uk")] * 3)
+
+        self.assertEqual(results, ["ONE"] * 3)
+        self.assertEqual(self.calls[0][0], ["one"])
+
+    def test_error_reaches_every_caller(self):
+        def lookup(words, from_lang, to_lang):
+            raise RuntimeError("API is down")
+
+        batcher = LookupBatcher(lookup, window=0.2, max_size=10)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(batcher.lookup, word, "en", "uk")
+                for word in ("one", "two")
+            ]
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result()
+
+
+class LookupBatcherServerTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeTranslatorServer().start()
+        self.addCleanup(self.server.stop)
+        self.client = TextTranslationClient(
+            credential=AzureKeyCredential("key"), endpoint=self.server.endpoint
+        )
+
+    def lookup(self, words, from_lang, to_lang):
+        entries = self.client.lookup_dictionary_entries(
+            body=words, from_language=from_lang, to_language=to_lang
+        )
+        return [entry.translations for entry in entries]
+
+    def test_one_request_for_concurrent_lookups(self):
+        batcher = LookupBatcher(self.lookup, window=0.2, max_size=10)
+        words = ["cat", "dog", "bird"]
+
+        with ThreadPoolExecutor(max_workers=len(words)) as executor:
+            results = list(
+                executor.map(lambda word: batcher.lookup(word, "en", "uk"), words)
+            )
+
+        self.assertEqual(
+            [result[0].normalized_target for result in results], ["tac", "god", "drib"]
+        )
+        self.assertEqual(self.server.count_requests("/dictionary/lookup"), 1)
+
+
+class AsyncLookupBatcherTest(SimpleTestCase):
+    def setUp(self):
+        self.calls = []
+
+    async def lookup(self, words, from_lang, to_lang):
+        self.calls.append((list(words), from_lang, to_lang))
+        await asyncio.sleep(0.05)
+        return [word.upper() for word in words]
+
+    async def test_concurrent_lookups_sent_as_one_call(self):
+        batcher = AsyncLookupBatcher(self.lookup, window=0.05, max_size=10)
+        words = ["one", "two", "three", "one"]
+
+        results = await asyncio.gather(
+            *(batcher.lookup(word, "en", "uk") for word in words)
+        )
+
+        self.assertEqual(results, ["ONE", "TWO", "THREE", "ONE"])
+        self.assertEqual(len(self.calls), 1)
+        self.assertCountEqual(self.calls[0][0], ["one", "two", "three"])
+
+    async def test_full_batch_sent_without_waiting_for_window(self):
+        batcher = AsyncLookupBatcher(self.lookup, window=10, max_size=2)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.lookup("one", "en", "uk"), batcher.lookup("two", "en", "uk")
+            ),
+            timeout=1,
+        )
+
+        self.assertEqual(results, ["ONE", "TWO"])
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        batcher = AsyncLookupBatcher(self.lookup, window=0.05, max_size=10)
+        first = asyncio.create_task(batcher.lookup("one", "en", "uk"))
+        second = asyncio.create_task(batcher.lookup("two", "en", "uk"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        self.assertEqual(await second, "TWO")
+        self.assertTrue(first.cancelled())
+
+    async def test_error_reaches_every_caller(self):
+        async def lookup(words, from_lang, to_lang):
+            raise RuntimeError("API is down")
+
+        batcher = AsyncLookupBatcher(lookup, window=0.05, max_size=10)
+
+        results = await asyncio.gather(
+            batcher.lookup("one", "en", "uk"),
+            batcher.lookup("two", "en", "uk"),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
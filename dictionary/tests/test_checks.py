@@ -0,0 +1,52 @@
+from django.test import SimpleTestCase, override_settings
+
+from dictionary.checks import check_shared_caches
+
+LOCAL_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "wordnest_cache",
+    },
+}
+
+
+class SharedCachesCheckTest(SimpleTestCase):
+    @override_settings(WEB_CONCURRENCY=4, CACHES=LOCAL_CACHES)
+    def test_local_cache_with_several_workers(self):
+        errors = check_shared_caches(None)
+
+        self.assertEqual(
+            [error.msg.split("[")[0] for error in errors],
+            ["LANGUAGE_REGISTRY", "FUZZY_SEARCH"],
+        )
+        self.assertTrue(all(error.id == "dictionary.E001" for error in errors))
+
+    @override_settings(WEB_CONCURRENCY=1, CACHES=LOCAL_CACHES)
+    def test_local_cache_with_one_worker(self):
+        self.assertEqual(check_shared_caches(None), [])
+
+    @override_settings(
+        WEB_CONCURRENCY=4,
+        CACHES=SHARED_CACHES,
+        LANGUAGE_REGISTRY={"CACHE_ALIAS": "shared"},
+        FUZZY_SEARCH={"CACHE_ALIAS": "shared"},
+        TRANSLATION_SINGLE_FLIGHT={"CROSS_WORKER": True, "CACHE_ALIAS": "default"},
+    )
+    def test_cross_worker_lock_cache(self):
+        errors = check_shared_caches(None)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("TRANSLATION_SINGLE_FLIGHT", errors[0].msg)
+
+    @override_settings(
+        WEB_CONCURRENCY=4,
+        CACHES=SHARED_CACHES,
+        LANGUAGE_REGISTRY={"CACHE_ALIAS": "shared"},
+        FUZZY_SEARCH={"CACHE_ALIAS": "shared"},
+    )
+    def test_shared_cache(self):
+        self.assertEqual(check_shared_caches(None), [])
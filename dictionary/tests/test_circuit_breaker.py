@@ -0,0 +1,92 @@
+from django.test import SimpleTestCase
+
+from dictionary.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "test",
+            failure_threshold=3,
+            slow_call_threshold=1.0,
+            reset_timeout=30,
+            clock=self.clock,
+        )
+
+    def fail(self, times):
+        for _ in range(times):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail(2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.fail(1)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.get_stats()["rejected"], 1)
+
+    def test_success_resets_failures(self):
+        self.fail(2)
+        self.breaker.record_success(0.1)
+        self.fail(2)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(3):
+            self.breaker.record_success(1.5)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_allows_single_probe(self):
+        self.fail(3)
+        self.clock.now = 30
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_successful_probe_closes_circuit(self):
+        self.fail(3)
+        self.clock.now = 30
+        self.breaker.allow_request()
+
+        self.breaker.record_success(0.1)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_failed_probe_opens_circuit_again(self):
+        self.fail(3)
+        self.clock.now = 30
+        self.breaker.allow_request()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.now = 59
+        self.assertFalse(self.breaker.allow_request())
+        self.clock.now = 60
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_released_probe_lets_another_through(self):
+        self.fail(3)
+        self.clock.now = 30
+        self.breaker.allow_request()
+
+        self.breaker.release_probe()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from dictionary import clients
+from dictionary.clients import TranslatorClientRegistry
+from dictionary.lifespan import LifespanMiddleware
+from dictionary.tests.fake_translator import FakeTranslatorServer
+
+
+class TranslatorClientRegistryTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeTranslatorServer().start()
+        self.addCleanup(self.server.stop)
+        self.registry = TranslatorClientRegistry("key", self.server.endpoint)
+        self.addCleanup(self.registry.close)
+
+    def translate(self, client, word):
+        return client.translate(body=[word], from_language="en", to_language=["uk"])
+
+    def test_client_is_reused(self):
+        self.assertIs(self.registry.get_client(), self.registry.get_client())
+
+    def test_connection_reused_between_requests(self):
+        for word in ("one", "two", "three"):
+            self.translate(self.registry.get_client(), word)
+
+        self.assertEqual(self.server.count_requests("/translate"), 3)
+        self.assertEqual(self.registry.get_stats(), {"handshakes": 1})
+
+    def test_connections_bounded_by_pool_size(self):
+        registry = TranslatorClientRegistry("key", self.server.endpoint, pool_size=4)
+        self.addCleanup(registry.close)
+        self.server.latency = 0.01
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(5):
+                list(
+                    executor.map(
+                        lambda word: self.translate(registry.get_client(), word),
+                        ["one", "two", "three", "four"],
+                    )
+                )
+
+        self.assertEqual(self.server.count_requests("/translate"), 20)
+        self.assertLessEqual(registry.get_stats()["handshakes"], 4)
+
+    def test_close_creates_new_client_on_next_use(self):
+        client = self.registry.get_client()
+        self.translate(client, "one")
+
+        self.registry.close()
+        self.translate(self.registry.get_client(), "two")
+
+        self.assertIsNot(self.registry.get_client(), client)
+        self.assertEqual(self.registry.get_stats(), {"handshakes": 2})
+
+    async def test_async_client_reuses_connection(self):
+        for word in ("one", "two", "three"):
+            client = self.registry.get_async_client()
+            await client.translate(body=[word], from_language="en", to_language=["uk"])
+
+        self.assertIs(self.registry.get_async_client(), client)
+        await self.registry.aclose()
+        self.assertEqual(self.server.count_requests("/translate"), 3)
+        self.assertEqual(self.registry.get_stats(), {"handshakes": 1})
+
+
+class LifespanTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeTranslatorServer().start()
+        self.addCleanup(self.server.stop)
+        self.registry = TranslatorClientRegistry("key", self.server.endpoint)
+        self.addCleanup(self.registry.close)
+        patch.object(clients, "_registry", self.registry).start()
+        self.addCleanup(patch.stopall)
+
+    async def run_lifespan(self, app):
+        messages = asyncio.Queue()
+        for message_type in ("lifespan.startup", "lifespan.shutdown"):
+            messages.put_nowait({"type": message_type})
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await app({"type": "lifespan"}, messages.get, send)
+        return sent
+
+    @override_settings(
+        AZURE_TRANSLATOR_CLIENT={
+            **clients.settings.AZURE_TRANSLATOR_CLIENT,
+            "WARM_UP": True,
+        }
+    )
+    async def test_async_client_warmed_up_and_closed(self):
+        sent = await self.run_lifespan(LifespanMiddleware(AsyncMock()))
+
+        self.assertEqual(
+            sent, ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        )
+        self.assertEqual(self.server.count_requests("/languages"), 1)
+        self.assertEqual(self.registry.get_stats(), {"handshakes": 1})
+        # Closed on shutdown, the next use of the loop creates a new client
+        self.assertFalse(self.registry._async_clients)
+
+    async def test_http_passed_to_application(self):
+        app = AsyncMock()
+        scope = {"type": "http"}
+
+        await LifespanMiddleware(app)(scope, None, None)
+
+        app.assert_awaited_once_with(scope, None, None)
@@ -0,0 +1,156 @@
+import statistics
+import tracemalloc
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dictionary import deletion, fuzzy, suggestions
+from dictionary.models import Dictionary, Language, Translation, User
+
+THROUGH_TABLE = Dictionary.translations.through._meta.db_table
+BATCH_DELETE = f'DELETE FROM "{THROUGH_TABLE}" WHERE "{THROUGH_TABLE}"."id" IN'
+
+
+class DeletionTestMixin:
+    def setUp(self):
+        fuzzy._indexes.clear()
+        suggestions._languages.clear()
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = self.create_dictionary(self.user, size=10)
+
+    def create_dictionary(self, user, size):
+        dictionary = Dictionary.objects.create(
+            user=user, source_language=self.english, target_language=self.ukrainian
+        )
+        dictionary.add_translations((f"word{i}", f"слово{i}") for i in range(size))
+        return dictionary
+
+
+class PurgeDeletedTest(DeletionTestMixin, TestCase):
+    def test_deleted_dictionary_hidden_and_purged(self):
+        deletion.delete_dictionary(self.dictionary)
+
+        self.assertFalse(self.user.dictionaries.exists())
+        # The languages are free again before the purge
+        self.create_dictionary(self.user, size=1)
+
+        stats = deletion.purge_deleted()
+
+        self.assertEqual(stats, {"dictionaries": 1, "translations": 10, "users": 0})
+        self.assertFalse(Dictionary.all_objects.filter(pk=self.dictionary.pk).exists())
+        self.assertEqual(Translation.objects.count(), 10)
+
+    def test_deleted_account_purged(self):
+        deletion.delete_account(self.user)
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(Dictionary.objects.exists())
+
+        stats = deletion.purge_deleted()
+
+        self.assertEqual(stats, {"dictionaries": 1, "translations": 10, "users": 1})
+        self.assertFalse(User.objects.exists())
+
+    def test_purge_in_batches(self):
+        deletion.delete_dictionary(self.dictionary)
+
+        with CaptureQueriesContext(connection) as queries:
+            deletion.purge_deleted(batch_size=4)
+
+        deletes = [query for query in queries if query["sql"].startswith(BATCH_DELETE)]
+        self.assertEqual(len(deletes), 3)
+
+    def test_purge_lock_time(self):
+        """
+        Compare delete() of a dictionary with its purge in batches. The lock time of a write
+        is measured as the duration of a statement that deletes translations, the median one
+        for the purge, whose single statements may be held up by the server.
+        """
+        size, batch_size = 2000, 100
+        deleted = self.create_dictionary(
+            User.objects.create_user(email="deleted@gmail.com", password="12345"), size
+        )
+        purged = self.create_dictionary(
+            User.objects.create_user(email="purged@gmail.com", password="12345"), size
+        )
+        # Statistics of the filled tables, as a real database has them
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        def measure(delete):
+            with CaptureQueriesContext(connection) as queries:
+                delete()
+            # Purges also delete the through rows of the emptied dictionary
+            locks = [
+                float(query["time"])
+                for query in queries
+                if query["sql"].startswith(f'DELETE FROM "{THROUGH_TABLE}"')
+            ]
+            return statistics.median(locks), len(locks)
+
+        delete_lock, delete_writes = measure(deleted.delete)
+        purge_lock, purge_writes = measure(lambda: purged.purge(batch_size))
+
+        self.assertEqual(delete_writes, 1)
+        self.assertEqual(purge_writes, size // batch_size + 1)
+        self.assertLessEqual(purge_lock, delete_lock)
+        self.assertFalse(Dictionary.all_objects.filter(pk=purged.pk).exists())
+
+    def test_purge_memory(self):
+        """
+        The purge holds the keys of one batch, not of the whole dictionary. The memory is measured
+        apart from the lock time, tracing the allocations slows down each statement.
+        """
+        purged = self.create_dictionary(
+            User.objects.create_user(email="purged@gmail.com", password="12345"), 2000
+        )
+
+        tracemalloc.start()
+        purged.purge(100)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertLess(peak, 1024 * 1024)
+        self.assertFalse(Dictionary.all_objects.filter(pk=purged.pk).exists())
+
+
+@override_settings(
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    }
+)
+class DeleteViewsTest(DeletionTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_delete_dictionary(self):
+        url = reverse("delete_dictionary", args=[self.dictionary.pk])
+
+        with mock.patch.object(deletion, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(url, headers={"HX-Request": "true"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.user.dictionaries.exists())
+        get_executor().submit.assert_called_once_with(deletion._run_in_worker)
+
+    def test_delete_account(self):
+        with mock.patch.object(deletion, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("delete_account"), headers={"HX-Request": "true"}
+                )
+
+        self.assertEqual(response["HX-Redirect"], reverse("home"))
+        self.assertNotIn("_auth_user_id", self.client.session)
+        self.assertIsNotNone(User.objects.get(pk=self.user.pk).deleted_at)
+        get_executor().submit.assert_called_once_with(deletion._run_in_worker)
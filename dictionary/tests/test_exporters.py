@@ -0,0 +1,170 @@
+import gzip
+import io
+import json
+from functools import partial
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from dictionary.exporters import export_lines, iter_chunks
+from dictionary.importers import read_pairs
+from dictionary.models import Dictionary, Language, TranslationGroup, User
+
+GROUPS = [
+    TranslationGroup(1, "cat", ["кіт", "кішка"]),
+    TranslationGroup(2, "hello, world", ['привіт "світ"']),
+]
+
+
+class ExportLinesTest(SimpleTestCase):
+    def test_csv(self):
+        lines = list(export_lines(GROUPS, "csv"))
+
+        self.assertEqual(
+            lines, ["cat,кіт\n", "cat,кішка\n", '"hello, world","привіт ""світ"""\n']
+        )
+
+    def test_jsonl(self):
+        lines = list(export_lines(GROUPS, "jsonl"))
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0]), {"word": "cat", "translation": "кіт"})
+        self.assertIn("кіт", lines[0])
+
+    def test_anki(self):
+        lines = list(export_lines(GROUPS, "anki"))
+
+        self.assertTrue(lines[0].startswith("#separator:tab\n"))
+        self.assertEqual(
+            lines[1:], ["cat\tкіт; кішка\n", 'hello, world\tпривіт "світ"\n']
+        )
+
+    def test_imported_back(self):
+        for format in ("csv", "jsonl", "anki"):
+            with self.subTest(format=format):
+                lines = io.StringIO("".join(export_lines(GROUPS, format)))
+
+                self.assertEqual(
+                    list(read_pairs(lines, format)),
+                    [
+                        ("cat", "кіт"),
+                        ("cat", "кішка"),
+                        ("hello, world", 'привіт "світ"'),
+                    ],
+                )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(export_lines(GROUPS, "xml"))
+
+    def test_chunks(self):
+        chunks = list(iter_chunks(["ab\n", "cd\n", "ef\n"], size=5))
+
+        self.assertEqual(chunks, [b"ab\ncd\n", b"ef\n"])
+
+
+@override_settings(
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    }
+)
+class ExportDictionaryViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user,
+            source_language=Language.objects.create(code="en", name="English"),
+            target_language=Language.objects.create(code="uk", name="Ukrainian"),
+        )
+        self.dictionary.add_translations(
+            [("cat", "кіт"), ("cat", "кішка"), ("dog", "пес"), ("apple", "яблуко")]
+        )
+        self.client.force_login(self.user)
+
+    def get_url(self, format):
+        return reverse("export_dictionary", args=["en", "uk", format])
+
+    def test_streamed_csv(self):
+        response = self.client.get(self.get_url("csv"))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="wordnest-en-uk.csv"', response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "apple,яблуко")
+        self.assertCountEqual(lines[1:3], ["cat,кіт", "cat,кішка"])
+        self.assertEqual(lines[3], "dog,пес")
+
+    def test_gzip(self):
+        response = self.client.get(
+            self.get_url("jsonl"), headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_gzip_refused(self):
+        response = self.client.get(
+            self.get_url("jsonl"), headers={"Accept-Encoding": "gzip;q=0"}
+        )
+
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_resumed_after_word(self):
+        response = self.client.get(self.get_url("anki"), {"after": "apple"})
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn(lines[3], ["cat\tкіт; кішка", "cat\tкішка; кіт"])
+        self.assertEqual(lines[4], "dog\tпес")
+
+    def test_unknown_format(self):
+        response = self.client.get(self.get_url("xml"))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_users_dictionary(self):
+        other = User.objects.create_user(email="other@gmail.com", password="12345")
+        self.client.force_login(other)
+
+        response = self.client.get(self.get_url("csv"))
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_export_streamed_as_read(self):
+        lines = []
+
+        def spy_export_lines(groups, format):
+            for line in export_lines(groups, format):
+                lines.append(line)
+                yield line
+
+        await self.async_client.aforce_login(self.user)
+        with patch("dictionary.views.export_lines", spy_export_lines), patch(
+            "dictionary.views.iter_chunks", partial(iter_chunks, size=1)
+        ):
+            response = await self.async_client.get(self.get_url("csv"))
+            content = aiter(response.streaming_content)
+
+            self.assertEqual(await anext(content), "apple,яблуко\n".encode())
+            self.assertEqual(len(lines), 1)
+            rest = [chunk async for chunk in content]
+
+        self.assertEqual(len(rest), 3)
+        self.assertEqual(len(lines), 4)
+
+    async def test_async_gzip(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(
+            self.get_url("jsonl"), headers={"Accept-Encoding": "gzip"}
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(gzip.decompress(content).decode().splitlines()), 4)
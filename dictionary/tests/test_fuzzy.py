@@ -0,0 +1,159 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from dictionary import fuzzy
+from dictionary.fuzzy import TrigramIndex, get_fuzzy_index, get_trigrams
+from dictionary.models import Dictionary, Language, TranslationGroup, User
+
+FUZZY_SETTINGS = {
+    "CACHE_ALIAS": "default",
+    "MAX_AGE": 600,
+    "MAX_DICTIONARIES": 2,
+    "THRESHOLD": 0.3,
+}
+
+
+class TrigramIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = TrigramIndex.build(
+            [
+                TranslationGroup(1, "apple", ["яблуко"]),
+                TranslationGroup(2, "application", ["застосунок"]),
+                TranslationGroup(3, "cat", ["кіт"]),
+                TranslationGroup(4, "tomcat", ["кіт"]),
+            ]
+        )
+
+    def test_trigrams(self):
+        self.assertEqual(get_trigrams("Cat"), {"  c", " ca", "cat", "at "})
+        self.assertEqual(get_trigrams(" "), set())
+
+    def test_typo_found(self):
+        self.assertEqual(self.index.search("aple")[0][0], 1)
+        self.assertEqual(self.index.search("aplication")[0][0], 2)
+
+    def test_ranked_by_similarity(self):
+        ranked = self.index.search("apple", threshold=0.1)
+
+        self.assertEqual([from_word_id for from_word_id, _ in ranked], [1, 2])
+        self.assertEqual(ranked[0][1], 1)
+        self.assertLess(ranked[1][1], ranked[0][1])
+
+    def test_found_by_translation(self):
+        self.assertEqual(self.index.search("кит"), [])
+        self.assertEqual(
+            [from_word_id for from_word_id, _ in self.index.search("кіт")], [3, 4]
+        )
+
+    def test_limit_and_threshold(self):
+        self.assertEqual(len(self.index.search("кіт", limit=1)), 1)
+        self.assertEqual(self.index.search("zebra"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_remove(self):
+        self.index.remove([3])
+
+        self.assertEqual(
+            [from_word_id for from_word_id, _ in self.index.search("кіт")], [4]
+        )
+        self.assertEqual(self.index.search("cat", threshold=0.9), [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_add_to_existing_word(self):
+        self.index.add([TranslationGroup(1, "apple", ["яблучко"])])
+
+        self.assertEqual(self.index.search("яблучко")[0], (1, 1))
+        self.assertEqual(self.index.search("яблуко")[0], (1, 1))
+
+
+@override_settings(FUZZY_SEARCH=FUZZY_SETTINGS)
+class DictionaryFuzzySearchTest(TestCase):
+    def setUp(self):
+        fuzzy._indexes.clear()
+        user = User.objects.create(email="test_user")
+        self.dictionary = Dictionary.objects.create(
+            user=user,
+            source_language=Language.objects.create(code="en", name="English"),
+            target_language=Language.objects.create(code="uk", name="Ukrainian"),
+        )
+        self.dictionary.add_translations(
+            [("apple", "яблуко"), ("application", "застосунок"), ("cat", "кіт")]
+        )
+        caches["default"].delete(fuzzy.VERSION_KEY.format(self.dictionary.pk))
+
+    def test_similar_words(self):
+        groups = self.dictionary.search_similar("aple", threshold=0.1)
+
+        self.assertEqual(
+            [(group.from_word, group.to_words) for group in groups],
+            [("apple", ["яблуко"]), ("application", ["застосунок"])],
+        )
+
+    def test_index_built_once(self):
+        self.dictionary.search_similar("aple")
+
+        # Only the found groups are read
+        with self.assertNumQueries(1):
+            self.dictionary.search_similar("aple")
+
+    def test_nothing_similar(self):
+        self.dictionary.search_similar("aple")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dictionary.search_similar("zebra"), [])
+
+    def test_index_updated(self):
+        self.dictionary.search_similar("aple")
+        cat = self.dictionary.search_similar("cat")[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dictionary.add_translations([("banana", "банан")])
+            self.dictionary.remove_word(cat.from_word_id)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.dictionary.search_similar("bananna")[0].from_word, "banana"
+            )
+        self.assertEqual(self.dictionary.search_similar("cat"), [])
+
+    def test_changed_by_other_worker(self):
+        index = get_fuzzy_index(self.dictionary)
+        caches["default"].set(fuzzy.VERSION_KEY.format(self.dictionary.pk), "other")
+
+        self.assertIsNot(get_fuzzy_index(self.dictionary), index)
+        self.assertEqual(get_fuzzy_index(self.dictionary).version, "other")
+
+    def test_rebuilt_after_max_age(self):
+        index = get_fuzzy_index(self.dictionary)
+        index.built_at -= FUZZY_SETTINGS["MAX_AGE"]
+
+        self.assertIsNot(get_fuzzy_index(self.dictionary), index)
+
+    def test_outdated_index_not_updated(self):
+        get_fuzzy_index(self.dictionary)
+        caches["default"].set(fuzzy.VERSION_KEY.format(self.dictionary.pk), "other")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dictionary.add_translations([("banana", "банан")])
+
+        self.assertNotIn(self.dictionary.pk, fuzzy._indexes)
+
+    def test_least_recently_used_dropped(self):
+        user = self.dictionary.user
+        languages = [
+            Language.objects.create(code=code, name=code) for code in ("pl", "de")
+        ]
+        others = [
+            Dictionary.objects.create(
+                user=user,
+                source_language=language,
+                target_language_id=self.dictionary.target_language_id,
+            )
+            for language in languages
+        ]
+        get_fuzzy_index(self.dictionary)
+
+        for dictionary in others:
+            get_fuzzy_index(dictionary)
+
+        self.assertEqual(list(fuzzy._indexes), [other.pk for other in others])
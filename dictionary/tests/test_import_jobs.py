@@ -0,0 +1,265 @@
+import gzip
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from dictionary import fuzzy, import_jobs, suggestions
+from dictionary.models import Dictionary, ImportJob, Language, User
+
+
+class ImportJobTestMixin:
+    def setUp(self):
+        fuzzy._indexes.clear()
+        suggestions._languages.clear()
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+        self.upload_dir = Path(upload_dir.name)
+        options = {**settings.DICTIONARY_IMPORT, "UPLOAD_DIR": upload_dir.name}
+        self.enterContext(override_settings(DICTIONARY_IMPORT=options))
+
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user,
+            source_language=Language.objects.create(code="en", name="English"),
+            target_language=Language.objects.create(code="uk", name="Ukrainian"),
+        )
+
+    def create_job(self, name, content):
+        file = SimpleUploadedFile(name, content)
+        format = name.removesuffix(".gz").rsplit(".", 1)[-1]
+        with mock.patch.object(import_jobs, "get_executor"):
+            return import_jobs.create_import_job(
+                self.dictionary, file, "anki" if format == "txt" else format
+            )
+
+    def get_pairs(self):
+        return sorted(
+            self.dictionary.translations.values_list("from_word__word", "to_word__word")
+        )
+
+
+class RunImportJobTest(ImportJobTestMixin, TestCase):
+    def test_import(self):
+        job = self.create_job(
+            "words.csv", "Cat,Кіт\ncat,кішка\nbroken\ndog,пес\n".encode()
+        )
+
+        import_jobs.run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.DONE)
+        self.assertEqual((job.rows, job.invalid, job.translations), (4, 1, 3))
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(
+            self.get_pairs(), [("cat", "кіт"), ("cat", "кішка"), ("dog", "пес")]
+        )
+        self.assertFalse(Path(job.path).exists())
+
+    def test_import_gzipped_anki_notes(self):
+        content = gzip.compress("#separator:tab\ncat\tкіт; кішка\n".encode())
+        job = self.create_job("notes.txt.gz", content)
+
+        import_jobs.run_import_job(job.pk)
+
+        self.assertEqual(self.get_pairs(), [("cat", "кіт"), ("cat", "кішка")])
+
+    def test_progress_updated_per_chunk(self):
+        job = self.create_job("words.tsv", "a\tа\nb\tб\nc\tв\n".encode())
+        options = {**settings.DICTIONARY_IMPORT, "CHUNK_SIZE": 2}
+
+        with override_settings(DICTIONARY_IMPORT=options):
+            with CaptureQueriesContext(connection) as queries:
+                import_jobs.run_import_job(job.pk)
+
+        updates = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('UPDATE "dictionary_importjob"')
+        ]
+        # Running, two chunks and done
+        self.assertEqual(len(updates), 4)
+        job.refresh_from_db()
+        self.assertEqual((job.rows, job.translations), (3, 3))
+
+    def test_failed_import(self):
+        job = self.create_job("words.csv", b"cat,\xff\n")
+
+        import_jobs.run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertTrue(job.error)
+        self.assertFalse(Path(job.path).exists())
+
+    def test_stopped_import_resumed(self):
+        job = self.create_job("words.tsv", "a\tа\nb\tб\nc\tв\n".encode())
+        options = {**settings.DICTIONARY_IMPORT, "CHUNK_SIZE": 2}
+        self.enterContext(override_settings(DICTIONARY_IMPORT=options))
+
+        with mock.patch.object(import_jobs, "_stopping") as stopping:
+            stopping.is_set.return_value = True
+            import_jobs.run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.PENDING)
+        self.assertEqual((job.rows, job.translations), (2, 2))
+        self.assertTrue(Path(job.path).exists())
+        # Resumed at once by the next worker
+        self.assertTrue(job.is_stale)
+
+        output = StringIO()
+        call_command("resume_imports", stdout=output)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.DONE)
+        self.assertEqual((job.rows, job.translations), (3, 3))
+        self.assertEqual(self.get_pairs(), [("a", "а"), ("b", "б"), ("c", "в")])
+        self.assertIn("Resumed 1 imports", output.getvalue())
+
+    def test_job_imported_once(self):
+        job = self.create_job("words.csv", b"cat,kit\n")
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.Status.RUNNING)
+
+        # Queued in another process too
+        import_jobs.run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.rows), (ImportJob.Status.RUNNING, 0))
+        self.assertTrue(Path(job.path).exists())
+
+    def test_stale_jobs_resumed_when_worker_starts(self):
+        stale = self.create_job("stale.csv", b"cat,kit\n")
+        lost = self.create_job("lost.csv", b"dog,pes\n")
+        running = self.create_job("running.csv", b"sun,sontse\n")
+        Path(lost.path).unlink()
+        ImportJob.objects.filter(pk__in=[stale.pk, lost.pk]).update(
+            status=ImportJob.Status.RUNNING,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+        ImportJob.objects.filter(pk=running.pk).update(status=ImportJob.Status.RUNNING)
+        executor = mock.Mock()
+        executor.submit.side_effect = lambda func, *args: func(*args)
+
+        with mock.patch.object(import_jobs, "get_executor", return_value=executor):
+            with mock.patch.object(import_jobs, "close_old_connections"):
+                import_jobs.resume_stale_import_jobs()
+
+        statuses = dict(ImportJob.objects.values_list("file_name", "status"))
+        self.assertEqual(
+            statuses,
+            {
+                "stale.csv": ImportJob.Status.DONE,
+                "lost.csv": ImportJob.Status.FAILED,
+                "running.csv": ImportJob.Status.RUNNING,
+            },
+        )
+        self.assertEqual(self.get_pairs(), [("cat", "kit")])
+
+    def test_job_with_lost_file_failed(self):
+        job = self.create_job("words.csv", b"cat,kit\n")
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.Status.RUNNING)
+        Path(job.path).unlink()
+
+        stats = import_jobs.resume_import_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(stats, {"resumed": 0, "lost": 1})
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+
+
+@override_settings(
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    }
+)
+class ImportViewsTest(ImportJobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse("import_dictionary", args=["en", "uk"])
+
+    def test_upload_starts_import_in_background(self):
+        file = SimpleUploadedFile(
+            "words.jsonl", b'{"word": "cat", "translation": "kit"}'
+        )
+
+        with mock.patch.object(import_jobs, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(self.url, {"file": file})
+
+        job = ImportJob.objects.get()
+        self.assertEqual((job.dictionary, job.format), (self.dictionary, "jsonl"))
+        self.assertEqual(job.status, ImportJob.Status.PENDING)
+        self.assertTrue(Path(job.path).is_relative_to(self.upload_dir))
+        get_executor().submit.assert_called_once_with(
+            import_jobs._run_in_worker, job.pk
+        )
+        self.assertContains(response, reverse("import_job", args=[job.pk]))
+
+    def test_unknown_file_format(self):
+        file = SimpleUploadedFile("words.xml", b"<words/>")
+
+        response = self.client.post(self.url, {"file": file})
+
+        self.assertContains(response, "Cannot detect the format")
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_file_too_large(self):
+        options = {**settings.DICTIONARY_IMPORT, "MAX_SIZE": 10}
+        file = SimpleUploadedFile("words.csv", b"hello,world\n")
+
+        with override_settings(DICTIONARY_IMPORT=options):
+            response = self.client.post(self.url, {"file": file})
+
+        self.assertContains(response, "The file is larger than")
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_progress_polled_until_done(self):
+        job = self.create_job("words.csv", b"cat,kit\n")
+        url = reverse("import_job", args=[job.pk])
+
+        response = self.client.get(url)
+        self.assertContains(response, 'hx-trigger="every 1s"')
+        self.assertNotIn("HX-Trigger", response)
+
+        import_jobs.run_import_job(job.pk)
+        response = self.client.get(url)
+
+        self.assertNotContains(response, 'hx-trigger="every 1s"')
+        self.assertIn("import-done", response["HX-Trigger"])
+
+    def test_stale_job_resumed_when_polled(self):
+        job = self.create_job("words.csv", b"cat,kit\n")
+        url = reverse("import_job", args=[job.pk])
+
+        with mock.patch("dictionary.views.resume_stale_import_jobs") as resume:
+            self.client.get(url)
+            resume.assert_not_called()
+
+            ImportJob.objects.filter(pk=job.pk).update(
+                updated_at=timezone.now() - timedelta(hours=1)
+            )
+            self.client.get(url)
+            resume.assert_called_once_with()
+
+    def test_other_users_job(self):
+        job = self.create_job("words.csv", b"cat,kit\n")
+        other = User.objects.create_user(email="other@gmail.com", password="12345")
+        self.client.force_login(other)
+
+        response = self.client.get(reverse("import_job", args=[job.pk]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,191 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
+
+from dictionary.importers import TranslationImporter, detect_format, read_pairs
+from dictionary.models import Language, Translation, Word
+
+
+class ReadPairsTest(TestCase):
+    def test_detect_format(self):
+        self.assertEqual(detect_format("words.tsv"), "tsv")
+        self.assertEqual(detect_format("en-uk.words.JSONL.gz"), "jsonl")
+        self.assertEqual(detect_format("notes.txt"), "anki")
+        with self.assertRaises(ValueError):
+            detect_format("words.xml")
+
+    def test_invalid_rows_keep_their_position(self):
+        lines = ["Hello\tПривіт\n", "broken\n", "\tкіт\n", "cat\tкіт\tnoun\n"]
+
+        pairs = list(read_pairs(lines, "tsv"))
+
+        self.assertEqual(pairs, [("hello", "привіт"), None, None, ("cat", "кіт")])
+
+    def test_json_lines(self):
+        lines = ['{"word": "cat", "translation": "кіт"}\n', "{}\n", "not json\n"]
+
+        self.assertEqual(list(read_pairs(lines, "jsonl")), [("cat", "кіт"), None, None])
+
+    def test_anki_notes(self):
+        lines = [
+            "#separator:tab\n",
+            "#html:false\n",
+            "cat\tкіт; кішка\n",
+            "#hashtag\t#хештег\n",
+            "broken\n",
+        ]
+
+        self.assertEqual(
+            list(read_pairs(lines, "anki")),
+            [("cat", "кіт"), ("cat", "кішка"), ("#hashtag", "#хештег"), None],
+        )
+
+
+class ImportTranslationsCommandTest(TestCase):
+    def setUp(self):
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_file(self, name, content):
+        path = self.directory / name
+        if name.endswith(".gz"):
+            path.write_bytes(gzip.compress(content.encode()))
+        else:
+            path.write_text(content, encoding="utf-8")
+        return path
+
+    def import_file(self, path, *args):
+        stdout = StringIO()
+        call_command(
+            "import_translations",
+            str(path),
+            "--from=en",
+            "--to=uk",
+            *args,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def get_pairs(self):
+        return set(
+            Translation.objects.filter(is_approved=True).values_list(
+                "from_word__word", "to_word__word"
+            )
+        )
+
+    def test_import_tsv(self):
+        path = self.write_file("words.tsv", "hello\tпривіт\nhello\tвітаю\ncat\tкіт\n")
+
+        output = self.import_file(path, "--chunk-size=2")
+
+        self.assertEqual(
+            self.get_pairs(),
+            {("hello", "привіт"), ("hello", "вітаю"), ("cat", "кіт")},
+        )
+        self.assertIn("Imported 3 translations from 3 rows", output)
+        self.assertEqual(Word.objects.filter(word="hello").count(), 1)
+
+    def test_import_gzipped_json_lines(self):
+        content = "".join(
+            json.dumps({"word": word, "translation": text}) + "\n"
+            for word, text in [("cat", "кіт"), ("dog", "пес")]
+        )
+        path = self.write_file("words.jsonl.gz", content)
+
+        self.import_file(path)
+
+        self.assertEqual(self.get_pairs(), {("cat", "кіт"), ("dog", "пес")})
+
+    def test_existing_rows_reused_and_approved(self):
+        cat = Word.objects.create(word="cat", language=self.english)
+        translation = Translation.objects.create(
+            from_word=cat,
+            to_word=Word.objects.create(word="кіт", language=self.ukrainian),
+        )
+        path = self.write_file("words.csv", '"cat","кіт"\n"cat","кішка"\n')
+
+        self.import_file(path)
+
+        translation.refresh_from_db()
+        self.assertTrue(translation.is_approved)
+        self.assertEqual(Word.objects.count(), 3)
+        self.assertEqual(Translation.objects.count(), 2)
+
+    def test_queries_per_chunk(self):
+        rows = "".join(f"word{number}\tслово{number}\n" for number in range(100))
+        path = self.write_file("words.tsv", rows)
+        importer = TranslationImporter(self.english, self.ukrainian, chunk_size=100)
+
+        with open(path, encoding="utf-8") as stream, self.assertNumQueries(9):
+            # Per language: select, insert and select of the new words,
+            # then the translations insert, wrapped in a savepoint
+            importer.import_pairs(read_pairs(stream, "tsv"))
+
+        self.assertEqual(Translation.objects.count(), 100)
+
+    def test_resume_from_checkpoint(self):
+        path = self.write_file("words.tsv", "one\tодин\ntwo\tдва\nthree\tтри\n")
+        checkpoint = self.directory / "words.checkpoint"
+        self.import_file(path, f"--checkpoint={checkpoint}")
+        Translation.objects.all().delete()
+        # Simulate a run interrupted after the first two rows
+        stat = path.stat()
+        checkpoint.write_text(
+            json.dumps(
+                {
+                    "file": str(path.resolve()),
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "from": "en",
+                    "to": "uk",
+                    "rows": 2,
+                }
+            )
+        )
+
+        output = self.import_file(path, f"--checkpoint={checkpoint}", "--resume")
+
+        self.assertIn("Resuming after 2 rows", output)
+        self.assertEqual(self.get_pairs(), {("three", "три")})
+        self.assertFalse(checkpoint.exists())
+
+    def test_checkpoint_of_changed_file_rejected(self):
+        path = self.write_file("words.tsv", "one\tодин\n")
+        checkpoint = self.directory / "words.checkpoint"
+        checkpoint.write_text(json.dumps({"file": "other.tsv", "rows": 1}))
+
+        with self.assertRaises(CommandError):
+            self.import_file(path, f"--checkpoint={checkpoint}", "--resume")
+
+    def test_unknown_language(self):
+        path = self.write_file("words.tsv", "one\tодин\n")
+
+        with self.assertRaises(CommandError):
+            call_command("import_translations", str(path), "--from=en", "--to=de")
+
+
+class DeletedWordImportTest(TransactionTestCase):
+    def test_chunk_saved_again_after_kept_word_deleted(self):
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        Word.objects.create(word="cat", language=english)
+        importer = TranslationImporter(english, ukrainian)
+        # Removed as an orphan after the importer loaded its id
+        Word.objects.filter(word="cat").delete()
+
+        stats = importer.import_pairs([("cat", "кіт")])
+
+        self.assertEqual(stats["translations"], 1)
+        self.assertTrue(
+            Translation.objects.filter(
+                from_word__word="cat", to_word__word="кіт", is_approved=True
+            ).exists()
+        )
@@ -0,0 +1,100 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from dictionary.forms import DictionaryForm
+from dictionary.languages import (
+    VERSION_KEY,
+    get_language_registry,
+    reset_language_registry,
+)
+from dictionary.models import Language
+
+REGISTRY_SETTINGS = {"CACHE_ALIAS": "default", "CHECK_INTERVAL": 0, "MAX_AGE": 600}
+
+
+@override_settings(LANGUAGE_REGISTRY=REGISTRY_SETTINGS)
+class LanguageRegistryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.english = Language.objects.create(code="en", name="English")
+        cls.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+
+    def setUp(self):
+        caches["default"].delete(VERSION_KEY)
+        reset_language_registry()
+
+    def test_loaded_once(self):
+        with self.assertNumQueries(1):
+            get_language_registry()
+        with self.assertNumQueries(0):
+            registry = get_language_registry()
+
+        self.assertEqual(registry.get_id("en"), self.english.id)
+        self.assertEqual(registry.by_id[self.ukrainian.id].code, "uk")
+        self.assertEqual(len(registry), 2)
+
+    def test_unknown_code(self):
+        registry = get_language_registry()
+
+        self.assertIsNone(registry.get_id("xx"))
+        self.assertNotIn("xx", registry)
+
+    def test_saved_language(self):
+        get_language_registry()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            polish = Language.objects.create(code="pl", name="Polish")
+
+        self.assertEqual(get_language_registry().get_id("pl"), polish.id)
+        self.assertIsNotNone(caches["default"].get(VERSION_KEY))
+
+    def test_deleted_language(self):
+        get_language_registry()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ukrainian.delete()
+
+        self.assertNotIn("uk", get_language_registry())
+
+    def test_changed_by_other_worker(self):
+        get_language_registry()
+        # Another worker added a language and announced a new version
+        Language.objects.bulk_create([Language(code="pl", name="Polish")])
+        caches["default"].set(VERSION_KEY, "other")
+
+        registry = get_language_registry()
+
+        self.assertIn("pl", registry)
+        self.assertEqual(registry.version, "other")
+
+    @override_settings(LANGUAGE_REGISTRY={**REGISTRY_SETTINGS, "CHECK_INTERVAL": 60})
+    def test_version_checked_after_interval(self):
+        get_language_registry()
+        caches["default"].set(VERSION_KEY, "other")
+
+        with self.assertNumQueries(0):
+            registry = get_language_registry()
+
+        self.assertIsNone(registry.version)
+
+    def test_to_model(self):
+        language = get_language_registry().by_code["en"].to_model()
+
+        self.assertEqual(language, self.english)
+        self.assertFalse(language._state.adding)
+
+    def test_form_choices(self):
+        get_language_registry()
+
+        with self.assertNumQueries(0):
+            form = DictionaryForm()
+            form.as_p()
+
+        self.assertEqual(
+            list(form.fields["source_language"].choices),
+            [
+                ("", "---------"),
+                (self.english.id, "English"),
+                (self.ukrainian.id, "Ukrainian"),
+            ],
+        )
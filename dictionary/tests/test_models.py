@@ -1,8 +1,22 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipIf
+
+from django.db import connection, connections
 from django.db.utils import IntegrityError
 from django.forms import ValidationError
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from dictionary.models import Dictionary, Language, Translation, User, Word
+from dictionary.models import (
+    Dictionary,
+    DictionaryEntry,
+    Language,
+    Translation,
+    User,
+    Word,
+)
 
 
 class WordTest(TestCase):
@@ -129,6 +143,9 @@ class DictionaryTest(TestCase):
         self.assertEqual(dictionary.translations.count(), 1)
         self.assertTrue(self.word2 == dictionary.translations.all()[0].to_word)
         self.assertTrue(self.word1 == dictionary.translations.all()[0].from_word)
+        entry = dictionary.entries.get()
+        self.assertEqual(entry.from_word, self.word1)
+        self.assertIsNotNone(entry.added_at)
 
     def test_unique_language_pair_per_user_constraint(self):
         Dictionary.objects.create(
@@ -151,3 +168,349 @@ class DictionaryTest(TestCase):
                 source_language=self.language1,
                 target_language=self.language1,
             )
+
+
+class DictionaryAddTranslationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="test_user")
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=self.english, target_language=self.ukrainian
+        )
+
+    def test_translation_added(self):
+        self.dictionary.add_translation("Cat", "Кіт")
+        self.dictionary.add_translation("cat", "кіт")
+
+        self.assertEqual(
+            list(
+                self.dictionary.translations.values_list(
+                    "from_word__word", "to_word__word"
+                )
+            ),
+            [("cat", "кіт")],
+        )
+        self.assertEqual(Word.objects.count(), 2)
+
+    def test_existing_rows_reused(self):
+        cat = Word.objects.create(word="cat", language=self.english)
+        kit = Word.objects.create(word="кіт", language=self.ukrainian)
+        approved = Translation.objects.create(
+            from_word=cat, to_word=kit, is_approved=True
+        )
+
+        self.dictionary.add_translation("cat", "кіт")
+
+        self.assertEqual(list(self.dictionary.translations.all()), [approved])
+        approved.refresh_from_db()
+        self.assertTrue(approved.is_approved)
+
+    def test_one_statement_per_table(self):
+        self.dictionary.add_translation("cat", "кіт")
+
+        # Insert and select of the words and the translation, insert into the dictionary,
+        # whether the rows exist or not
+        with self.assertNumQueries(5):
+            self.dictionary.add_translation("cat", "кішка")
+
+    def test_upsert_ids(self):
+        cat = Word.objects.create(word="cat", language=self.english)
+
+        ids = Word.objects.upsert_ids(
+            [(self.english.pk, "Cat"), (self.ukrainian.pk, "кіт")]
+        )
+
+        kit = Word.objects.get(word="кіт")
+        self.assertEqual(
+            ids, {(self.english.pk, "cat"): cat.pk, (self.ukrainian.pk, "кіт"): kit.pk}
+        )
+        self.assertEqual(
+            Translation.objects.upsert_ids([(cat.pk, kit.pk)]),
+            {(cat.pk, kit.pk): Translation.objects.get().pk},
+        )
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite serializes writes of concurrent threads")
+class ConcurrentAddTranslationTest(TransactionTestCase):
+    """
+    Concurrent adds of overlapping words to dictionaries.
+    """
+
+    threads = 16
+    adds = 2000
+
+    def setUp(self):
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.users = [
+            User.objects.create_user(email=f"user{i}@gmail.com", password="12345")
+            for i in range(4)
+        ]
+        for user in self.users:
+            Dictionary.objects.create(
+                user=user, source_language=english, target_language=ukrainian
+            )
+
+    def add(self, user, word, translation):
+        try:
+            user.add_word_to_dictionary("en", "uk", word, translation)
+        finally:
+            connections.close_all()
+
+    def test_concurrent_adds(self):
+        rng = random.Random(0)
+        # A few words, so the adds of the same words overlap
+        adds = [
+            (
+                rng.choice(self.users),
+                f"word{rng.randrange(50)}",
+                f"слово{rng.randrange(5)}",
+            )
+            for _ in range(self.adds)
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            futures = [executor.submit(self.add, *add) for add in adds]
+        errors = [future.exception() for future in futures if future.exception()]
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            Word.objects.count(),
+            len({word for _, word, _ in adds} | {text for _, _, text in adds}),
+        )
+        self.assertEqual(Translation.objects.count(), len({add[1:] for add in adds}))
+        self.assertEqual(
+            sum(user.get_total_translations() for user in self.users),
+            len({(user.pk, word, text) for user, word, text in adds}),
+        )
+
+
+class DictionaryAddTranslationsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="test_user")
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=self.english, target_language=self.ukrainian
+        )
+
+    def test_translations_added(self):
+        added = self.dictionary.add_translations(
+            [("Hello", "Привіт"), ("hello", "вітаю"), ("cat", "кіт"), ("cat", "кіт")]
+        )
+
+        self.assertEqual(added, 3)
+        self.assertCountEqual(
+            self.dictionary.translations.values_list(
+                "from_word__word", "to_word__word"
+            ),
+            [("hello", "привіт"), ("hello", "вітаю"), ("cat", "кіт")],
+        )
+
+    def test_existing_rows_reused(self):
+        hello = Word.objects.create(word="hello", language=self.english)
+        cat = Word.objects.create(word="cat", language=self.english)
+        hi = Word.objects.create(word="привіт", language=self.ukrainian)
+        approved = Translation.objects.create(
+            from_word=hello, to_word=hi, is_approved=True
+        )
+        # Not a pair of the batch, although both words are in it
+        Translation.objects.create(from_word=cat, to_word=hi)
+        self.dictionary.translations.add(approved)
+
+        self.dictionary.add_translations([("hello", "привіт"), ("cat", "кіт")])
+
+        self.assertEqual(Word.objects.count(), 4)
+        self.assertEqual(Translation.objects.count(), 3)
+        self.assertCountEqual(
+            self.dictionary.translations.values_list(
+                "from_word__word", "to_word__word", "is_approved"
+            ),
+            [("hello", "привіт", True), ("cat", "кіт", False)],
+        )
+        self.assertCountEqual(
+            self.dictionary.entries.values_list("word", "from_word__word"),
+            [("hello", "hello"), ("cat", "cat")],
+        )
+
+    def test_query_count_does_not_depend_on_size(self):
+        with CaptureQueriesContext(connection) as small:
+            self.dictionary.add_translations([("word0", "слово0")])
+        # Below the SQLite limit of query parameters for the dictionary entries (999 / 9 columns),
+        # bulk_create() splits larger batches there
+        with CaptureQueriesContext(connection) as large:
+            self.dictionary.add_translations(
+                (f"word{i}", f"слово{i}") for i in range(1, 100)
+            )
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(self.dictionary.translations.count(), 100)
+
+    def test_empty_batch(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dictionary.add_translations([]), 0)
+
+
+class DictionaryTranslationPageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="test_user")
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=english, target_language=ukrainian
+        )
+        for number in range(7):
+            self.dictionary.add_translation(f"word{number}", f"слово{number}")
+        self.dictionary.add_translation("word0", "ще слово0")
+
+    def get_all_pages(self, size, search=None, order=Dictionary.Order.ALPHABETICAL):
+        pages, after = [], None
+        while True:
+            groups, after = self.dictionary.get_translation_page(
+                search, after, size, order
+            )
+            pages.append([(group.from_word, group.to_words) for group in groups])
+            if after is None:
+                return pages
+
+    def test_pages_cover_dictionary_once(self):
+        pages = self.get_all_pages(size=3)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        words = [word for page in pages for word, _ in page]
+        self.assertEqual(words, [f"word{number}" for number in range(7)])
+        self.assertEqual(pages[0][0], ("word0", ["слово0", "ще слово0"]))
+
+    def test_last_full_page_has_no_next_page(self):
+        self.assertEqual(len(self.get_all_pages(size=7)), 1)
+
+    def test_search(self):
+        pages = self.get_all_pages(size=3, search="ще")
+
+        self.assertEqual(pages, [[("word0", ["ще слово0"])]])
+
+    def test_other_dictionaries_excluded(self):
+        other = Dictionary.objects.create(
+            user=User.objects.create(email="other_user"),
+            source_language=self.dictionary.source_language,
+            target_language=self.dictionary.target_language,
+        )
+        other.add_translation("other", "інше")
+
+        words = [word for page in self.get_all_pages(size=10) for word, _ in page]
+
+        self.assertNotIn("other", words)
+
+    def test_number_of_queries_per_page(self):
+        for size in (2, 7):
+            with self.assertNumQueries(2):
+                self.dictionary.get_translation_page(after=("word1", 0), size=size)
+
+    def get_words(self, pages):
+        return [word for page in pages for word, _ in page]
+
+    def test_newest_first(self):
+        pages = self.get_all_pages(size=3, order=Dictionary.Order.NEWEST)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        # word0 got its newest translation last
+        self.assertEqual(
+            self.get_words(pages), ["word0"] + [f"word{n}" for n in range(6, 0, -1)]
+        )
+        self.assertEqual(pages[0][0], ("word0", ["слово0", "ще слово0"]))
+
+    def test_oldest_first(self):
+        pages = self.get_all_pages(size=3, order=Dictionary.Order.OLDEST)
+
+        self.assertEqual(self.get_words(pages), [f"word{n}" for n in range(7)])
+
+    def test_recency_of_matching_translations(self):
+        pages = self.get_all_pages(
+            size=3, search="слово", order=Dictionary.Order.NEWEST
+        )
+
+        # The newest translation of word0 does not match the search
+        self.assertEqual(
+            self.get_words(pages), [f"word{n}" for n in range(6, 0, -1)] + ["word0"]
+        )
+        self.assertEqual(pages[-1][-1], ("word0", ["слово0"]))
+
+    def test_entries_added_at_the_same_time(self):
+        DictionaryEntry.objects.update(added_at=timezone.now())
+
+        pages = self.get_all_pages(size=2, order=Dictionary.Order.NEWEST)
+
+        self.assertCountEqual(self.get_words(pages), [f"word{n}" for n in range(7)])
+
+    def test_number_of_queries_per_recent_page(self):
+        _, after = self.dictionary.get_translation_page(
+            size=2, order=Dictionary.Order.NEWEST
+        )
+
+        for size in (2, 7):
+            with self.assertNumQueries(2):
+                self.dictionary.get_translation_page(
+                    after=after, size=size, order=Dictionary.Order.NEWEST
+                )
+
+    def test_translation_added_again_keeps_its_time(self):
+        entry = DictionaryEntry.objects.get(from_word__word="word1")
+
+        self.dictionary.add_translation("word1", "слово1")
+        self.dictionary.add_translations([("word1", "слово1")])
+
+        self.assertEqual(
+            DictionaryEntry.objects.get(pk=entry.pk).added_at, entry.added_at
+        )
+
+
+class DictionaryTranslationGroupsTest(TestCase):
+    def setUp(self):
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=User.objects.create(email="test_user"),
+            source_language=english,
+            target_language=ukrainian,
+        )
+        for word, translation in [
+            ("hello", "привіт"),
+            ("cat", "кіт"),
+            ("hello", "вітаю"),
+            ("cat", "кішка"),
+            ("dog", "пес"),
+        ]:
+            self.dictionary.add_translation(word, translation)
+
+    def get_groups(self, **kwargs):
+        return [
+            (group.from_word, group.to_words)
+            for group in self.dictionary.iter_translation_groups(**kwargs)
+        ]
+
+    def test_groups_ordered_by_source_word(self):
+        with self.assertNumQueries(1):
+            groups = self.get_groups(chunk_size=2)
+
+        self.assertEqual(
+            groups,
+            [
+                ("cat", ["кіт", "кішка"]),
+                ("dog", ["пес"]),
+                ("hello", ["привіт", "вітаю"]),
+            ],
+        )
+
+    def test_group_ids(self):
+        group = next(self.dictionary.iter_translation_groups())
+
+        self.assertEqual(group.from_word_id, Word.objects.get(word="cat").pk)
+
+    def test_search(self):
+        self.assertEqual(self.get_groups(search="кі"), [("cat", ["кіт", "кішка"])])
+
+    def test_source_words_filter(self):
+        dog = Word.objects.get(word="dog")
+
+        self.assertEqual(self.get_groups(from_word_ids=[dog.pk]), [("dog", ["пес"])])
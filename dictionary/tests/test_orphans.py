@@ -0,0 +1,185 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+
+from dictionary import fuzzy, models, orphans, suggestions
+from dictionary.models import Dictionary, Language, Translation, User, Word
+from dictionary.orphans import OrphanCollector
+
+
+class OrphanTestMixin:
+    def setUp(self):
+        fuzzy._indexes.clear()
+        suggestions._languages.clear()
+        cache.delete(orphans.CURSOR_KEY)
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = Dictionary.objects.create(
+            user=user, source_language=english, target_language=ukrainian
+        )
+        self.dictionary.add_translation("cat", "кіт")
+
+        words = Word.objects.get_or_create_ids(english.pk, ["dog", "sun", "lonely"])
+        to_words = Word.objects.get_or_create_ids(ukrainian.pk, ["пес", "сонце"])
+        # Left behind by a deleted dictionary
+        Translation.objects.create(
+            from_word_id=words["dog"], to_word_id=to_words["пес"]
+        )
+        # Found by the API
+        Translation.objects.create(
+            from_word_id=words["sun"], to_word_id=to_words["сонце"], is_approved=True
+        )
+
+    def get_words(self):
+        return sorted(Word.objects.values_list("word", flat=True))
+
+
+class OrphanCollectorTest(OrphanTestMixin, TestCase):
+    def test_collect(self):
+        cursor, stats = OrphanCollector(min_age=timedelta(0)).collect()
+
+        self.assertIsNone(cursor)
+        self.assertEqual(stats, {"translations": 1, "words": 3, "skipped": 0})
+        self.assertEqual(self.get_words(), ["cat", "sun", "кіт", "сонце"])
+        self.assertEqual(Translation.objects.count(), 2)
+
+    def test_young_rows_kept(self):
+        _, stats = OrphanCollector().collect()
+
+        self.assertEqual(stats, {"translations": 0, "words": 0, "skipped": 0})
+
+    def test_resume(self):
+        collector = OrphanCollector(batch_size=2, min_age=timedelta(0))
+
+        cursor, stats = collector.collect(max_batches=3)
+
+        self.assertEqual(cursor["phase"], "words")
+        self.assertEqual(stats["translations"], 1)
+        self.assertEqual(len(self.get_words()), 7)
+
+        cursor, stats = collector.collect(cursor)
+
+        self.assertIsNone(cursor)
+        self.assertEqual(stats["words"], 3)
+
+    def test_referenced_rows_kept(self):
+        orphan = Translation.objects.get(from_word__word="dog")
+        self.dictionary.translations.add(orphan)
+
+        OrphanCollector(min_age=timedelta(0)).collect()
+
+        self.assertTrue(Translation.objects.filter(pk=orphan.pk).exists())
+        self.assertEqual(self.get_words(), ["cat", "dog", "sun", "кіт", "пес", "сонце"])
+
+    @override_settings(
+        ORPHAN_COLLECTION={
+            "BATCH_SIZE": 2,
+            "MIN_AGE": 0,
+            "MAX_BATCHES": 3,
+            "CACHE_ALIAS": "default",
+        }
+    )
+    def test_incremental_collection(self):
+        stats = orphans.collect_orphans_incrementally()
+
+        self.assertEqual(stats["translations"], 1)
+        self.assertEqual(cache.get(orphans.CURSOR_KEY)["phase"], "words")
+
+        while cache.get(orphans.CURSOR_KEY):
+            orphans.collect_orphans_incrementally()
+
+        self.assertEqual(len(self.get_words()), 4)
+
+    def test_writes_retried_after_collection(self):
+        add_translation = mock.Mock(side_effect=[IntegrityError, None])
+
+        models._atomic_with_retry(add_translation, "dog", "пес")
+
+        self.assertEqual(add_translation.call_count, 2)
+
+
+class CollectionRaceTest(OrphanTestMixin, TestCase):
+    """
+    Orphans removed by the collector after an insert skipped them and before they are read back.
+    """
+
+    def collect_after_first_insert(self, manager, phase):
+        insert = manager._insert_sorted
+        collected = []
+
+        def insert_and_collect(rows):
+            insert(rows)
+            if not collected:
+                collected.append(
+                    OrphanCollector(min_age=timedelta(0)).collect(
+                        {"phase": phase, "after": 0}, max_batches=1
+                    )
+                )
+
+        return mock.patch.object(
+            manager, "_insert_sorted", side_effect=insert_and_collect
+        )
+
+    def test_removed_word_created_again(self):
+        lonely = Word.objects.get(word="lonely")
+
+        with self.collect_after_first_insert(Word.objects, "words"):
+            self.dictionary.add_translation("lonely", "самотній")
+
+        self.assertFalse(Word.objects.filter(pk=lonely.pk).exists())
+        self.assertEqual(
+            [str(t.to_word) for t in self.dictionary.get_translations("lonely")],
+            ["самотній"],
+        )
+
+    def test_removed_translation_created_again(self):
+        orphan = Translation.objects.get(from_word__word="dog")
+
+        with self.collect_after_first_insert(Translation.objects, "translations"):
+            self.dictionary.add_translations([("dog", "пес")])
+
+        self.assertFalse(Translation.objects.filter(pk=orphan.pk).exists())
+        self.assertEqual(
+            [str(t.to_word) for t in self.dictionary.get_translations("dog")], ["пес"]
+        )
+
+
+class CollectOrphansCommandTest(OrphanTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = Path(directory.name, "orphans.checkpoint")
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command(
+            "collect_orphans",
+            "--min-age=0",
+            "--batch-size=2",
+            f"--checkpoint={self.checkpoint}",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_collect_and_resume(self):
+        output = self.call_command("--max-batches=2")
+
+        self.assertIn("Removed 1 translations and 0 words", output)
+        self.assertIn("continue with --resume", output)
+        self.assertTrue(self.checkpoint.is_file())
+
+        output = self.call_command("--resume")
+
+        self.assertIn("Resuming after translations", output)
+        self.assertIn("Removed 0 translations and 3 words", output)
+        self.assertFalse(self.checkpoint.exists())
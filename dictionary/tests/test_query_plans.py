@@ -0,0 +1,176 @@
+import re
+
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext, skipUnless
+
+from dictionary.models import Dictionary, Language, Translation, User, Word
+from dictionary.reviews import get_due_cards
+from dictionary.search_manager import DatabaseTranslation
+
+HOT_TABLES = (
+    "dictionary_word",
+    "dictionary_translation",
+    "dictionary_dictionary_translations",
+)
+
+
+def explain(sql: str) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def get_full_scans(plan: str) -> list[str]:
+    """
+    Return the lines of a query plan that read a whole table.
+
+    PostgreSQL reports them as "Seq Scan on <table>", SQLite as "SCAN <table or alias>"
+    (a search through an index is "SEARCH"). SQLite plans of joined tables show aliases,
+    so every full scan counts there.
+    """
+    if connection.vendor == "postgresql":
+        return [
+            line.strip()
+            for line in plan.splitlines()
+            if re.search(rf"Seq Scan on ({'|'.join(HOT_TABLES)})\b", line)
+        ]
+    return [line.strip() for line in plan.splitlines() if re.search(r"\bSCAN\b", line)]
+
+
+def get_sorts(plan: str) -> list[str]:
+    """
+    Return the lines of a query plan that sort rows instead of reading them in the order of an index.
+
+    PostgreSQL reports them as "Sort" nodes, SQLite as "USE TEMP B-TREE FOR ORDER BY"
+    (or DISTINCT, GROUP BY).
+    """
+    if connection.vendor == "postgresql":
+        return [
+            line.strip()
+            for line in plan.splitlines()
+            if re.match(r"\s*(->\s*)?Sort\b", line)
+        ]
+    return [line.strip() for line in plan.splitlines() if "USE TEMP B-TREE FOR" in line]
+
+
+@skipUnlessDBFeature("supports_explaining_query_execution")
+class QueryPlanTest(TestCase):
+    """
+    Checks that the hot queries keep using indexes on a seeded dataset.
+
+    Fails when a change of a query or of the schema makes one of them read a whole table,
+    or sort all the matching rows to return the first ones of a page.
+    """
+
+    words = 3000
+    users = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.english = Language.objects.create(code="en", name="English")
+        cls.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        cls.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        english_ids = Word.objects.get_or_create_ids(
+            cls.english.id, (f"word{number}" for number in range(cls.words))
+        )
+        ukrainian_ids = Word.objects.get_or_create_ids(
+            cls.ukrainian.id, (f"слово{number}" for number in range(cls.words * 2))
+        )
+        Translation.objects.bulk_create(
+            Translation(
+                from_word_id=english_ids[f"word{number // 2}"],
+                to_word_id=ukrainian_ids[f"слово{number}"],
+                is_approved=number % 3 != 0,
+            )
+            for number in range(cls.words * 2)
+        )
+        translation_ids = list(Translation.objects.values_list("pk", flat=True))
+        users = [cls.user] + [
+            User.objects.create_user(email=f"user{number}@gmail.com")
+            for number in range(cls.users - 1)
+        ]
+        # Dictionaries of different sizes, so the statistics resemble a real database
+        for number, user in enumerate(users):
+            dictionary = Dictionary.objects.create(
+                user=user, source_language=cls.english, target_language=cls.ukrainian
+            )
+            dictionary.translations.add(*translation_ids[number :: number + 2])
+        cls.dictionary = cls.user.dictionaries.get()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndexes(self, func, *args, **kwargs):
+        """
+        Run the function and check the plans of the queries it made.
+
+        Queries with a LIMIT (pages) must also read their rows in the order of an index.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            func(*args, **kwargs)
+
+        self.assertTrue(queries.captured_queries)
+        for query in queries.captured_queries:
+            plan = explain(query["sql"])
+            message = f"\n{query['sql']}\n{plan}"
+            self.assertEqual(get_full_scans(plan), [], msg=message)
+            if re.search(r"\bLIMIT \d+$", query["sql"]):
+                self.assertEqual(get_sorts(plan), [], msg=message)
+
+    def test_user_translations(self):
+        self.assertUsesIndexes(
+            DatabaseTranslation().translate, "word10", "en", "uk", self.user
+        )
+
+    def test_approved_translations(self):
+        queryset = Translation.get_approved_translations("word10", "en", "uk")
+
+        self.assertUsesIndexes(list, queryset)
+
+    def test_dictionary_first_page(self):
+        self.assertUsesIndexes(self.dictionary.get_translation_page)
+
+    def test_dictionary_next_page(self):
+        self.assertUsesIndexes(
+            self.dictionary.get_translation_page, after=("word1500", 0)
+        )
+
+    def test_dictionary_newest_first_page(self):
+        self.assertUsesIndexes(
+            self.dictionary.get_translation_page, order=Dictionary.Order.NEWEST
+        )
+
+    def test_dictionary_oldest_next_page(self):
+        _, after = self.dictionary.get_translation_page(order=Dictionary.Order.OLDEST)
+
+        self.assertUsesIndexes(
+            self.dictionary.get_translation_page,
+            after=after,
+            order=Dictionary.Order.OLDEST,
+        )
+
+    def test_dictionary_export(self):
+        # Streamed on PostgreSQL, the query is captured as the DECLARE of its cursor
+        with CaptureQueriesContext(connection) as queries:
+            groups = list(self.dictionary.iter_translation_groups())
+
+        self.assertTrue(groups)
+        plan = explain(queries[0]["sql"])
+        message = f"\n{queries[0]['sql']}\n{plan}"
+        self.assertEqual(get_full_scans(plan), [], msg=message)
+        self.assertEqual(get_sorts(plan), [], msg=message)
+
+    def test_due_cards(self):
+        self.assertUsesIndexes(get_due_cards, self.dictionary, limit=20)
+
+    def test_dictionary_search(self):
+        self.assertUsesIndexes(self.dictionary.get_translation_page, search="слово3")
+
+    @skipUnless(
+        connection.vendor == "postgresql",
+        "Only PostgreSQL uses an index for startswith",
+    )
+    def test_word_prefix_search(self):
+        queryset = Word.objects.filter(word__startswith="word15", language=self.english)
+
+        self.assertUsesIndexes(list, queryset)
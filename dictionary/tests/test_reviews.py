@@ -0,0 +1,178 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dictionary import fuzzy, suggestions
+from dictionary.models import Dictionary, DictionaryEntry, Language, User
+from dictionary.reviews import (
+    Grade,
+    ReviewSession,
+    Schedule,
+    get_due_cards,
+    schedule,
+)
+
+
+class ScheduleTest(TestCase):
+    def test_intervals_grow(self):
+        state = Schedule(0, 0, 2.5)
+
+        intervals = []
+        for _ in range(4):
+            state = schedule(state, Grade.GOOD)
+            intervals.append(state.interval)
+
+        self.assertEqual(intervals, [1, 6, 15, 38])
+        self.assertEqual(state.repetitions, 4)
+        self.assertAlmostEqual(state.ease_factor, 2.5)
+
+    def test_ease_factor_follows_grade(self):
+        self.assertAlmostEqual(
+            schedule(Schedule(0, 0, 2.5), Grade.EASY).ease_factor, 2.6
+        )
+        self.assertAlmostEqual(
+            schedule(Schedule(0, 0, 2.5), Grade.HARD).ease_factor, 2.36
+        )
+
+    def test_minimum_ease_factor(self):
+        state = Schedule(0, 0, 1.4)
+
+        self.assertEqual(schedule(state, Grade.HARD).ease_factor, 1.3)
+
+    def test_forgotten_card_starts_over(self):
+        state = schedule(Schedule(5, 40, 2.2), Grade.AGAIN)
+
+        self.assertEqual(state, Schedule(0, 1, 2.2))
+
+
+class ReviewTestMixin:
+    def setUp(self):
+        fuzzy._indexes.clear()
+        suggestions._languages.clear()
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user,
+            source_language=Language.objects.create(code="en", name="English"),
+            target_language=Language.objects.create(code="uk", name="Ukrainian"),
+        )
+        self.dictionary.add_translations(
+            [("cat", "кіт"), ("dog", "пес"), ("sun", "сонце")]
+        )
+        # Due a day ago, an hour ago and tomorrow
+        now = timezone.now()
+        for word, due_at in [
+            ("dog", now - timedelta(days=1)),
+            ("cat", now - timedelta(hours=1)),
+            ("sun", now + timedelta(days=1)),
+        ]:
+            DictionaryEntry.objects.filter(from_word__word=word).update(due_at=due_at)
+
+
+class ReviewSessionTest(ReviewTestMixin, TestCase):
+    def test_due_cards_longest_overdue_first(self):
+        cards = get_due_cards(self.dictionary, limit=10)
+
+        self.assertEqual(
+            [(card.word, card.translation) for card in cards],
+            [("dog", "пес"), ("cat", "кіт")],
+        )
+
+    def test_answers_written_when_batch_finished(self):
+        session = {}
+        review = ReviewSession(session, self.dictionary, batch_size=2)
+        dog = review.current()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(review.answer(dog.entry_id, Grade.GOOD))
+            cat = review.current()
+
+        self.assertEqual(DictionaryEntry.objects.get(pk=dog.entry_id).repetitions, 0)
+
+        # Read and update of the batch, in a savepoint
+        with self.assertNumQueries(4):
+            review.answer(cat.entry_id, Grade.AGAIN)
+
+        entry = DictionaryEntry.objects.get(pk=dog.entry_id)
+        self.assertEqual((entry.repetitions, entry.interval), (1, 1))
+        self.assertEqual(entry.due_at, entry.reviewed_at + timedelta(days=1))
+        self.assertIsNone(review.current())
+
+    def test_state_kept_in_session(self):
+        session = {}
+        card = ReviewSession(session, self.dictionary).current()
+
+        ReviewSession(session, self.dictionary).answer(card.entry_id, Grade.EASY)
+
+        self.assertEqual(ReviewSession(session, self.dictionary).current().word, "cat")
+
+    def test_answer_to_other_card_ignored(self):
+        review = ReviewSession({}, self.dictionary)
+        card = review.current()
+
+        self.assertFalse(review.answer(card.entry_id + 100, Grade.GOOD))
+        self.assertEqual(review.current(), card)
+
+    def test_removed_card_skipped(self):
+        review = ReviewSession({}, self.dictionary, batch_size=2)
+        card = review.current()
+        review.answer(card.entry_id, Grade.GOOD)
+        self.dictionary.remove_word(
+            DictionaryEntry.objects.get(pk=card.entry_id).from_word_id
+        )
+
+        self.assertEqual(review.flush(), 0)
+
+
+@override_settings(
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    }
+)
+class ReviewViewTest(ReviewTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse("review", args=["en", "uk"])
+
+    def test_review(self):
+        response = self.client.get(self.url)
+
+        card = response.context["card"]
+        self.assertEqual(card.word, "dog")
+        self.assertContains(response, "Show translation")
+
+        response = self.client.post(
+            self.url,
+            {"card": card.entry_id, "grade": Grade.GOOD},
+            headers={"HX-Request": "true"},
+        )
+
+        self.assertEqual(response.context["card"].word, "cat")
+        self.assertTemplateUsed(response, "dictionary/review_card.html")
+        self.assertTemplateNotUsed(response, "dictionary/review.html")
+
+    def test_nothing_due(self):
+        DictionaryEntry.objects.update(due_at=timezone.now() + timedelta(days=1))
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, "No words to review")
+
+    def test_invalid_grade(self):
+        card = self.client.get(self.url).context["card"]
+
+        response = self.client.post(self.url, {"card": card.entry_id, "grade": 7})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_users_dictionary(self):
+        other = User.objects.create_user(email="other@gmail.com", password="12345")
+        self.client.force_login(other)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
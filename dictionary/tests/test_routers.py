@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dictionary.middleware import _aiter_from_replica
+from dictionary.models import Dictionary, Language, User
+from wordnest.routers import ReplicaRouter, read_from_replica
+
+# Mirror of the test database defined by the settings
+REPLICA = "test_replica"
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_default_by_default(self):
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_writes_go_to_default(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_write(User), "default")
+
+    def test_migrations_only_on_default(self):
+        self.assertTrue(self.router.allow_migrate("default", "dictionary"))
+        self.assertFalse(self.router.allow_migrate("replica1", "dictionary"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        with read_from_replica():
+            self.assertEqual(self.router.db_for_read(User), "default")
+
+
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA],
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    },
+)
+class ReplicaRoutingTest(TransactionTestCase):
+    """
+    Routing of requests between the default database and a replica.
+
+    The test replica mirrors the test database, so the queries are told apart
+    by the connection that made them.
+    """
+
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        Dictionary.objects.create(
+            user=self.user, source_language=english, target_language=ukrainian
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("dictionary", args=["en", "uk"])
+
+    def test_read_only_view_reads_from_replica(self):
+        with CaptureQueriesContext(connections["default"]) as default:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(default), 0)
+        self.assertGreater(len(replica), 0)
+
+    def test_streamed_content_read_from_replica(self):
+        response = self.client.get(
+            reverse("export_dictionary", args=["en", "uk", "csv"])
+        )
+
+        with CaptureQueriesContext(connections["default"]) as default:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                b"".join(response.streaming_content)
+
+        self.assertEqual(len(default), 0)
+        self.assertGreater(len(replica), 0)
+
+    async def test_async_streamed_content_read_from_replica(self):
+        async def content():
+            yield ReplicaRouter().db_for_read(User)
+
+        chunks = [chunk async for chunk in _aiter_from_replica(content())]
+
+        self.assertEqual(chunks, [REPLICA])
+
+    def test_reads_in_transaction_go_to_default(self):
+        with read_from_replica(), transaction.atomic():
+            self.assertEqual(ReplicaRouter().db_for_read(User), "default")
+        with read_from_replica():
+            self.assertEqual(ReplicaRouter().db_for_read(User), REPLICA)
+
+    def test_write_pins_user_to_default(self):
+        response = self.client.post(
+            reverse("add_word_to_dictionary"),
+            data={
+                "source_language": "en",
+                "target_language": "uk",
+                "word": "hello",
+                "translation": "привіт",
+            },
+            headers={"X-Requested-With": "XMLHttpRequest"},
+            content_type="application/json",
+        )
+
+        cookie = response.cookies["primary_pin"]
+        self.assertEqual(cookie["max-age"], settings.PRIMARY_PIN_SECONDS)
+
+        with CaptureQueriesContext(connections["default"]) as default:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                response = self.client.get(self.url, headers={"HX-Request": "true"})
+
+        self.assertContains(response, "hello")
+        self.assertGreater(len(default), 0)
+        self.assertEqual(len(replica), 0)
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.post(
+            reverse("add_word_to_dictionary"),
+            data={
+                "source_language": "en",
+                "target_language": "pl",
+                "word": "hello",
+                "translation": "witaj",
+            },
+            headers={"X-Requested-With": "XMLHttpRequest"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("primary_pin", response.cookies)
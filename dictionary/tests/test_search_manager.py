@@ -0,0 +1,535 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from asgiref.sync import async_to_sync
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from dictionary.cache import TranslationCache, create_translation_cache
+from dictionary.circuit_breaker import CircuitBreaker
+from dictionary.clients import TranslatorClientRegistry
+from dictionary.languages import get_language_registry, reset_language_registry
+from dictionary.models import Dictionary, Language, Translation, User, Word
+from dictionary.search_manager import (
+    CachedTranslation,
+    DatabaseTranslation,
+    DictionaryAPITranslation,
+    TextAPITranslation,
+    TranslationStrategy,
+    TranslationUnavailable,
+    Translator,
+)
+from dictionary.tests.fake_translator import FakeTranslatorServer
+
+
+class FakeStrategy(TranslationStrategy):
+    def __init__(self, translations):
+        self.translations = translations
+        self.calls = 0
+
+    def query_translation(self, word, from_lang, to_lang, user=None):
+        self.calls += 1
+        return self.translations
+
+    def create_templated_translations(
+        self, word, from_lang, to_lang, translations, user
+    ):
+        return [{"text": text} for text in translations]
+
+
+def create_cache(timeout=60, max_entries=100, negative_timeout=60):
+    backend = LocMemCache(
+        "test", {"TIMEOUT": timeout, "OPTIONS": {"MAX_ENTRIES": max_entries}}
+    )
+    return TranslationCache(backend, timeout, negative_timeout)
+
+
+class CachedTranslationTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = create_cache()
+        self.cache.clear()
+        self.user = MagicMock()
+
+    def test_repeated_lookup_served_from_cache(self):
+        strategy = FakeStrategy(["привіт"])
+        cached = CachedTranslation(strategy, self.cache)
+
+        first = cached.translate("hello", "en", "uk", self.user)
+        second = cached.translate("hello", "en", "uk", self.user)
+
+        self.assertEqual(first, [{"text": "привіт"}])
+        self.assertEqual(second, first)
+        self.assertEqual(strategy.calls, 1)
+        self.assertEqual(
+            self.cache.get_stats(),
+            {"FakeStrategy": {"hits": 1, "negative_hits": 0, "misses": 1}},
+        )
+
+    def test_language_pair_is_part_of_key(self):
+        strategy = FakeStrategy(["привіт"])
+        cached = CachedTranslation(strategy, self.cache)
+
+        cached.translate("hello", "en", "uk", self.user)
+        cached.translate("hello", "en", "de", self.user)
+
+        self.assertEqual(strategy.calls, 2)
+
+    def test_empty_result_cached_as_negative(self):
+        strategy = FakeStrategy([])
+        cached = CachedTranslation(strategy, self.cache)
+
+        cached.translate("qwerty", "en", "uk", self.user)
+        translations = cached.translate(" Qwerty ", "en", "uk", self.user)
+
+        self.assertEqual(translations, [])
+        self.assertEqual(strategy.calls, 1)
+        self.assertEqual(self.cache.get_stats()["FakeStrategy"]["negative_hits"], 1)
+
+    def test_negative_result_expires_before_positive(self):
+        cache = create_cache(timeout=60, negative_timeout=0.05)
+        cache.clear()
+        strategy = FakeStrategy([])
+        cached = CachedTranslation(strategy, cache)
+        cache.set("FakeStrategy", "hello", "en", "uk", [{"text": "привіт"}])
+
+        cached.translate("qwerty", "en", "uk", self.user)
+        time.sleep(0.1)
+        cached.translate("qwerty", "en", "uk", self.user)
+
+        self.assertEqual(strategy.calls, 2)
+        self.assertIsNotNone(cache.get("FakeStrategy", "hello", "en", "uk"))
+
+    def test_transient_error_not_cached(self):
+        strategy = FakeStrategy([])
+        strategy.query_translation = MagicMock(side_effect=TranslationUnavailable)
+        cached = CachedTranslation(strategy, self.cache)
+
+        for _ in range(2):
+            with self.assertRaises(TranslationUnavailable):
+                cached.translate("hello", "en", "uk", self.user)
+
+        self.assertEqual(strategy.query_translation.call_count, 2)
+
+    def test_entry_expires_after_timeout(self):
+        cache = create_cache(timeout=0.05)
+        strategy = FakeStrategy(["привіт"])
+        cached = CachedTranslation(strategy, cache)
+
+        cached.translate("hello", "en", "uk", self.user)
+        time.sleep(0.1)
+        cached.translate("hello", "en", "uk", self.user)
+
+        self.assertEqual(strategy.calls, 2)
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = create_cache(max_entries=3)
+        for word in ("one", "two", "three"):
+            cache.set("FakeStrategy", word, "en", "uk", [{"text": word}])
+        cache.get("FakeStrategy", "one", "en", "uk")
+
+        cache.set("FakeStrategy", "four", "en", "uk", [{"text": "four"}])
+
+        self.assertIsNone(cache.get("FakeStrategy", "two", "en", "uk"))
+        self.assertIsNotNone(cache.get("FakeStrategy", "one", "en", "uk"))
+        self.assertIsNotNone(cache.get("FakeStrategy", "four", "en", "uk"))
+
+
+class CreateTranslationCacheTest(SimpleTestCase):
+    @override_settings(TRANSLATION_CACHE={"BACKEND": "lru", "TIMEOUT": 10})
+    def test_lru_backend(self):
+        cache = create_translation_cache()
+
+        self.assertIsInstance(cache.backend, LocMemCache)
+        self.assertEqual(cache.timeout, 10)
+
+    @override_settings(TRANSLATION_CACHE={"BACKEND": "unknown"})
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            create_translation_cache()
+
+
+class TranslatorTest(SimpleTestCase):
+    def test_unavailable_strategy_skipped(self):
+        unavailable = FakeStrategy([])
+        unavailable.query_translation = MagicMock(side_effect=TranslationUnavailable)
+        fallback = FakeStrategy(["привіт"])
+        translator = Translator([unavailable, fallback])
+
+        data = translator.translate("hello", "en", "uk", MagicMock())
+
+        self.assertEqual(data["translations"], [{"text": "привіт"}])
+
+
+class DictionaryAPITranslationTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeTranslatorServer().start()
+        self.addCleanup(self.server.stop)
+        self.registry = TranslatorClientRegistry("key", self.server.endpoint)
+        self.addCleanup(self.registry.close)
+        patch(
+            "dictionary.search_manager.get_client_registry", return_value=self.registry
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_word_without_entry(self):
+        self.server.unknown_words.add("qwerty")
+
+        translations = DictionaryAPITranslation().query_translation(
+            "qwerty", "en", "uk"
+        )
+
+        self.assertEqual(translations, [])
+
+    def test_rejected_word(self):
+        self.server.status = 400
+
+        translations = DictionaryAPITranslation().query_translation(
+            "qwerty", "en", "uk"
+        )
+
+        self.assertEqual(translations, [])
+
+    def test_server_error_is_transient(self):
+        self.server.status = 503
+
+        with self.assertRaises(TranslationUnavailable):
+            DictionaryAPITranslation().query_translation("hello", "en", "uk")
+
+    def test_rejected_credentials_and_quota_are_failures(self):
+        for status in (401, 403, 429):
+            self.server.status = status
+            breaker = CircuitBreaker("DictionaryAPITranslation", failure_threshold=5)
+
+            with self.subTest(status=status):
+                with self.assertRaises(TranslationUnavailable):
+                    DictionaryAPITranslation(breaker).query_translation(
+                        "hello", "en", "uk"
+                    )
+                self.assertEqual(breaker.get_stats()["failures"], 1)
+
+    def test_failure_not_cached(self):
+        self.server.status = 403
+        cache = create_cache()
+        cache.clear()
+        strategy = CachedTranslation(DictionaryAPITranslation(), cache)
+
+        with self.assertRaises(TranslationUnavailable):
+            strategy.translate("hello", "en", "uk", None)
+
+        self.assertIsNone(cache.get(strategy.name, "hello", "en", "uk"))
+
+    @override_settings(DICTIONARY_LOOKUP_BATCH={"WINDOW": 0.1, "MAX_SIZE": 10})
+    @patch("dictionary.search_manager.save_approved_translations")
+    async def test_concurrent_async_lookups_batched(self, save_approved_translations):
+        strategy = DictionaryAPITranslation()
+        words = ["cat", "dog", "bird"]
+
+        results = await asyncio.gather(
+            *(strategy.atranslate(word, "en", "uk", None) for word in words)
+        )
+        await self.registry.aclose()
+
+        self.assertEqual(
+            [result[0]["text"] for result in results], ["tac", "god", "drib"]
+        )
+        self.assertEqual(self.server.count_requests("/dictionary/lookup"), 1)
+
+    @override_settings(DICTIONARY_LOOKUP_BATCH={"WINDOW": 0.1, "MAX_SIZE": 10})
+    def test_failed_batch_recorded_once(self):
+        self.server.status = 503
+        breaker = CircuitBreaker("DictionaryAPITranslation", failure_threshold=2)
+        strategy = DictionaryAPITranslation(breaker)
+        words = ["cat", "dog", "bird"]
+
+        with ThreadPoolExecutor(max_workers=len(words)) as executor:
+            futures = [
+                executor.submit(strategy.query_translation, word, "en", "uk")
+                for word in words
+            ]
+            for future in futures:
+                with self.assertRaises(TranslationUnavailable):
+                    future.result()
+
+        self.assertEqual(breaker.get_stats()["failures"], 1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @override_settings(DICTIONARY_LOOKUP_BATCH={"WINDOW": 0.1, "MAX_SIZE": 10})
+    @patch("dictionary.search_manager.save_approved_translations")
+    def test_rejected_word_does_not_empty_batch(self, save_approved_translations):
+        self.server.rejected_words.add("qwerty")
+        cache = create_cache()
+        cache.clear()
+        strategy = CachedTranslation(DictionaryAPITranslation(), cache)
+        words = ["cat", "qwerty", "dog"]
+
+        with ThreadPoolExecutor(max_workers=len(words)) as executor:
+            results = list(
+                executor.map(
+                    lambda word: strategy.translate(word, "en", "uk", None), words
+                )
+            )
+
+        self.assertEqual(
+            [[item["text"] for item in result] for result in results],
+            [["tac"], [], ["god"]],
+        )
+        self.assertEqual(self.server.count_requests("/dictionary/lookup"), 4)
+        self.assertEqual(cache.get(strategy.name, "qwerty", "en", "uk"), [])
+        self.assertTrue(cache.get(strategy.name, "cat", "en", "uk"))
+
+    @override_settings(DICTIONARY_LOOKUP_BATCH={"WINDOW": 0.1, "MAX_SIZE": 10})
+    async def test_failed_async_batch_recorded_once(self):
+        self.server.status = 503
+        breaker = CircuitBreaker("DictionaryAPITranslation", failure_threshold=2)
+        strategy = DictionaryAPITranslation(breaker)
+
+        results = await asyncio.gather(
+            *(
+                strategy.aquery_translation(word, "en", "uk")
+                for word in ("cat", "dog", "bird")
+            ),
+            return_exceptions=True,
+        )
+        await self.registry.aclose()
+
+        self.assertTrue(
+            all(isinstance(result, TranslationUnavailable) for result in results)
+        )
+        self.assertEqual(breaker.get_stats()["failures"], 1)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @override_settings(DICTIONARY_LOOKUP_BATCH={"WINDOW": 0.1, "MAX_SIZE": 10})
+    @patch("dictionary.search_manager.save_approved_translations")
+    async def test_rejected_word_does_not_empty_async_batch(
+        self, save_approved_translations
+    ):
+        self.server.rejected_words.add("qwerty")
+        cache = create_cache()
+        cache.clear()
+        strategy = CachedTranslation(DictionaryAPITranslation(), cache)
+        words = ["cat", "qwerty", "dog"]
+
+        results = await asyncio.gather(
+            *(strategy.atranslate(word, "en", "uk", None) for word in words)
+        )
+        await self.registry.aclose()
+
+        self.assertEqual(
+            [[item["text"] for item in result] for result in results],
+            [["tac"], [], ["god"]],
+        )
+        self.assertEqual(cache.get(strategy.name, "qwerty", "en", "uk"), [])
+        self.assertTrue(cache.get(strategy.name, "cat", "en", "uk"))
+
+
+class AzureAPIResilienceTest(SimpleTestCase):
+    def setUp(self):
+        self.server = FakeTranslatorServer().start()
+        self.addCleanup(self.server.stop)
+        registry = TranslatorClientRegistry("key", self.server.endpoint, retry_total=0)
+        self.addCleanup(registry.close)
+        patch(
+            "dictionary.search_manager.get_client_registry", return_value=registry
+        ).start()
+        self.addCleanup(patch.stopall)
+        self.breaker = CircuitBreaker(
+            "TextAPITranslation", failure_threshold=2, reset_timeout=0.2
+        )
+        self.strategy = TextAPITranslation(self.breaker)
+
+    def test_rejected_word(self):
+        self.server.status = 400
+
+        translations = self.strategy.query_translation("qwerty", "en", "uk")
+
+        self.assertEqual(translations, [])
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    @override_settings(AZURE_TRANSLATOR_LATENCY_BUDGETS={"TextAPITranslation": 0.2})
+    def test_slow_response_exceeds_latency_budget(self):
+        self.server.latency = 1
+
+        start = time.monotonic()
+        with self.assertRaises(TranslationUnavailable):
+            self.strategy.query_translation("hello", "en", "uk")
+
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_open_circuit_fails_fast(self):
+        self.server.status = 503
+        for _ in range(2):
+            with self.assertRaises(TranslationUnavailable):
+                self.strategy.query_translation("hello", "en", "uk")
+
+        with self.assertRaises(TranslationUnavailable):
+            self.strategy.query_translation("hello", "en", "uk")
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.server.count_requests("/translate"), 2)
+
+    def test_half_open_probe_closes_circuit(self):
+        self.server.status = 503
+        for _ in range(2):
+            with self.assertRaises(TranslationUnavailable):
+                self.strategy.query_translation("hello", "en", "uk")
+        self.server.status = 200
+        time.sleep(0.2)
+
+        translations = self.strategy.query_translation("hello", "en", "uk")
+
+        self.assertEqual(translations[0].text, "olleh")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_translator_falls_back_to_database_results(self):
+        self.server.status = 503
+        database = FakeStrategy([])
+        translator = Translator([database, self.strategy])
+
+        for _ in range(3):
+            data = translator.translate("hello", "en", "uk", MagicMock())
+
+        self.assertEqual(data["translations"], [])
+        self.assertEqual(database.calls, 3)
+        self.assertEqual(self.server.count_requests("/translate"), 2)
+
+    async def test_async_open_circuit_fails_fast(self):
+        self.server.status = 503
+        for _ in range(3):
+            with self.assertRaises(TranslationUnavailable):
+                await self.strategy.aquery_translation("hello", "en", "uk")
+
+        self.assertEqual(self.server.count_requests("/translate"), 2)
+
+    async def test_async_cancelled_probe_released(self):
+        self.server.status = 503
+        for _ in range(2):
+            with self.assertRaises(TranslationUnavailable):
+                await self.strategy.aquery_translation("hello", "en", "uk")
+        await asyncio.sleep(0.2)
+
+        probe = asyncio.create_task(self.strategy.acall_api(asyncio.sleep, 10))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await probe
+
+        self.assertTrue(self.breaker.allow_request())
+
+
+class AsyncTranslatorTest(SimpleTestCase):
+    async def test_first_strategy_with_translations_wins(self):
+        empty = FakeStrategy([])
+        found = FakeStrategy(["привіт"])
+        unused = FakeStrategy(["hi"])
+        translator = Translator([empty, found, unused])
+
+        data = await translator.atranslate("hello", "en", "uk", MagicMock())
+
+        self.assertEqual(data["translations"], [{"text": "привіт"}])
+        self.assertEqual((empty.calls, found.calls, unused.calls), (1, 1, 0))
+
+    async def test_cached_translation(self):
+        cache = create_cache()
+        cache.clear()
+        strategy = FakeStrategy(["привіт"])
+        cached = CachedTranslation(strategy, cache)
+
+        await cached.atranslate("hello", "en", "uk", MagicMock())
+        translations = await cached.atranslate("hello", "en", "uk", MagicMock())
+
+        self.assertEqual(translations, [{"text": "привіт"}])
+        self.assertEqual(strategy.calls, 1)
+
+
+class DatabaseTranslationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        hello = Word.objects.create(word="hello", language=english)
+        Translation.objects.create(
+            from_word=hello,
+            to_word=Word.objects.create(word="привіт", language=ukrainian),
+            is_approved=True,
+        )
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=english, target_language=ukrainian
+        )
+        self.dictionary.add_translation("hello", "здрастуйте")
+        self.english, self.ukrainian = english, ukrainian
+
+    def test_sync_and_async_results_match(self):
+        strategy = DatabaseTranslation()
+
+        translations = strategy.translate("hello", "en", "uk", self.user)
+        async_translations = async_to_sync(strategy.atranslate)(
+            "hello", "en", "uk", self.user
+        )
+
+        self.assertEqual(translations, async_translations)
+        self.assertEqual(
+            [(item["text"], item["user_translation"]) for item in translations],
+            [("привіт", False), ("здрастуйте", True)],
+        )
+
+    async def test_async_translation_loads_language_registry(self):
+        reset_language_registry()
+
+        translations = await DatabaseTranslation().atranslate(
+            "hello", "en", "uk", self.user
+        )
+
+        self.assertEqual(
+            [(item["text"], item["user_translation"]) for item in translations],
+            [("привіт", False), ("здрастуйте", True)],
+        )
+
+    def test_approved_translation_in_user_dictionary(self):
+        translation = Translation.objects.get(to_word__word="привіт")
+        self.dictionary.translations.add(translation)
+
+        translations = DatabaseTranslation().translate("hello", "en", "uk", self.user)
+
+        self.assertEqual(
+            [(item["text"], item["user_translation"]) for item in translations],
+            [("привіт", True), ("здрастуйте", True)],
+        )
+
+    def test_other_users_translations_excluded(self):
+        other_user = User.objects.create_user(email="other@gmail.com", password="1")
+
+        translations = DatabaseTranslation().translate("hello", "en", "uk", other_user)
+
+        self.assertEqual(
+            [(item["text"], item["user_translation"]) for item in translations],
+            [("привіт", False)],
+        )
+
+    def test_deleted_dictionary_translations_excluded(self):
+        Dictionary.objects.filter(pk=self.dictionary.pk).update(
+            deleted_at=timezone.now()
+        )
+
+        translations = DatabaseTranslation().translate("hello", "en", "uk", self.user)
+
+        self.assertEqual(
+            [(item["text"], item["user_translation"]) for item in translations],
+            [("привіт", False)],
+        )
+
+    def test_query_count_does_not_depend_on_translations(self):
+        for i in range(30):
+            self.dictionary.add_translation("hello", f"переклад{i}")
+            self.dictionary.add_translation(f"word{i}", f"слово{i}")
+        get_language_registry()
+
+        with self.assertNumQueries(1):
+            translations = DatabaseTranslation().translate(
+                "hello", "en", "uk", self.user
+            )
+
+        self.assertEqual(len(translations), 32)
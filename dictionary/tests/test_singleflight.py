@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from dictionary.search_manager import TranslationStrategy, Translator
+from dictionary.singleflight import AsyncSingleFlight, CacheFlightLock, SingleFlight
+
+
+class SlowStrategy(TranslationStrategy):
+    def __init__(self, per_user=False, delay=0.1):
+        self.per_user = per_user
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def query_translation(self, word, from_lang, to_lang, user=None):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [word[::-1]]
+
+    async def aquery_translation(self, word, from_lang, to_lang, user=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [word[::-1]]
+
+    def create_templated_translations(
+        self, word, from_lang, to_lang, translations, user
+    ):
+        return [{"text": text} for text in translations]
+
+
+class SingleFlightTest(SimpleTestCase):
+    def run_concurrently(self, func, count=10):
+        barrier = threading.Barrier(count)
+
+        def call():
+            barrier.wait()
+            return func()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(call) for _ in range(count)]
+        return futures
+
+    def test_concurrent_calls_coalesced(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        futures = self.run_concurrently(lambda: flight.do("key", work))
+
+        self.assertEqual([future.result() for future in futures], ["result"] * 10)
+        self.assertEqual(len(calls), 1)
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight()
+
+        def work():
+            time.sleep(0.1)
+            raise RuntimeError("API is down")
+
+        futures = self.run_concurrently(lambda: flight.do("key", work))
+
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result()
+
+    def test_sequential_calls_not_coalesced(self):
+        flight = SingleFlight()
+        work = MagicMock(return_value="result")
+
+        flight.do("key", work)
+        flight.do("key", work)
+
+        self.assertEqual(work.call_count, 2)
+
+    def test_cross_worker_lock(self):
+        cache = LocMemCache("singleflight", {})
+        worker1 = SingleFlight(CacheFlightLock(cache, poll_interval=0.01))
+        worker2 = SingleFlight(CacheFlightLock(cache, poll_interval=0.01))
+        shared_result = {}
+        calls = []
+
+        def work():
+            calls.append(1)
+            if "value" not in shared_result:
+                time.sleep(0.1)
+                shared_result["value"] = "result"
+            return shared_result["value"]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(worker1.do, "key", work)
+            time.sleep(0.02)
+            second = executor.submit(worker2.do, "key", work)
+            self.assertEqual(first.result(), "result")
+            self.assertEqual(second.result(), "result")
+
+        # The second worker waited for the lock and found the shared result
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(cache.get(worker1.lock.make_key("key")))
+
+
+class AsyncSingleFlightTest(SimpleTestCase):
+    async def test_concurrent_calls_coalesced(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(10)])
+
+        self.assertEqual(results, ["result"] * 10)
+        self.assertEqual(len(calls), 1)
+
+    async def test_error_reaches_every_waiter(self):
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("API is down")
+
+        results = await asyncio.gather(
+            *[flight.do("key", work) for _ in range(3)], return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        self.assertEqual(await waiter, "result")
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(len(calls), 1)
+
+
+class TranslatorSingleFlightTest(SimpleTestCase):
+    def run_concurrently(self, translator, count=5):
+        barrier = threading.Barrier(count)
+
+        def call():
+            barrier.wait()
+            return translator.translate("hello", "en", "uk", MagicMock())
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(call) for _ in range(count)]
+        return [future.result() for future in futures]
+
+    def test_shared_strategy_coalesced(self):
+        strategy = SlowStrategy()
+
+        results = self.run_concurrently(Translator([strategy]))
+
+        self.assertEqual(strategy.calls, 1)
+        for result in results:
+            self.assertEqual(result["translations"], [{"text": "olleh"}])
+
+    def test_per_user_strategy_not_coalesced(self):
+        strategy = SlowStrategy(per_user=True)
+
+        self.run_concurrently(Translator([strategy]))
+
+        self.assertEqual(strategy.calls, 5)
+
+    async def test_async_shared_strategy_coalesced(self):
+        strategy = SlowStrategy()
+        translator = Translator([strategy])
+
+        results = await asyncio.gather(
+            *[translator.atranslate("hello", "en", "uk", MagicMock()) for _ in range(5)]
+        )
+
+        self.assertEqual(strategy.calls, 1)
+        self.assertEqual(results[0]["translations"], [{"text": "olleh"}])
@@ -0,0 +1,105 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from dictionary import suggestions
+from dictionary.models import Dictionary, Language, User, Word
+from dictionary.suggestions import PrefixIndex, get_suggestions
+
+SUGGESTION_SETTINGS = {"REFRESH_INTERVAL": 60, "MAX_AGE": 600, "MERGE_SIZE": 10000}
+
+
+class PrefixIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex(["help", "hello", "hell", "apple", "привіт", "при"])
+
+    def test_words_with_prefix(self):
+        self.assertEqual(self.index.search("hel"), ["hell", "hello", "help"])
+        self.assertEqual(self.index.search("пр"), ["при", "привіт"])
+        self.assertEqual(self.index.search("x"), [])
+
+    def test_limit(self):
+        self.assertEqual(self.index.search("h", limit=2), ["hell", "hello"])
+
+    def test_added_words(self):
+        self.index.add(["helm", "hello", "a"])
+
+        self.assertEqual(self.index.search("hel"), ["hell", "hello", "helm", "help"])
+        self.assertEqual(len(self.index), 8)
+        self.assertIn("helm", self.index)
+
+    def test_added_words_merged(self):
+        index = PrefixIndex(["b", "d"], merge_size=2)
+
+        index.add(["c"])
+        index.add(["a", "e"])
+
+        self.assertEqual(index._recent, [])
+        self.assertEqual(index.search(""), ["a", "b", "c", "d", "e"])
+
+
+@override_settings(WORD_SUGGESTIONS=SUGGESTION_SETTINGS)
+class SuggestionsTest(TestCase):
+    def setUp(self):
+        suggestions._languages.clear()
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=self.english, target_language=self.ukrainian
+        )
+        Word.objects.bulk_create(
+            Word(word=word, language=self.english) for word in ("hello", "help", "cat")
+        )
+
+    def test_loaded_once(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(get_suggestions(self.english.id, "he"), ["hello", "help"])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_suggestions(self.english.id, "c"), ["cat"])
+
+    def test_created_words_added(self):
+        get_suggestions(self.english.id, "he")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dictionary.add_translation("helm", "кермо")
+            self.dictionary.add_translations([("hell", "пекло")])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_suggestions(self.english.id, "he"),
+                ["hell", "hello", "helm", "help"],
+            )
+
+    @override_settings(WORD_SUGGESTIONS={**SUGGESTION_SETTINGS, "REFRESH_INTERVAL": 0})
+    def test_words_of_other_workers_read(self):
+        get_suggestions(self.english.id, "he")
+        # Created by another worker, the index of this one is not told
+        Word.objects.bulk_create([Word(word="helm", language=self.english)])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                get_suggestions(self.english.id, "he"), ["hello", "helm", "help"]
+            )
+
+    def test_view(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse("suggest"), {"prefix": " He", "language": "en", "limit": 1}
+        )
+
+        self.assertEqual(response.json(), {"suggestions": ["hello"]})
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_view_invalid_request(self):
+        self.client.force_login(self.user)
+
+        for params in (
+            {"prefix": "he", "language": "xx"},
+            {"prefix": "he", "language": "en", "limit": "ten"},
+            {"prefix": "he", "language": "en", "limit": 0},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(reverse("suggest"), params)
+
+                self.assertEqual(response.status_code, 400)
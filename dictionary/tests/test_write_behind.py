@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from dictionary.languages import get_language_registry
+from dictionary.models import Language, Translation, Word
+from dictionary.search_manager import DictionaryAPITranslation
+from dictionary.write_behind import TranslationWriteBuffer
+
+
+class FakeDictionaryTranslation:
+    def __init__(self, text):
+        self.normalized_target = text
+        self.pos_tag = "NOUN"
+        self.prefix_word = ""
+
+
+class TranslationWriteBufferTest(TestCase):
+    def setUp(self):
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.buffer = TranslationWriteBuffer(autostart=False)
+
+    def test_flush_creates_approved_translations(self):
+        self.buffer.add("Hello", "en", "uk", ["привіт", "здрастуйте"])
+        self.buffer.add("cat", "en", "uk", ["кіт"])
+
+        created = self.buffer.flush()
+
+        self.assertEqual(created, 3)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertCountEqual(
+            Translation.objects.filter(is_approved=True).values_list(
+                "from_word__word", "to_word__word"
+            ),
+            [("hello", "привіт"), ("hello", "здрастуйте"), ("cat", "кіт")],
+        )
+
+    def test_existing_rows_reused(self):
+        hello = Word.objects.create(word="hello", language=self.english)
+        Translation.objects.create(
+            from_word=hello,
+            to_word=Word.objects.create(word="привіт", language=self.ukrainian),
+            is_approved=True,
+        )
+        self.buffer.add("hello", "en", "uk", ["привіт", "вітаю"])
+
+        self.buffer.flush()
+
+        self.assertEqual(Word.objects.count(), 3)
+        self.assertEqual(Translation.objects.count(), 2)
+
+    def test_flush_query_count_does_not_depend_on_size(self):
+        get_language_registry()
+        self.buffer.add("word0", "en", "uk", ["слово0"])
+        with CaptureQueriesContext(connection) as small:
+            self.buffer.flush()
+
+        for i in range(1, 100):
+            self.buffer.add(f"word{i}", "en", "uk", [f"слово{i}", f"переклад{i}"])
+        with CaptureQueriesContext(connection) as large:
+            self.buffer.flush()
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(Translation.objects.count(), 199)
+
+    def test_unknown_language_skipped(self):
+        self.buffer.add("hello", "en", "xx", ["hallo"])
+
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_stop_flushes_background_buffer(self):
+        buffer = TranslationWriteBuffer(flush_interval=60)
+
+        with patch.object(buffer, "flush") as flush:
+            buffer.add("hello", "en", "uk", ["привіт"])
+            buffer.stop()
+
+        flush.assert_called()
+        self.assertIsNone(buffer._thread)
+
+
+@override_settings(
+    TRANSLATION_WRITE_BEHIND={"ENABLED": True, "FLUSH_INTERVAL": 1, "MAX_SIZE": 500}
+)
+class DictionaryAPIPersistenceTest(TestCase):
+    def setUp(self):
+        Language.objects.create(code="en", name="English")
+        Language.objects.create(code="uk", name="Ukrainian")
+        self.buffer = TranslationWriteBuffer(autostart=False)
+        patch(
+            "dictionary.write_behind.get_write_buffer", return_value=self.buffer
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def create_templated_translations(self, count):
+        translations = [FakeDictionaryTranslation(f"слово{i}") for i in range(count)]
+        with CaptureQueriesContext(connection) as queries:
+            DictionaryAPITranslation().create_templated_translations(
+                "word", "en", "uk", translations, None
+            )
+        return queries
+
+    def test_no_queries_on_request_path(self):
+        for count in (1, 50):
+            self.assertEqual(len(self.create_templated_translations(count)), 0)
+
+        self.assertEqual(self.buffer.flush(), 50)
@@ -2,11 +2,12 @@ from pathlib import Path
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import NoReverseMatch, reverse
 
+from dictionary import fuzzy
 from dictionary.forms import LoginForm
-from dictionary.models import User
+from dictionary.models import Dictionary, Language, User
 from dictionary.views import TranslationView
 
 
@@ -164,7 +165,7 @@ class TranslationViewTest(TestCase):
         self.url = reverse("translation")
         self.params = {"from_language": "en", "to_language": "uk", "body": "Hello"}
         self.headers = {"X-Requested-With": "XMLHttpRequest"}
-        self.trans_api = patch("dictionary.views.translate").start()
+        self.trans_api = patch("dictionary.views.atranslate").start()
         self.trans_api.return_value = self.get_translations()
         self.addCleanup(patch.stopall)
         self.request_factory = RequestFactory()
@@ -207,3 +208,213 @@ class TranslationViewTest(TestCase):
         view = TranslationView()
 
         self.assertFalse(view.is_ajax(request))
+
+    def test_post_request_not_authenticated(self):
+        self.client.logout()
+        response = self.client.post(
+            self.url,
+            data=self.params,
+            headers=self.headers,
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.trans_api.assert_not_called()
+
+
+class AddWordViewTest(TestCase):
+    def setUp(self):
+        self.url = reverse("add_word_to_dictionary")
+        self.headers = {"X-Requested-With": "XMLHttpRequest"}
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.english = Language.objects.create(code="en", name="English")
+        self.ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.client.force_login(self.user)
+        self.params = {
+            "source_language": "en",
+            "target_language": "uk",
+            "word": "Hello",
+            "translation": "Привіт",
+        }
+
+    def test_word_added_to_dictionary(self):
+        dictionary = Dictionary.objects.create(
+            user=self.user,
+            source_language=self.english,
+            target_language=self.ukrainian,
+        )
+
+        response = self.client.post(
+            self.url,
+            data=self.params,
+            headers=self.headers,
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        translation = dictionary.translations.get()
+        self.assertEqual(translation.from_word.word, "hello")
+        self.assertEqual(translation.to_word.word, "привіт")
+
+    def test_dictionary_does_not_exist(self):
+        response = self.client.post(
+            self.url,
+            data=self.params,
+            headers=self.headers,
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class AddWordsViewTest(TestCase):
+    def setUp(self):
+        self.url = reverse("add_words_to_dictionary")
+        self.headers = {"X-Requested-With": "XMLHttpRequest"}
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        english = Language.objects.create(code="en", name="English")
+        ukrainian = Language.objects.create(code="uk", name="Ukrainian")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user, source_language=english, target_language=ukrainian
+        )
+        self.client.force_login(self.user)
+        self.params = {
+            "source_language": "en",
+            "target_language": "uk",
+            "words": [
+                {"word": "Hello", "translation": " Привіт"},
+                {"word": "cat", "translation": "кіт"},
+            ],
+        }
+
+    def post(self, data):
+        return self.client.post(
+            self.url, data=data, headers=self.headers, content_type="application/json"
+        )
+
+    def test_words_added_to_dictionary(self):
+        response = self.post(self.params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"added": 2})
+        self.assertCountEqual(
+            self.dictionary.translations.values_list(
+                "from_word__word", "to_word__word"
+            ),
+            [("hello", "привіт"), ("cat", "кіт")],
+        )
+
+    def test_dictionary_does_not_exist(self):
+        response = self.post({**self.params, "target_language": "pl"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_words(self):
+        for words in (
+            [],
+            [{"word": "cat"}],
+            [{"word": "cat", "translation": " "}],
+            "cat",
+        ):
+            with self.subTest(words=words):
+                response = self.post({**self.params, "words": words})
+
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.dictionary.translations.exists())
+
+    @patch("dictionary.views.AddWordsView.max_words", 1)
+    def test_too_many_words(self):
+        response = self.post(self.params)
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(
+    STORAGES={
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        }
+    }
+)
+class DictionaryViewTest(TestCase):
+    def setUp(self):
+        # Indexes of dictionaries of other tests, their ids are reused
+        fuzzy._indexes.clear()
+        self.user = User.objects.create_user(email="test@gmail.com", password="12345")
+        self.dictionary = Dictionary.objects.create(
+            user=self.user,
+            source_language=Language.objects.create(code="en", name="English"),
+            target_language=Language.objects.create(code="uk", name="Ukrainian"),
+        )
+        for number in range(30):
+            self.dictionary.add_translation(f"word{number:02}", f"слово{number:02}")
+        self.url = reverse("dictionary", args=["en", "uk"])
+        self.headers = {"HX-Request": "true"}
+        self.client.force_login(self.user)
+
+    def test_pages_follow_cursor(self):
+        response = self.client.get(self.url, headers=self.headers)
+
+        self.assertEqual(len(response.context["translations"]), 25)
+        cursor = response.context["next_cursor"]
+        self.assertContains(response, f'"cursor": "{cursor}"')
+
+        response = self.client.get(self.url, {"cursor": cursor}, headers=self.headers)
+
+        words = [group.from_word for group in response.context["translations"]]
+        self.assertEqual(words, [f"word{number}" for number in range(25, 30)])
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertNotContains(response, "hx-trigger")
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            self.url, {"cursor": "not a cursor"}, headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_newest_first(self):
+        response = self.client.get(self.url, {"sort": "newest"}, headers=self.headers)
+
+        words = [group.from_word for group in response.context["translations"]]
+        self.assertEqual(words[:2], ["word29", "word28"])
+        self.assertContains(response, '"sort": "newest"')
+
+        cursor = response.context["next_cursor"]
+        response = self.client.get(
+            self.url, {"sort": "newest", "cursor": cursor}, headers=self.headers
+        )
+
+        words = [group.from_word for group in response.context["translations"]]
+        self.assertEqual(words, [f"word{number:02}" for number in range(4, -1, -1)])
+
+    def test_invalid_sort(self):
+        response = self.client.get(self.url, {"sort": "random"}, headers=self.headers)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_alphabetical_cursor_rejected_by_recency(self):
+        response = self.client.get(self.url, headers=self.headers)
+
+        response = self.client.get(
+            self.url,
+            {"sort": "oldest", "cursor": response.context["next_cursor"]},
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_similar_words_shown_without_exact_match(self):
+        response = self.client.get(self.url, {"word": "wird07"}, headers=self.headers)
+
+        self.assertTrue(response.context["similar"])
+        self.assertEqual(response.context["translations"][0].from_word, "word07")
+        self.assertContains(response, "No exact matches")
+
+    def test_exact_match_preferred(self):
+        response = self.client.get(self.url, {"word": "word07"}, headers=self.headers)
+
+        self.assertFalse(response.context["similar"])
+        self.assertEqual(
+            [group.from_word for group in response.context["translations"]], ["word07"]
+        )
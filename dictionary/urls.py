@@ -5,11 +5,32 @@ from dictionary import views
 urlpatterns = [
     path("", views.IndexView.as_view(), name="home"),
     path("translate/", views.TranslationView.as_view(), name="translation"),
+    path("translate/suggest/", views.SuggestionView.as_view(), name="suggest"),
     path(
         "dictionary/<str:source>-<str:target>",
         views.DictionaryView.as_view(),
         name="dictionary",
     ),
+    path(
+        "dictionary/<str:source>-<str:target>/export/<str:format>",
+        views.ExportDictionaryView.as_view(),
+        name="export_dictionary",
+    ),
+    path(
+        "dictionary/<str:source>-<str:target>/import",
+        views.ImportDictionaryView.as_view(),
+        name="import_dictionary",
+    ),
+    path(
+        "dictionary/<str:source>-<str:target>/review",
+        views.ReviewView.as_view(),
+        name="review",
+    ),
+    path(
+        "dictionary/import/<int:pk>",
+        views.ImportJobView.as_view(),
+        name="import_job",
+    ),
     path(
         "dictionary/create",
         views.CreateDictionaryView.as_view(),
@@ -25,6 +46,11 @@ urlpatterns = [
         views.AddWordView.as_view(),
         name="add_word_to_dictionary",
     ),
+    path(
+        "dictionary/add-words/",
+        views.AddWordsView.as_view(),
+        name="add_words_to_dictionary",
+    ),
     path("profile/", views.ProfileView.as_view(), name="profile"),
     path("account/delete/", views.DeleteAccountView.as_view(), name="delete_account"),
     path(
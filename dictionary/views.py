@@ -1,14 +1,26 @@
 import json
+from datetime import datetime
 from pathlib import Path
 
+from django.conf import settings
+from django.contrib.auth import logout
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages import add_message
 from django.contrib.messages import constants as messages
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import BadRequest, ObjectDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
 from django.db import IntegrityError
-from django.db.models import Q
-from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, render
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import content_disposition_header
+from django.utils.text import compress_sequence
 from django.views import View
 from django.views.generic import (
     CreateView,
@@ -17,16 +29,34 @@ from django.views.generic import (
     RedirectView,
     TemplateView,
 )
-from django_htmx.http import HttpResponseClientRedirect
-
-from dictionary.forms import DictionaryForm
-from dictionary.models import Dictionary
-from dictionary.search_manager import translate
-from wordnest.shortcuts import group_translations_by_from_word, normalize_string
+from django_htmx.http import HttpResponseClientRedirect, trigger_client_event
+
+from dictionary.deletion import delete_account, delete_dictionary
+from dictionary.exporters import (
+    FORMATS,
+    acompress_sequence,
+    aiter_in_thread,
+    export_lines,
+    iter_chunks,
+)
+from dictionary.forms import DictionaryForm, ImportForm
+from dictionary.import_jobs import create_import_job, resume_stale_import_jobs
+from dictionary.languages import get_language_registry
+from dictionary.models import Dictionary, ImportJob
+from dictionary.reviews import Grade, ReviewSession
+from dictionary.search_manager import atranslate
+from dictionary.suggestions import get_suggestions
+from wordnest.shortcuts import (
+    decode_cursor,
+    encode_cursor,
+    normalize_string,
+    parse_accept_encoding,
+)
 
 
 class IndexView(TemplateView):
     template_name = Path("dictionary", "index.html")
+    replica_methods = ("GET", "HEAD")
 
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
@@ -70,17 +100,63 @@ class AJAXMixing:
         return request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
 
-class TranslationView(AJAXMixing, LoginRequiredMixin, View):
-    def post(self, request, *args, **kwargs):
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """
+    LoginRequiredMixin for views with async handlers.
+
+    The user is loaded with request.auser(), so the event loop is not blocked by the session lookup.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+class TranslationView(AJAXMixing, AsyncLoginRequiredMixin, View):
+    # Translating only reads, translations found by the API are saved by the primary database
+    replica_methods = ("POST",)
+
+    async def post(self, request, *args, **kwargs):
         data = json.loads(request.body.decode("utf-8"))
         word = normalize_string(data.get("body"))
         from_lang = normalize_string(data.get("from_language"))
         to_lang = normalize_string(data.get("to_language"))
-        user = request.user
-        translation = translate(word, from_lang, to_lang, user)
+        user = await request.auser()
+        translation = await atranslate(word, from_lang, to_lang, user)
         return JsonResponse(translation)
 
 
+class SuggestionView(LoginRequiredMixin, View):
+    """
+    Returns words of a language that start with the typed text.
+
+    The words come from the in-memory prefix index of the language (see dictionary.suggestions),
+    so the database is not queried on each keystroke.
+    """
+
+    max_limit = 10
+    replica_methods = ("GET", "HEAD")
+
+    def get(self, request, *args, **kwargs):
+        prefix = normalize_string(request.GET.get("prefix", ""))
+        language_id = get_language_registry().get_id(
+            normalize_string(request.GET.get("language", ""))
+        )
+        try:
+            limit = min(int(request.GET.get("limit", self.max_limit)), self.max_limit)
+        except ValueError:
+            return HttpResponseBadRequest()
+        if language_id is None or limit < 1:
+            return HttpResponseBadRequest()
+
+        suggestions = get_suggestions(language_id, prefix, limit) if prefix else []
+        response = JsonResponse({"suggestions": suggestions})
+        patch_cache_control(response, private=True, max_age=60)
+        return response
+
+
 class CreateDictionaryView(LoginRequiredMixin, CreateView):
     model = Dictionary
     form_class = DictionaryForm
@@ -100,8 +176,17 @@ class CreateDictionaryView(LoginRequiredMixin, CreateView):
 
 
 class DictionaryView(LoginRequiredMixin, ListView):
-    paginate_by = 25
-    paginate_orphans = 10
+    """
+    Shows the dictionary's translations grouped by source words, page by page.
+
+    Pages are selected by a cursor holding the key of the last source word of the previous page,
+    so the cost of a page does not depend on its position in the dictionary. Words are listed
+    alphabetically or by the time they were added (the `sort` parameter). When no word starts
+    with the searched text, the most similar words are shown instead.
+    """
+
+    page_size = 25
+    replica_methods = ("GET", "HEAD")
     template_name = "dictionary/dictionary.html"
     context_object_name = "translations"
 
@@ -110,13 +195,37 @@ class DictionaryView(LoginRequiredMixin, ListView):
         search = self.request.GET.get("word")
         if search:
             search = normalize_string(search)
-            queryset = self.dictionary.translations.filter(
-                Q(from_word__word__startswith=search)
-                | Q(to_word__word__startswith=search)
-            )
-        else:
-            queryset = self.dictionary.translations.all()
-        return group_translations_by_from_word(queryset)
+        self.order = self.request.GET.get("sort") or Dictionary.Order.ALPHABETICAL
+        if self.order not in Dictionary.Order.values:
+            raise BadRequest("Invalid sort order")
+        after = self.get_cursor_key()
+        translations, next_key = self.dictionary.get_translation_page(
+            search=search, after=after, size=self.page_size, order=self.order
+        )
+        self.next_cursor = encode_cursor(next_key) if next_key else None
+        # No word starts with the search, it may have a typo
+        self.similar = bool(search and after is None and not translations)
+        if self.similar:
+            translations = self.dictionary.search_similar(search, limit=self.page_size)
+        return translations
+
+    def get_cursor_key(self) -> tuple[str, int] | None:
+        cursor = self.request.GET.get("cursor")
+        if not cursor:
+            return None
+        try:
+            word, pk = decode_cursor(cursor)
+        except ValueError:
+            raise BadRequest("Invalid cursor")
+        if not isinstance(word, str) or not isinstance(pk, int):
+            raise BadRequest("Invalid cursor")
+        if self.order != Dictionary.Order.ALPHABETICAL:
+            # The key holds the time the word was added
+            try:
+                datetime.fromisoformat(word)
+            except ValueError:
+                raise BadRequest("Invalid cursor")
+        return word, pk
 
     def get_template_names(self):
         names = []
@@ -129,26 +238,191 @@ class DictionaryView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
         context_data["dictionary"] = self.dictionary
+        context_data["next_cursor"] = self.next_cursor
+        context_data["similar"] = self.similar
         context_data["query"] = self.request.GET.get("word", "")
+        context_data["sort"] = self.order
+        context_data["sort_orders"] = Dictionary.Order.choices
         context_data["title"] = "Dictionary"
+        context_data["export_formats"] = [
+            ("csv", "CSV"),
+            ("jsonl", "JSON Lines"),
+            ("anki", "Anki"),
+        ]
+        context_data["import_form"] = ImportForm()
         return context_data
 
     def get_object(self):
         source = self.kwargs.get("source")
         target = self.kwargs.get("target")
 
-        return get_object_or_404(
+        languages = get_language_registry()
+        dictionary = get_object_or_404(
             self.request.user.dictionaries,
-            source_language__code=source,
-            target_language__code=target,
+            source_language_id=languages.get_id(source),
+            target_language_id=languages.get_id(target),
+        )
+        # The templates show the languages, they are taken from the registry instead of the database
+        dictionary.source_language = languages.by_code[source].to_model()
+        dictionary.target_language = languages.by_code[target].to_model()
+        return dictionary
+
+
+class ExportDictionaryView(LoginRequiredMixin, View):
+    """
+    Streams the dictionary as a CSV, JSON Lines or Anki file.
+
+    The translations are read from a server-side cursor in chunks, so the memory used does not
+    depend on the size of the dictionary. Under ASGI the chunks are read in a thread one at a time
+    and sent as they are read. The file is compressed when the client accepts gzip.
+    An interrupted download is resumed with the `after` parameter: the export starts after
+    that source word.
+    """
+
+    chunk_size = 2000
+    replica_methods = ("GET", "HEAD")
+
+    def get(self, request, *args, **kwargs):
+        format = kwargs["format"]
+        if format not in FORMATS:
+            raise Http404("Unknown export format")
+        source, target = kwargs["source"], kwargs["target"]
+        languages = get_language_registry()
+        dictionary = get_object_or_404(
+            request.user.dictionaries,
+            source_language_id=languages.get_id(source),
+            target_language_id=languages.get_id(target),
+        )
+
+        groups = dictionary.iter_translation_groups(
+            chunk_size=self.chunk_size, after=request.GET.get("after") or None
+        )
+        content = iter_chunks(export_lines(groups, format))
+        if isinstance(request, ASGIRequest):
+            content = aiter_in_thread(content)
+        content_type, extension = FORMATS[format]
+        response = StreamingHttpResponse(
+            content, content_type=f"{content_type}; charset=utf-8"
+        )
+        if "gzip" in parse_accept_encoding(request.headers.get("Accept-Encoding", "")):
+            compress = acompress_sequence if response.is_async else compress_sequence
+            response.streaming_content = compress(response.streaming_content)
+            response.headers["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        response.headers["Content-Disposition"] = content_disposition_header(
+            True, f"wordnest-{source}-{target}.{extension}"
+        )
+        return response
+
+
+class ImportDictionaryView(LoginRequiredMixin, View):
+    """
+    Starts the import of an uploaded CSV, TSV, JSON Lines or Anki file into the dictionary.
+
+    The file is imported by a background thread (see dictionary.import_jobs), the response shows
+    the progress of the import, which HTMX polls until it ends.
+    """
+
+    template_name = "dictionary/import_job.html"
+
+    def post(self, request, *args, **kwargs):
+        languages = get_language_registry()
+        dictionary = get_object_or_404(
+            request.user.dictionaries,
+            source_language_id=languages.get_id(kwargs["source"]),
+            target_language_id=languages.get_id(kwargs["target"]),
+        )
+        form = ImportForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return render(request, self.template_name, {"form": form})
+        job = create_import_job(
+            dictionary, form.cleaned_data["file"], form.cleaned_data["format"]
         )
+        return render(request, self.template_name, {"job": job})
+
+
+class ImportJobView(LoginRequiredMixin, DetailView):
+    """
+    Shows the progress of an import, the "import-done" event is sent to HTMX when it succeeds.
+
+    A job whose worker stopped is resumed in the background, or fails if its file is gone,
+    so the page does not poll it forever.
+    """
+
+    template_name = "dictionary/import_job.html"
+    context_object_name = "job"
+
+    def get_queryset(self):
+        return self.request.user.import_jobs.all()
 
+    def render_to_response(self, context, **response_kwargs):
+        if self.object.is_stale:
+            resume_stale_import_jobs()
+        response = super().render_to_response(context, **response_kwargs)
+        if self.object.status == ImportJob.Status.DONE:
+            trigger_client_event(response, "import-done")
+        return response
+
+
+class ReviewView(LoginRequiredMixin, View):
+    """
+    Shows the due translations of the dictionary one at a time and records the answers.
+
+    The cards are taken from the dictionary's due queue in batches and the answers to a batch
+    are written together, see dictionary.reviews.ReviewSession.
+    """
+
+    template_name = "dictionary/review.html"
+
+    def get(self, request, *args, **kwargs):
+        return self.render_card(self.get_review_session())
 
-class AddWordView(AJAXMixing, LoginRequiredMixin, View):
     def post(self, request, *args, **kwargs):
+        review = self.get_review_session()
+        try:
+            entry_id = int(request.POST["card"])
+            grade = int(request.POST["grade"])
+        except (KeyError, ValueError):
+            raise BadRequest("Invalid answer")
+        if grade not in Grade.values:
+            raise BadRequest("Invalid answer")
+        review.answer(entry_id, grade)
+        return self.render_card(review)
+
+    def get_review_session(self) -> ReviewSession:
+        source, target = self.kwargs["source"], self.kwargs["target"]
+        languages = get_language_registry()
+        self.dictionary = get_object_or_404(
+            self.request.user.dictionaries,
+            source_language_id=languages.get_id(source),
+            target_language_id=languages.get_id(target),
+        )
+        self.dictionary.source_language = languages.by_code[source].to_model()
+        self.dictionary.target_language = languages.by_code[target].to_model()
+        return ReviewSession(
+            self.request.session,
+            self.dictionary,
+            batch_size=settings.DICTIONARY_REVIEW["BATCH_SIZE"],
+        )
+
+    def render_card(self, review: ReviewSession):
+        context = {
+            "dictionary": self.dictionary,
+            "card": review.current(),
+            "grades": Grade.choices,
+            "title": "Review",
+        }
+        if self.request.htmx:
+            return render(self.request, "dictionary/review_card.html", context)
+        return render(self.request, self.template_name, context)
+
+
+class AddWordView(AJAXMixing, AsyncLoginRequiredMixin, View):
+    async def post(self, request, *args, **kwargs):
         data = json.loads(request.body.decode("utf-8"))
+        user = await request.auser()
         try:
-            request.user.add_word_to_dictionary(
+            await user.aadd_word_to_dictionary(
                 normalize_string(data["source_language"]),
                 normalize_string(data["target_language"]),
                 normalize_string(data["word"]),
@@ -159,11 +433,49 @@ class AddWordView(AJAXMixing, LoginRequiredMixin, View):
             return HttpResponseBadRequest()
 
 
+class AddWordsView(AJAXMixing, AsyncLoginRequiredMixin, View):
+    """
+    Adds a list of words to a dictionary.
+
+    The body is a JSON object with "source_language", "target_language" and "words",
+    a list of objects with "word" and "translation" keys.
+    """
+
+    max_words = 1000
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body.decode("utf-8"))
+            pairs = [
+                (normalize_string(item["word"]), normalize_string(item["translation"]))
+                for item in data["words"]
+            ]
+            source_language = normalize_string(data["source_language"])
+            target_language = normalize_string(data["target_language"])
+        except (ValueError, KeyError, TypeError):
+            return HttpResponseBadRequest()
+        if (
+            not pairs
+            or len(pairs) > self.max_words
+            or not all(all(pair) for pair in pairs)
+        ):
+            return HttpResponseBadRequest()
+
+        user = await request.auser()
+        try:
+            added = await user.aadd_words_to_dictionary(
+                source_language, target_language, pairs
+            )
+        except ObjectDoesNotExist:
+            return HttpResponseBadRequest()
+        return JsonResponse({"added": added})
+
+
 class DeleteDictionaryView(LoginRequiredMixin, View):
     def delete(self, request, *args, **kwargs):
         try:
             dictionary = get_object_or_404(request.user.dictionaries, pk=kwargs["pk"])
-            dictionary.delete()
+            delete_dictionary(dictionary)
             add_message(request, messages.SUCCESS, "Dictionary deleted.")
             return HttpResponse()
         except Http404:
@@ -173,6 +485,7 @@ class DeleteDictionaryView(LoginRequiredMixin, View):
 
 class ProfileView(LoginRequiredMixin, DetailView):
     context_object_name = "user"
+    replica_methods = ("GET", "HEAD")
     template_name = "account/profile.html"
 
     def get_object(self):
@@ -193,7 +506,8 @@ class DeleteAccountView(LoginRequiredMixin, RedirectView):
 
     def post(self, request, *args, **kwargs):
         try:
-            request.user.delete()
+            delete_account(request.user)
+            logout(request)
             if request.htmx:
                 response = HttpResponseClientRedirect(self.get_redirect_url())
             else:
@@ -212,10 +526,7 @@ class DeleteTranslationsView(LoginRequiredMixin, View):
             dictionary = get_object_or_404(
                 request.user.dictionaries, pk=kwargs["dict_pk"]
             )
-            word_trans = dictionary.translations.filter(
-                from_word=kwargs["from_word_id"]
-            )
-            dictionary.translations.remove(*word_trans)
+            dictionary.remove_word(kwargs["from_word_id"])
             add_message(request, messages.SUCCESS, "Translations deleted.")
             return HttpResponse()
         except Http404:
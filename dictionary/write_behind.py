@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from dictionary.languages import get_language_registry
+from dictionary.models import Translation, Word
+
+logger = logging.getLogger(__name__)
+
+
+def write_approved_translations(items: list[tuple[str, str, str, list[str]]]) -> int:
+    """
+    Save approved translations in bulk.
+
+    The number of queries depends on the number of language pairs, not on the number of translations.
+
+    Args:
+        items (list[tuple[str, str, str, list[str]]]): tuples of a word, its language code,
+                                                        the target language code and the translated words
+
+    Returns:
+        int: number of translations passed to the database
+    """
+    languages = get_language_registry()
+    pairs = defaultdict(lambda: defaultdict(set))
+    for word, source_code, target_code, texts in items:
+        if source_code in languages and target_code in languages:
+            pair = (languages.get_id(source_code), languages.get_id(target_code))
+            pairs[pair][word.lower()].update(text.lower() for text in texts)
+
+    translations = []
+    for (source_id, target_id), words in pairs.items():
+        if source_id == target_id:
+            continue
+        from_ids = Word.objects.get_or_create_ids(source_id, words)
+        to_ids = Word.objects.get_or_create_ids(
+            target_id, {text for texts in words.values() for text in texts}
+        )
+        translations.extend(
+            Translation(
+                from_word_id=from_ids[word], to_word_id=to_ids[text], is_approved=True
+            )
+            for word, texts in words.items()
+            for text in texts
+        )
+    Translation.objects.bulk_create(translations, ignore_conflicts=True)
+    return len(translations)
+
+
+class TranslationWriteBuffer:
+    """
+    Collects approved translations found by the API and saves them in bulk off the request path.
+
+    A background thread flushes the buffer every `flush_interval` seconds or as soon as it holds
+    `max_size` words. The buffer is flushed when the process exits, call stop() to flush it earlier.
+    """
+
+    def __init__(
+        self, flush_interval: float = 1.0, max_size: int = 500, autostart: bool = True
+    ):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.autostart = autostart
+        self._items = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add(self, word: str, source_code: str, target_code: str, texts: list[str]):
+        with self._lock:
+            self._items.append((word, source_code, target_code, list(texts)))
+            is_full = len(self._items) >= self.max_size
+            if self.autostart and self._thread is None:
+                self.start()
+        if is_full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Save the buffered translations.
+
+        Returns:
+            int: number of translations passed to the database
+        """
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._items, []
+            if not items:
+                return 0
+            try:
+                with transaction.atomic():
+                    return write_approved_translations(items)
+            except Exception:
+                logger.exception("Failed to save %s buffered translations", len(items))
+                return 0
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="translation-write-buffer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and flush the remaining translations.
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stopped.set()
+            self._wakeup.set()
+            thread.join()
+            self._thread = None
+            atexit.unregister(self.stop)
+        self.flush()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+
+_write_buffer = None
+_write_buffer_lock = threading.Lock()
+
+
+def get_write_buffer() -> TranslationWriteBuffer:
+    """
+    Return the write buffer of the process, creating it from settings on first use.
+    """
+    global _write_buffer
+    if _write_buffer is None:
+        with _write_buffer_lock:
+            if _write_buffer is None:
+                options = settings.TRANSLATION_WRITE_BEHIND
+                _write_buffer = TranslationWriteBuffer(
+                    flush_interval=options["FLUSH_INTERVAL"],
+                    max_size=options["MAX_SIZE"],
+                )
+    return _write_buffer
+
+
+def save_approved_translations(
+    word: str, source_code: str, target_code: str, texts: list[str]
+) -> None:
+    """
+    Save approved translations of the word, through the write buffer if write-behind is enabled.
+    """
+    if settings.TRANSLATION_WRITE_BEHIND["ENABLED"]:
+        get_write_buffer().add(word, source_code, target_code, texts)
+    else:
+        with transaction.atomic():
+            write_approved_translations([(word, source_code, target_code, texts)])
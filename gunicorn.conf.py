@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration of the WordNest web workers.
+
+The async Azure Translator clients of each worker are warmed up and closed on the worker's
+event loop by the ASGI lifespan handler (dictionary.lifespan). The hooks resume the imports
+interrupted by a restart when a worker starts, and close the sync clients, flush the translations
+buffered for saving and stop the imports before a worker exits.
+"""
+
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def post_worker_init(worker):
+    from dictionary.import_jobs import resume_stale_import_jobs
+
+    resume_stale_import_jobs()
+
+
+def worker_exit(server, worker):
+    from dictionary.clients import get_client_registry
+    from dictionary.import_jobs import stop_executor
+    from dictionary.write_behind import get_write_buffer
+
+    stop_executor()
+    get_write_buffer().stop()
+    get_client_registry().close()
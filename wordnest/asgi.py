@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wordnest.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after the setup of Django
+from dictionary.lifespan import LifespanMiddleware  # noqa: E402
+
+application = LifespanMiddleware(django_application)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+@contextmanager
+def read_from_replica():
+    """
+    Send the reads made inside the block to a replica, if there are replicas.
+
+    The flag is a context variable, so it follows the request into sync_to_async()
+    and async_to_sync() calls and does not leak into other requests.
+    """
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Routes reads of read-only views to the replicas of settings.DATABASE_REPLICAS.
+
+    Everything else, writes and reads outside of read_from_replica() blocks or inside
+    a transaction, goes to the default database. Replicas are copies of the default database,
+    so migrations only run on the default one.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            settings.DATABASE_REPLICAS
+            and _read_from_replica.get()
+            # Reads of a transaction that writes must see its writes
+            and not connections["default"].in_atomic_block
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -10,9 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import sys
+import tempfile
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 from django.urls import reverse_lazy
 import dj_database_url
 
@@ -64,6 +66,7 @@ MIDDLEWARE = [
     "allauth.account.middleware.AccountMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
     "dictionary.middleware.HtmxMessagesMiddleware",
+    "dictionary.middleware.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "wordnest.urls"
@@ -107,6 +110,40 @@ else:
         )  # Set DATABASE_URL environment variable on live server
     }
 
+# Number of web worker processes, gunicorn starts WEB_CONCURRENCY workers.
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=1, cast=int)
+
+# Cache shared by the worker processes. It announces changes of the languages and dictionaries
+# to every worker (LANGUAGE_REGISTRY, FUZZY_SEARCH) and holds the cross-worker locks. The default
+# local-memory cache is seen by its own process only, so with more than one worker set a shared
+# backend, e.g. django.core.cache.backends.db.DatabaseCache (after `manage.py createcachetable`).
+# The dictionary.E001 system check fails otherwise.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+# Read replicas of the default database, see wordnest.routers. Views that only read send their
+# queries to a random replica. After a write the user's requests stick to the primary database
+# for PRIMARY_PIN_SECONDS, so they see their own changes despite the replication lag.
+DATABASE_REPLICAS = []
+for number, url in enumerate(
+    config("DATABASE_REPLICA_URLS", default="", cast=Csv()), start=1
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = {**dj_database_url.parse(url), "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+# A mirror of the default database for the tests of the routing to a replica, only defined
+# when the tests run (`manage.py test`) and only used by them (it is not in DATABASE_REPLICAS)
+if sys.argv[1:2] == ["test"]:
+    DATABASES["test_replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+DATABASE_ROUTERS = ["wordnest.routers.ReplicaRouter"]
+PRIMARY_PIN_SECONDS = config("DATABASE_PRIMARY_PIN_SECONDS", default=10, cast=int)
+
 CSRF_TRUSTED_ORIGINS = ["https://*.herokuapp.com"]
 
 # Password validation
@@ -228,3 +265,163 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Translation cache settings
+# BACKEND is one of "lru" (in-process), "django" (a cache from CACHES) or "file"
+TRANSLATION_CACHE = {
+    "BACKEND": config("TRANSLATION_CACHE_BACKEND", default="lru"),
+    "ALIAS": config("TRANSLATION_CACHE_ALIAS", default="default"),
+    "LOCATION": config(
+        "TRANSLATION_CACHE_LOCATION",
+        default=str(BASE_DIR.joinpath(".translation_cache")),
+    ),
+    "TIMEOUT": config("TRANSLATION_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int),
+    # Words that could not be translated are cached for a shorter time
+    "NEGATIVE_TIMEOUT": config(
+        "TRANSLATION_CACHE_NEGATIVE_TIMEOUT", default=60 * 15, cast=int
+    ),
+    "MAX_ENTRIES": config("TRANSLATION_CACHE_MAX_ENTRIES", default=10000, cast=int),
+}
+
+# Azure Translator settings
+AZURE_TRANSLATOR_ENDPOINT = config(
+    "AZURE_TRANSLATOR_ENDPOINT", default="https://api.cognitive.microsofttranslator.com"
+)
+# One pooled client per worker process, see dictionary.clients and gunicorn.conf.py
+AZURE_TRANSLATOR_CLIENT = {
+    "POOL_SIZE": config("AZURE_TRANSLATOR_POOL_SIZE", default=10, cast=int),
+    "KEEPALIVE_TIMEOUT": config(
+        "AZURE_TRANSLATOR_KEEPALIVE_TIMEOUT", default=60, cast=float
+    ),
+    "WARM_UP": config("AZURE_TRANSLATOR_WARM_UP", default=False, cast=bool),
+    "CONNECT_TIMEOUT": config(
+        "AZURE_TRANSLATOR_CONNECT_TIMEOUT", default=1.0, cast=float
+    ),
+    "RETRY_TOTAL": config("AZURE_TRANSLATOR_RETRY_TOTAL", default=1, cast=int),
+    "RETRY_BACKOFF_FACTOR": config(
+        "AZURE_TRANSLATOR_RETRY_BACKOFF_FACTOR", default=0.2, cast=float
+    ),
+}
+# Latency budget in seconds of each Azure strategy, a request and its retries give up once it is spent
+AZURE_TRANSLATOR_LATENCY_BUDGETS = {
+    "DictionaryAPITranslation": config(
+        "DICTIONARY_API_LATENCY_BUDGET", default=2.0, cast=float
+    ),
+    "TextAPITranslation": config("TEXT_API_LATENCY_BUDGET", default=2.0, cast=float),
+}
+# Each Azure strategy stops calling the API after FAILURE_THRESHOLD consecutive errors or calls
+# slower than SLOW_CALL_THRESHOLD seconds, and lets a probe call through after RESET_TIMEOUT seconds.
+TRANSLATION_CIRCUIT_BREAKER = {
+    "FAILURE_THRESHOLD": config(
+        "TRANSLATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD", default=5, cast=int
+    ),
+    "SLOW_CALL_THRESHOLD": config(
+        "TRANSLATION_CIRCUIT_BREAKER_SLOW_CALL_THRESHOLD", default=1.5, cast=float
+    ),
+    "RESET_TIMEOUT": config(
+        "TRANSLATION_CIRCUIT_BREAKER_RESET_TIMEOUT", default=30, cast=float
+    ),
+}
+# Dictionary lookups of concurrent requests are sent to the API in batches.
+# WINDOW is how long in seconds a batch waits for more words, MAX_SIZE is the API limit.
+DICTIONARY_LOOKUP_BATCH = {
+    "WINDOW": config("DICTIONARY_LOOKUP_BATCH_WINDOW", default=0.005, cast=float),
+    "MAX_SIZE": config("DICTIONARY_LOOKUP_BATCH_MAX_SIZE", default=10, cast=int),
+}
+
+# Approved translations found by the dictionary API are saved in bulk by a background thread.
+# The buffer is flushed every FLUSH_INTERVAL seconds or when it holds MAX_SIZE words.
+TRANSLATION_WRITE_BEHIND = {
+    "ENABLED": config("TRANSLATION_WRITE_BEHIND", default=True, cast=bool),
+    "FLUSH_INTERVAL": config(
+        "TRANSLATION_WRITE_BEHIND_INTERVAL", default=1.0, cast=float
+    ),
+    "MAX_SIZE": config("TRANSLATION_WRITE_BEHIND_MAX_SIZE", default=500, cast=int),
+}
+
+# Concurrent translations of the same word are coalesced within a worker process.
+# With CROSS_WORKER the workers also share a lock through the CACHE_ALIAS cache, which
+# should be the same shared cache as the translation cache ("django" backend).
+TRANSLATION_SINGLE_FLIGHT = {
+    "CROSS_WORKER": config(
+        "TRANSLATION_SINGLE_FLIGHT_CROSS_WORKER", default=False, cast=bool
+    ),
+    "CACHE_ALIAS": config("TRANSLATION_SINGLE_FLIGHT_CACHE_ALIAS", default="default"),
+    "LOCK_TIMEOUT": config(
+        "TRANSLATION_SINGLE_FLIGHT_LOCK_TIMEOUT", default=10, cast=float
+    ),
+}
+
+# Languages are kept in memory by each worker, see dictionary.languages. Changes are announced
+# through the CACHE_ALIAS cache, which must be shared by the workers (e.g. Redis or Memcached),
+# and checked every CHECK_INTERVAL seconds. The registry is reloaded after MAX_AGE seconds anyway.
+LANGUAGE_REGISTRY = {
+    "CACHE_ALIAS": config("LANGUAGE_REGISTRY_CACHE_ALIAS", default="default"),
+    "CHECK_INTERVAL": config("LANGUAGE_REGISTRY_CHECK_INTERVAL", default=5, cast=float),
+    "MAX_AGE": config("LANGUAGE_REGISTRY_MAX_AGE", default=60 * 10, cast=float),
+}
+
+# The dictionary search falls back to similar words found by an in-memory trigram index of each
+# dictionary, see dictionary.fuzzy. A worker keeps the indexes of MAX_DICTIONARIES dictionaries,
+# changes are announced to other workers through the CACHE_ALIAS cache and an index is rebuilt
+# after MAX_AGE seconds in any case. THRESHOLD is the minimum similarity (0 to 1) of a found word.
+FUZZY_SEARCH = {
+    "CACHE_ALIAS": config("FUZZY_SEARCH_CACHE_ALIAS", default="default"),
+    "MAX_AGE": config("FUZZY_SEARCH_MAX_AGE", default=60 * 10, cast=float),
+    "MAX_DICTIONARIES": config("FUZZY_SEARCH_MAX_DICTIONARIES", default=100, cast=int),
+    "THRESHOLD": config("FUZZY_SEARCH_THRESHOLD", default=0.3, cast=float),
+}
+
+# Word suggestions are served from an in-memory prefix index of each language, see
+# dictionary.suggestions. Words created by other workers are read every REFRESH_INTERVAL seconds,
+# the index is rebuilt after MAX_AGE seconds. New words are merged into the compact index
+# in batches of MERGE_SIZE.
+WORD_SUGGESTIONS = {
+    "REFRESH_INTERVAL": config(
+        "WORD_SUGGESTIONS_REFRESH_INTERVAL", default=5, cast=float
+    ),
+    "MAX_AGE": config("WORD_SUGGESTIONS_MAX_AGE", default=60 * 60, cast=float),
+    "MERGE_SIZE": config("WORD_SUGGESTIONS_MERGE_SIZE", default=10000, cast=int),
+}
+
+# Uploaded word lists are imported into dictionaries by a pool of WORKERS background threads of each
+# worker process, see dictionary.import_jobs. The files are kept in UPLOAD_DIR until their import ends
+# and are imported in chunks of CHUNK_SIZE rows. MAX_SIZE is the largest accepted file in bytes.
+DICTIONARY_IMPORT = {
+    "UPLOAD_DIR": config(
+        "DICTIONARY_IMPORT_UPLOAD_DIR",
+        default=str(Path(tempfile.gettempdir(), "wordnest-imports")),
+    ),
+    "WORKERS": config("DICTIONARY_IMPORT_WORKERS", default=2, cast=int),
+    "CHUNK_SIZE": config("DICTIONARY_IMPORT_CHUNK_SIZE", default=2000, cast=int),
+    "MAX_SIZE": config(
+        "DICTIONARY_IMPORT_MAX_SIZE", default=50 * 1024 * 1024, cast=int
+    ),
+    # Seconds after which an unfinished job that was not updated is resumed by another worker,
+    # a running job is updated after each chunk
+    "STALE_AFTER": config("DICTIONARY_IMPORT_STALE_AFTER", default=300, cast=int),
+}
+
+# Deleted dictionaries and accounts are hidden at once and removed by a background thread,
+# see dictionary.deletion. Translations are removed from a dictionary BATCH_SIZE rows per query.
+DICTIONARY_PURGE = {
+    "BATCH_SIZE": config("DICTIONARY_PURGE_BATCH_SIZE", default=5000, cast=int),
+}
+
+# Unapproved translations in no dictionary and words without translations are removed by
+# dictionary.orphans, by the collect_orphans command and after each purge of deleted data.
+# Tables are walked BATCH_SIZE keys at a time, rows younger than MIN_AGE seconds are kept.
+# A purge continues the collection for at most MAX_BATCHES batches from a cursor kept in
+# the CACHE_ALIAS cache.
+ORPHAN_COLLECTION = {
+    "BATCH_SIZE": config("ORPHAN_COLLECTION_BATCH_SIZE", default=1000, cast=int),
+    "MIN_AGE": config("ORPHAN_COLLECTION_MIN_AGE", default=60 * 60, cast=int),
+    "MAX_BATCHES": config("ORPHAN_COLLECTION_MAX_BATCHES", default=20, cast=int),
+    "CACHE_ALIAS": config("ORPHAN_COLLECTION_CACHE_ALIAS", default="default"),
+}
+
+# Cards to review are read from a dictionary's due queue BATCH_SIZE at a time, the answers
+# to a batch are written together when it is finished, see dictionary.reviews.
+DICTIONARY_REVIEW = {
+    "BATCH_SIZE": config("DICTIONARY_REVIEW_BATCH_SIZE", default=20, cast=int),
+}
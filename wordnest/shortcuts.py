@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dictionary.models import Translation, Word
+import base64
+import json
 
 
 def normalize_string(string: str) -> str:
@@ -13,28 +14,41 @@ def normalize_string(string: str) -> str:
     return string.strip().lower()
 
 
-def group_translations_by_from_word(
-    queryset: iter[Translation],
-) -> list[tuple[Word, list[Word]]]:
+def encode_cursor(key: tuple) -> str:
     """
-     Groups translations by their source words.
+    Encode a pagination key into an opaque, URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor made by encode_cursor().
 
-    This function iterates over an iterable of Translation objects and groups them by the source word (from_word).
-    It returns  A list of tuples where first item is the source word (from_word) and the second one the values are
-    lists of corresponding target words (to_word).
+    Raises:
+        ValueError: the cursor is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+    if not isinstance(key, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(key)
 
-    Args:
-        queryset (iter[Translation]): An iterable of Translation objects to be grouped.
 
-    Returns:
-        list[tuple[Word, list[Word]]]: A list of tuples where each tuple contain two elements, the first one is
-        a source word (from_word) and an the second is the corresponding value is a list of target words
-        (to_word) associated with that source word.
+def parse_accept_encoding(header: str) -> set[str]:
+    """
+    Return the content codings accepted by an Accept-Encoding header, codings with q=0 are refused.
     """
-    groped_translations = {}
-    for translation in queryset:
-        if translation.from_word not in groped_translations:
-            groped_translations[translation.from_word] = [translation.to_word]
-        else:
-            groped_translations[translation.from_word].append(translation.to_word)
-    return list(groped_translations.items())
+    codings = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        name, _, quality = params.replace(" ", "").partition("=")
+        try:
+            accepted = name != "q" or float(quality) > 0
+        except ValueError:
+            accepted = False
+        if coding.strip() and accepted:
+            codings.add(coding.strip().lower())
+    return codings
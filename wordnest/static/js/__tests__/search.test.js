@@ -70,3 +70,18 @@ describe("createSearchResults", () => {
         expect(searchResults.innerText).toBe("No results found");
     });
 });
+
+describe("fillSuggestions", () => {
+    const fillSuggestions = require("../search").fillSuggestions;
+
+    test("fillSuggestions replaces the options of the datalist", () => {
+        const datalist = document.createElement("datalist");
+        datalist.appendChild(document.createElement("option"));
+
+        fillSuggestions(datalist, ["hello", "help"]);
+
+        expect(datalist.children.length).toBe(2);
+        expect(datalist.children[0].value).toBe("hello");
+        expect(datalist.children[1].value).toBe("help");
+    });
+});
@@ -185,6 +185,52 @@ function addWordToDictionary(event) {
         });
 }
 
+/**
+ * Replaces the options of a datalist with the suggested words.
+ *
+ * @param {HTMLElement} datalist - The datalist element of the input.
+ * @param {Array} suggestions - An array of words.
+ */
+function fillSuggestions(datalist, suggestions) {
+    const options = suggestions.map((suggestion) => {
+        const option = document.createElement("option");
+        option.value = suggestion;
+        return option;
+    });
+    datalist.replaceChildren(...options);
+}
+
+let suggestionsController = null;
+
+/**
+ * Requests words that start with the text entered by the user and shows them as suggestions.
+ * A request still running for the previous text is aborted.
+ */
+function suggestWords() {
+    const datalist = document.getElementById("word_suggestions");
+    const prefix = textElement.value.trim();
+    if (suggestionsController) suggestionsController.abort();
+    if (!prefix) {
+        fillSuggestions(datalist, []);
+        return;
+    }
+
+    suggestionsController = new AbortController();
+    const params = new URLSearchParams({
+        prefix: prefix,
+        language: source_language.value,
+    });
+    fetch(`/translate/suggest/?${params}`, { signal: suggestionsController.signal })
+        .then((response) => {
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            return response.json();
+        })
+        .then((data) => fillSuggestions(datalist, data.suggestions))
+        .catch(() => {});
+}
+
 /**
  * Sends a POST request to the server to translate the text entered by the user.
  *
@@ -230,6 +276,7 @@ function translateText(instance) {
 
 document.addEventListener("DOMContentLoaded", function () {
     textElement.addEventListener("input", showRunButton);
+    textElement.addEventListener("input", suggestWords);
     textElement.addEventListener("input", () => {
         if (translationTippy.state.isVisible) {
             translationTippy.hide();
@@ -244,5 +291,5 @@ document.addEventListener("DOMContentLoaded", function () {
 });
 
 if (typeof module !== "undefined") {
-    module.exports = { showRunButton, createSearchResults };
+    module.exports = { showRunButton, createSearchResults, fillSuggestions };
 }